@@ -2,11 +2,17 @@
 Anomaly Detection Module
 Uses PyOD's IsolationForest and statistical methods to detect sensor anomalies
 """
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from typing import Dict, List, Tuple
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import IsolationForest
 
+# Per-thread (1, n_features) row reused for every scaled model input
+_local = threading.local()
+
 
 class AnomalyDetector:
     """Detects anomalies in sensor data streams using Isolation Forest"""
@@ -31,7 +37,10 @@ class AnomalyDetector:
     
     def add_sample(self, sensor_data: Dict):
         """Add sensor reading to history for training"""
-        features = self._extract_features(sensor_data)
+        self._add_features(self._extract_features(sensor_data))
+    
+    def _add_features(self, features: np.ndarray):
+        """Add an extracted feature row to history (and refit)"""
         self.sensor_history.append(features)
         
         # Keep only last 200 samples
@@ -54,18 +63,32 @@ class AnomalyDetector:
         Detect if sensor reading is anomalous
         Returns: (is_anomaly, anomaly_score, details)
         """
-        features = self._extract_features(sensor_data)
-        
+        return self._detect_features(self._extract_features(sensor_data))
+    
+    def _scaled_row(self, features: np.ndarray) -> np.ndarray:
+        """
+        scaler.transform of one feature row, written into this thread's
+        preallocated (1, n) buffer (same arithmetic as StandardScaler.transform,
+        without its per-call input validation and copy)
+        """
+        row = getattr(_local, 'row', None)
+        if row is None:
+            row = _local.row = np.empty((1, len(FEATURE_COLUMNS)))
+        np.subtract(features, self.scaler.mean_, out=row[0])
+        np.divide(row, self.scaler.scale_, out=row)
+        return row
+    
+    def _detect_features(self, features: np.ndarray) -> Tuple[bool, float, Dict]:
+        """detect_anomaly on an already extracted feature row"""
         # Add to history
-        self.add_sample(sensor_data)
+        self._add_features(features)
         
         # Use statistical method if model not fitted yet
         if not self.is_fitted:
-            return self._detect_statistical(sensor_data, features)
+            return self._detect_statistical(features)
         
         # ML-based detection
-        X = features.reshape(1, -1)
-        X_scaled = self.scaler.transform(X)
+        X_scaled = self._scaled_row(features)
         
         # Get anomaly score 
         # Sklearn: Lower = More Anomalous (negative values)
@@ -73,9 +96,9 @@ class AnomalyDetector:
         raw_score = self.model.decision_function(X_scaled)[0]
         anomaly_score = -raw_score
         
-        # Sklearn predict: -1 is anomaly, 1 is normal
-        prediction = self.model.predict(X_scaled)[0]
-        is_anomaly = bool(prediction == -1)
+        # Sklearn predict() marks -1 (anomaly) exactly where decision_function < 0,
+        # so reuse the score instead of scoring the forest a second time
+        is_anomaly = bool(raw_score < 0)
         
         details = {
             "method": "IsolationForest",
@@ -85,7 +108,7 @@ class AnomalyDetector:
         
         return is_anomaly, float(anomaly_score), details
     
-    def _detect_statistical(self, sensor_data: Dict, features: np.ndarray) -> Tuple[bool, float, Dict]:
+    def _detect_statistical(self, features: np.ndarray) -> Tuple[bool, float, Dict]:
         """Fallback: Simple z-score based anomaly detection"""
         if len(self.sensor_history) < 10:
             # Not enough data yet
@@ -144,6 +167,56 @@ def get_detector(machine_id: str) -> AnomalyDetector:
     return detectors[machine_id]
 
 
+# Worker threads for detect_anomaly_batch. IsolationForest refits hold the GIL
+# on a standard CPython build (measured: no speedup), so batches run serially
+# unless MAINTENANCE_ANOMALY_WORKERS > 1 (e.g. on a free-threaded build)
+BATCH_WORKERS = int(os.getenv("MAINTENANCE_ANOMALY_WORKERS", "1"))
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+
+def _get_batch_pool() -> ThreadPoolExecutor:
+    """Shared detect_anomaly_batch thread pool (created on first use)"""
+    global _batch_pool
+    if _batch_pool is None:
+        with _batch_pool_lock:
+            if _batch_pool is None:
+                _batch_pool = ThreadPoolExecutor(
+                    max_workers=BATCH_WORKERS, thread_name_prefix="anomaly-batch"
+                )
+    return _batch_pool
+
+
+# Feature order of _extract_features (the RUL predictor's SENSOR_COLUMNS plus rpm)
+FEATURE_COLUMNS = ("vibration_x", "vibration_y", "temperature", "pressure", "rpm")
+
+
+def detect_anomaly_batch(sensor_data_list: List[Dict], machine_ids: List[str],
+                         X: np.ndarray = None) -> List[Tuple[bool, float, Dict]]:
+    """
+    detect_anomaly for several machines at once: features for all readings are
+    extracted into one (N, 5) array, then each row goes to its machine's
+    detector (every machine has its own fitted model), in parallel across
+    machines when BATCH_WORKERS > 1.
+    X: optional prebuilt (N, 5) FEATURE_COLUMNS array (missing readings as 0)
+    Returns: [(is_anomaly, anomaly_score, details), ...] in input order
+    """
+    if X is None:
+        X = np.array([
+            [sd.get(col, 0) for col in FEATURE_COLUMNS] for sd in sensor_data_list
+        ], dtype=np.float64).reshape(-1, len(FEATURE_COLUMNS))
+    detectors_rows = [(detectors.get(mid) or get_detector(mid), row)
+                      for mid, row in zip(machine_ids, X)]
+    
+    # A detector's history must see its rows in order, so only fan out
+    # when every machine appears once
+    if BATCH_WORKERS > 1 and len(set(machine_ids)) == len(machine_ids) > 1:
+        futures = [_get_batch_pool().submit(detector._detect_features, row)
+                   for detector, row in detectors_rows]
+        return [future.result() for future in futures]
+    return [detector._detect_features(row) for detector, row in detectors_rows]
+
+
 if __name__ == "__main__":
     # Test the detector
     print("Testing Anomaly Detector...")
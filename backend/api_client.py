@@ -0,0 +1,56 @@
+"""
+Keep-alive API Client
+One HTTP connection to the local API, shared by the demo and verification
+scripts. A kept-alive connection the server has dropped is reopened and the
+request retried once.
+"""
+import http.client
+
+HOST, PORT = 'localhost', 5000
+API_PREFIX = '/api'
+
+# Raised when the server closed the kept-alive connection between requests
+_DROPPED = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class ApiClient:
+    """Sends requests to the API over one reused connection"""
+
+    def __init__(self, host: str = HOST, port: int = PORT, timeout: float = 10):
+        self.conn = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def request(self, method: str, endpoint: str, body=None) -> bytes:
+        """
+        Send a request to API_PREFIX/endpoint and return the response body.
+        body: JSON as bytes or str (str is sent UTF-8 encoded; http.client
+              sets Content-Length from the encoded bytes)
+        Raises http.client.HTTPException for 4xx/5xx responses.
+        """
+        headers = {}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+
+        for attempt in range(2):
+            try:
+                self.conn.request(method, f'{API_PREFIX}/{endpoint}', body=body, headers=headers)
+                response = self.conn.getresponse()
+                data = response.read()
+                break
+            except _DROPPED:
+                # Kept-alive connection dropped by the server: reconnect once
+                self.conn.close()
+                if attempt:
+                    raise
+            except Exception:
+                # Drop a half-used connection; the next request reopens it
+                self.conn.close()
+                raise
+
+        if response.status >= 400:
+            raise http.client.HTTPException(f"HTTP Error {response.status}: {response.reason}")
+        return data
+
+    def close(self):
+        self.conn.close()
@@ -141,6 +141,11 @@ class Config:
     DB_POOL_SIZE = 5
     DB_MAX_OVERFLOW = 10
     
+    # Background sensor history writer: queued readings are inserted in
+    # batches every SENSOR_WRITE_INTERVAL_S; readings beyond the queue size are dropped
+    SENSOR_WRITE_QUEUE_SIZE = 1000
+    SENSOR_WRITE_INTERVAL_S = 0.1
+    
     # ==================== SENSOR SIMULATION ====================
     # Degradation phase thresholds (runtime hours)
     DEGRADATION_PHASES: Dict[str, Tuple[int, int]] = {
@@ -176,6 +181,11 @@ class Config:
         "FAILURE": 2.5
     }
     
+    # Simulation clock: fleet time advances SIMULATION_TICK_HOURS every
+    # SIMULATION_TICK_SECONDS of real time, independent of API polling
+    SIMULATION_TICK_SECONDS = 2.0
+    SIMULATION_TICK_HOURS = 0.0333  # ~2 minutes
+    
     # ==================== THERMAL POWER PLANT CONFIG ====================
     # Plant identification
     PLANT_NAME = "Main Power Block"
@@ -352,6 +362,16 @@ class Config:
     # Rate limiting
     API_RATE_LIMIT_PER_MINUTE = 100
     
+    # Seconds a computed /api/machines response is reused by other pollers (0 disables)
+    MACHINES_CACHE_TTL_SECONDS = 1.5
+    
+    # Seconds /api/health reuses the database statistics (probes hit it every few seconds)
+    HEALTH_STATS_TTL_SECONDS = 5.0
+    
+    # gzip for JSON responses: bodies smaller than this many bytes go out as-is
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_LEVEL = 4  # 1 (fastest) .. 9 (smallest)
+    
     # CORS settings
     CORS_ORIGINS = ["http://localhost:3000", "http://localhost:5173"]
     
@@ -366,6 +386,7 @@ class Config:
     LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB
     LOG_BACKUP_COUNT = 5
     LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    LOG_REPEAT_WINDOW_SECONDS = 1.0  # An identical message repeated within this is dropped
     
     # ==================== OPERATOR SETTINGS ====================
     # Default operator ID for system actions
@@ -2,7 +2,12 @@
 Database Layer for Industrial Predictive Maintenance
 SQLite database with proper schema for alerts, logs, and sensor history
 """
+import atexit
+import logging
 import sqlite3
+import queue
+import threading
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
@@ -10,6 +15,11 @@ from contextlib import contextmanager
 from config import Config
 import json
 
+logger = logging.getLogger(__name__)
+
+# Queued after the last reading to stop the sensor history writer
+_WRITER_STOP = object()
+
 
 class Database:
     """Production-grade database layer with connection pooling and transactions"""
@@ -17,6 +27,12 @@ class Database:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or Config.DB_PATH
         self._ensure_database()
+        
+        # Background sensor history writer (started on first queued reading)
+        self._sensor_queue = queue.Queue(maxsize=Config.SENSOR_WRITE_QUEUE_SIZE)
+        self._sensor_writer = None
+        self._sensor_writer_lock = threading.Lock()
+        self.dropped_sensor_readings = 0
     
     @contextmanager
     def get_connection(self):
@@ -359,28 +375,121 @@ class Database:
     
     # ==================== SENSOR HISTORY OPERATIONS ====================
     
+    @staticmethod
+    def _sensor_row(machine_id: str, sensor_data: Dict, timestamp: str) -> Tuple:
+        """sensor_history row for _SENSOR_INSERT"""
+        return (
+            machine_id,
+            timestamp,
+            sensor_data.get('vibration_x'),
+            sensor_data.get('vibration_y'),
+            sensor_data.get('temperature'),
+            sensor_data.get('pressure'),
+            sensor_data.get('rpm'),
+            sensor_data.get('health_score'),
+            sensor_data.get('rul_hours')
+        )
+    
+    _SENSOR_INSERT = """
+        INSERT INTO sensor_history (
+            machine_id, timestamp, vibration_x, vibration_y,
+            temperature, pressure, rpm, health_score, rul_hours
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
     def save_sensor_reading(self, machine_id: str, sensor_data: Dict):
         """Save sensor reading to history"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO sensor_history (
-                    machine_id, timestamp, vibration_x, vibration_y,
-                    temperature, pressure, rpm, health_score, rul_hours
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                machine_id,
-                datetime.now().isoformat(),
-                sensor_data.get('vibration_x'),
-                sensor_data.get('vibration_y'),
-                sensor_data.get('temperature'),
-                sensor_data.get('pressure'),
-                sensor_data.get('rpm'),
-                sensor_data.get('health_score'),
-                sensor_data.get('rul_hours')
+            conn.execute(self._SENSOR_INSERT, self._sensor_row(
+                machine_id, sensor_data, datetime.now().isoformat()
             ))
     
+    def queue_sensor_reading(self, machine_id: str, sensor_data: Dict) -> bool:
+        """
+        Save sensor reading to history from a background thread, batched with
+        other readings into one transaction (timestamped now, written within
+        SENSOR_WRITE_INTERVAL_S). Returns False if the queue was full and the
+        reading was dropped.
+        """
+        if self._sensor_writer is None:
+            with self._sensor_writer_lock:
+                if self._sensor_writer is None:
+                    self._sensor_writer = threading.Thread(
+                        target=self._sensor_writer_loop, name="sensor-history-writer", daemon=True
+                    )
+                    self._sensor_writer.start()
+                    atexit.register(self._stop_sensor_writer)
+        
+        try:
+            self._sensor_queue.put_nowait(
+                self._sensor_row(machine_id, sensor_data, datetime.now().isoformat())
+            )
+            return True
+        except queue.Full:
+            self.dropped_sensor_readings += 1
+            return False
+    
+    def _sensor_writer_loop(self):
+        """
+        Drain queued readings into sensor_history, one transaction per interval,
+        until _WRITER_STOP is queued; readings queued after it are flushed too
+        """
+        stopping = False
+        while not stopping:
+            row = self._sensor_queue.get()  # block until there is work
+            if row is _WRITER_STOP:
+                break
+            rows = [row]
+            deadline = time.monotonic() + Config.SENSOR_WRITE_INTERVAL_S
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._sensor_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is _WRITER_STOP:
+                    stopping = True
+                    break
+                rows.append(row)
+            self._write_sensor_rows(rows)
+        
+        # Final drain: readings that raced the stop request
+        rows = []
+        while True:
+            try:
+                row = self._sensor_queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not _WRITER_STOP:
+                rows.append(row)
+        if rows:
+            self._write_sensor_rows(rows)
+    
+    def _write_sensor_rows(self, rows: List[Tuple]):
+        """Insert a batch of sensor_history rows in one transaction"""
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(self._SENSOR_INSERT, rows)
+        except Exception as e:
+            self.dropped_sensor_readings += len(rows)
+            logger.error(
+                "Sensor history write failed, %d readings dropped (%d in total): %s",
+                len(rows), self.dropped_sensor_readings, e
+            )
+    
+    def _stop_sensor_writer(self, timeout: float = 10.0):
+        """Flush queued readings and stop the writer thread (registered with atexit)"""
+        writer = self._sensor_writer
+        if writer is None or not writer.is_alive():
+            return
+        try:
+            self._sensor_queue.put(_WRITER_STOP, timeout=timeout)  # waits for room if full
+        except queue.Full:
+            return
+        writer.join(timeout)
+    
     def get_sensor_history(self, machine_id: str, hours: int = 24) -> List[Dict]:
         """Get sensor history for a machine"""
         with self.get_connection() as conn:
@@ -395,6 +504,42 @@ class Database:
             
             return [dict(row) for row in cursor.fetchall()]
     
+    # Columns returned by get_sensor_history_downsampled, in order
+    CHART_COLUMNS = ("timestamp", "temperature", "vibration", "pressure",
+                     "rpm", "health_score", "rul_hours")
+    
+    def get_sensor_history_downsampled(self, machine_id: str, hours: int = 1,
+                                       limit: int = 60) -> List[Tuple]:
+        """
+        Chart rows (CHART_COLUMNS order) for a machine's last `hours`, thinned
+        in SQL to at most `limit` evenly strided readings (every (n // limit)-th,
+        oldest first); vibration is the mean of the X/Y axes.
+        Requires SQLite >= 3.25 (window functions).
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # plain tuples, no per-row sqlite3.Row conversion
+            
+            since = (datetime.now() - timedelta(hours=hours)).isoformat()
+            cursor.execute("""
+                WITH ranked AS (
+                    SELECT timestamp, temperature,
+                           (COALESCE(vibration_x, 0) + COALESCE(vibration_y, 0)) / 2.0 AS vibration,
+                           pressure, rpm, health_score, rul_hours,
+                           ROW_NUMBER() OVER (ORDER BY timestamp, id) - 1 AS rn,
+                           COUNT(*) OVER () AS n
+                    FROM sensor_history
+                    WHERE machine_id = ? AND timestamp >= ?
+                )
+                SELECT timestamp, temperature, vibration, pressure, rpm, health_score, rul_hours
+                FROM ranked
+                WHERE n <= ? OR rn % (n / ?) = 0
+                ORDER BY rn
+                LIMIT ?
+            """, (machine_id, since, limit, limit, limit))
+            
+            return cursor.fetchall()
+    
     # ==================== CLEANUP OPERATIONS ====================
     
     def cleanup_old_data(self):
@@ -388,13 +388,16 @@ def get_all_preset_machines() -> List[dict]:
 
 # Global scenario player instance
 _scenario_player = None
+_scenario_player_lock = threading.Lock()
 
 
 def get_scenario_player() -> ScenarioPlayer:
     """Get or create global scenario player"""
     global _scenario_player
     if _scenario_player is None:
-        _scenario_player = ScenarioPlayer()
+        with _scenario_player_lock:
+            if _scenario_player is None:
+                _scenario_player = ScenarioPlayer()
     return _scenario_player
 
 
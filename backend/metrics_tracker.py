@@ -6,7 +6,9 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
 import json
+import threading
 
 
 class PredictionOutcome(Enum):
@@ -61,6 +63,10 @@ class MetricsTracker:
         self._prediction_counter = 0
         self._failure_counter = 0
         
+        # Bumped on every change to predictions/failures (lets pollers use
+        # it as a cache validator instead of comparing whole responses)
+        self.generation = 0
+        
         # Thresholds for evaluation
         self.prediction_window_hours = 48  # Max look-ahead window
         self.min_lead_time_hours = 2       # Minimum useful lead time
@@ -94,6 +100,7 @@ class MetricsTracker:
         )
         
         self.predictions[prediction_id] = record
+        self.generation += 1
         return prediction_id
     
     def record_failure(self, 
@@ -145,6 +152,7 @@ class MetricsTracker:
             matching_prediction.actual_failure_time = now
             matching_prediction.lead_time_hours = best_lead_time
         
+        self.generation += 1
         return failure_id
     
     def mark_false_positive(self, prediction_id: str, notes: str = ""):
@@ -153,6 +161,7 @@ class MetricsTracker:
             pred = self.predictions[prediction_id]
             pred.outcome = PredictionOutcome.FALSE_POSITIVE
             pred.resolution_notes = notes
+            self.generation += 1
     
     def mark_true_negative(self, machine_id: str):
         """Record that a machine remained healthy (no prediction, no failure)"""
@@ -170,6 +179,7 @@ class MetricsTracker:
             if age_hours > max_age_hours:
                 pred.outcome = PredictionOutcome.FALSE_POSITIVE
                 pred.resolution_notes = "Expired - failure did not occur within window"
+                self.generation += 1
     
     def calculate_metrics(self) -> Dict:
         """
@@ -262,13 +272,14 @@ class MetricsTracker:
     
     def get_prediction_history(self, machine_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
         """Get recent prediction records for display"""
-        predictions = list(self.predictions.values())
+        # Records are stored in the order they were made, so walking them
+        # backwards is newest first. The values are snapshotted into a list
+        # (one C-level copy) because other request threads may add records
+        # while the generator below is consumed
+        predictions = reversed(list(self.predictions.values()))
         
         if machine_id:
-            predictions = [p for p in predictions if p.machine_id == machine_id]
-        
-        # Sort by time, newest first
-        predictions.sort(key=lambda p: p.predicted_at, reverse=True)
+            predictions = (p for p in predictions if p.machine_id == machine_id)
         
         return [
             {
@@ -283,17 +294,15 @@ class MetricsTracker:
                 "lead_time_hours": p.lead_time_hours,
                 "actual_failure_time": p.actual_failure_time.isoformat() if p.actual_failure_time else None
             }
-            for p in predictions[:limit]
+            for p in islice(predictions, max(limit, 0))
         ]
     
     def get_failure_history(self, machine_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
         """Get recent failure records for display"""
-        failures = list(self.failures.values())
+        failures = reversed(list(self.failures.values()))  # snapshot, newest first, as above
         
         if machine_id:
-            failures = [f for f in failures if f.machine_id == machine_id]
-        
-        failures.sort(key=lambda f: f.occurred_at, reverse=True)
+            failures = (f for f in failures if f.machine_id == machine_id)
         
         return [
             {
@@ -305,19 +314,22 @@ class MetricsTracker:
                 "lead_time_hours": f.lead_time_hours,
                 "event_type": f.event_type
             }
-            for f in failures[:limit]
+            for f in islice(failures, max(limit, 0))
         ]
 
 
 # Global metrics tracker instance
 _metrics_tracker = None
+_metrics_tracker_lock = threading.Lock()
 
 
 def get_metrics_tracker() -> MetricsTracker:
     """Get or create global metrics tracker"""
     global _metrics_tracker
     if _metrics_tracker is None:
-        _metrics_tracker = MetricsTracker()
+        with _metrics_tracker_lock:
+            if _metrics_tracker is None:
+                _metrics_tracker = MetricsTracker()
     return _metrics_tracker
 
 
@@ -369,6 +381,7 @@ def seed_demo_metrics():
         elif demo["outcome"] == "FP":
             pred.outcome = PredictionOutcome.FALSE_POSITIVE
             pred.resolution_notes = "Machine recovered naturally"
+    tracker.generation += 1  # outcomes above were set directly
     
     print(f"✓ Seeded {len(demo_predictions)} demo prediction records")
     return tracker.calculate_metrics()
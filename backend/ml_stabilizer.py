@@ -6,27 +6,187 @@ Wraps ML predictions with industrial-grade stabilization:
 - Rate limiting
 - Confidence tracking
 """
+import threading
 import time
-from typing import Dict, Tuple, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Tuple, Optional
+import numpy as np
 from config import Config
-from rul_predictor import get_predictor
+from rul_predictor import get_predictor, sensors_to_array
+from numba_compat import njit, NUMBA_AVAILABLE
+
+
+def format_for_output(rul_hours: float, health_score: float) -> Tuple[float, float]:
+    """Quantize a prediction for API output (state is kept at full precision)"""
+    return round(float(rul_hours), 1), round(float(health_score), 2)
+
+
+def _local_isoformat(timestamps: np.ndarray) -> List[str]:
+    """Unix timestamps -> local naive ISO strings (seconds), in one vectorized pass"""
+    first = time.localtime(timestamps[0]).tm_gmtoff
+    last = time.localtime(timestamps[-1]).tm_gmtoff
+    if first != last:
+        # Window crosses a DST change: shift each row by its own offset
+        offsets = np.array([time.localtime(ts).tm_gmtoff for ts in timestamps.tolist()])
+    else:
+        offsets = first
+    local = (timestamps + offsets).astype('datetime64[s]')
+    return np.datetime_as_string(local, unit='s').tolist()
+
+
+def _make_ema_kernels(alpha: float, min_rul: float, max_rul: float):
+    """
+    Build the stabilization kernels with alpha and the RUL bounds baked in.
+    
+    The parameters are fixed for the process lifetime, so they are closed
+    over (compile-time constants under numba) instead of passed per call.
+    Returns: (step, batch)
+      step(raw_rul, raw_health, prev_rul, prev_health) -> (rul, health)
+      batch(raw_rul, raw_health, prev_rul, prev_health, first) -> (ruls, healths)
+    """
+    one_minus_alpha = 1.0 - alpha
+    
+    @njit
+    def step(raw_rul, raw_health, prev_rul, prev_health):
+        """EMA smoothing + monotonic RUL + bounds for one machine"""
+        # Apply Exponential Moving Average (EMA)
+        # new_value = alpha * raw_value + (1 - alpha) * prev_value
+        ema_rul = alpha * raw_rul + one_minus_alpha * prev_rul
+        ema_health = alpha * raw_health + one_minus_alpha * prev_health
+        
+        # Enforce monotonic RUL (can only decrease or stay constant)
+        stable_rul = min(ema_rul, prev_rul)
+        
+        # Health can fluctuate slightly but should generally decrease
+        # Allow small increases (within 5%) to account for sensor noise
+        if ema_health > prev_health * 1.05:
+            stable_health = prev_health
+        else:
+            stable_health = ema_health
+        
+        # Enforce bounds
+        stable_rul = max(min_rul, min(stable_rul, max_rul))
+        stable_health = max(0.0, min(100.0, stable_health))
+        return stable_rul, stable_health
+    
+    if NUMBA_AVAILABLE:
+        @njit
+        def batch(raw_rul, raw_health, prev_rul, prev_health, first):
+            """step() over arrays; slots flagged `first` take the raw value"""
+            n = raw_rul.shape[0]
+            out_rul = np.empty(n)
+            out_health = np.empty(n)
+            for i in range(n):
+                if first[i]:
+                    out_rul[i] = raw_rul[i]
+                    out_health[i] = raw_health[i]
+                else:
+                    out_rul[i], out_health[i] = step(
+                        raw_rul[i], raw_health[i], prev_rul[i], prev_health[i]
+                    )
+            return out_rul, out_health
+    else:
+        def batch(raw_rul, raw_health, prev_rul, prev_health, first):
+            """step() over arrays; slots flagged `first` take the raw value"""
+            ema_rul = alpha * raw_rul + one_minus_alpha * prev_rul
+            ema_health = alpha * raw_health + one_minus_alpha * prev_health
+            
+            stable_rul = np.clip(np.minimum(ema_rul, prev_rul), min_rul, max_rul)
+            stable_health = np.where(ema_health > prev_health * 1.05, prev_health, ema_health)
+            stable_health = np.clip(stable_health, 0.0, 100.0)
+            
+            return np.where(first, raw_rul, stable_rul), np.where(first, raw_health, stable_health)
+    
+    return step, batch
 
 
 class StabilizedRULPredictor:
     """Production-grade RUL predictor with stabilization"""
     
+    __slots__ = (
+        'raw_predictor',
+        '_id_of', '_slot_lock', '_rul', '_health', '_last_time', '_count',
+        '_trend', '_trend_n',
+        'ema_alpha', 'min_interval_s', '_ema_step', '_ema_batch',
+    )
+    
+    # Trend history: one sample per TREND_INTERVAL_S, 24h deep
+    TREND_SIZE = 1440
+    TREND_INTERVAL_S = 60
+    
+    # Initial number of machine slots in the state arrays (doubles when full)
+    INITIAL_CAPACITY = 16
+    
     def __init__(self):
         self.raw_predictor = get_predictor()
         
-        # Per-machine state
-        self.prediction_history: Dict[str, list] = {}  # machine_id -> [(timestamp, rul, health)]
-        self.last_prediction_time: Dict[str, datetime] = {}
-        self.stable_predictions: Dict[str, Tuple[float, float]] = {}  # machine_id -> (rul, health)
+        # Per-machine state, struct-of-arrays indexed by a small integer id
+        self._id_of: Dict[str, int] = {}  # machine_id -> slot
+        self._slot_lock = threading.Lock()  # guards slot allocation and _grow
+        self._rul = np.zeros(self.INITIAL_CAPACITY)  # last stable RUL
+        self._health = np.zeros(self.INITIAL_CAPACITY)  # last stable health
+        self._last_time = np.full(self.INITIAL_CAPACITY, np.nan)  # time.monotonic() of last update
+        self._count = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)  # updates since reset
+        
+        # Downsampled trend history (read by get_prediction_trend only, never on the hot path)
+        self._trend: Dict[str, np.ndarray] = {}  # machine_id -> ring buffer, cols (unix_ts, rul, health)
+        self._trend_n: Dict[str, int] = {}  # machine_id -> samples written
         
         # Configuration
         self.ema_alpha = Config.EMA_ALPHA
-        self.min_interval = timedelta(seconds=Config.MIN_PREDICTION_INTERVAL_SECONDS)
+        self.min_interval_s = float(Config.MIN_PREDICTION_INTERVAL_SECONDS)
+        self._ema_step, self._ema_batch = _make_ema_kernels(
+            float(self.ema_alpha), float(Config.MIN_RUL_HOURS), float(Config.MAX_RUL_HOURS)
+        )
+    
+    def _index(self, machine_id: str) -> int:
+        """Get (or allocate) the state slot for a machine"""
+        idx = self._id_of.get(machine_id)
+        if idx is None:
+            with self._slot_lock:
+                idx = self._id_of.get(machine_id)
+                if idx is None:
+                    idx = len(self._id_of)
+                    if idx >= len(self._rul):
+                        self._grow()
+                    self._id_of[machine_id] = idx
+        return idx
+    
+    def _grow(self):
+        """Double the capacity of the state arrays (caller holds _slot_lock)"""
+        n = len(self._rul)
+        self._rul = np.concatenate([self._rul, np.zeros(n)])
+        self._health = np.concatenate([self._health, np.zeros(n)])
+        self._last_time = np.concatenate([self._last_time, np.full(n, np.nan)])
+        self._count = np.concatenate([self._count, np.zeros(n, dtype=np.int64)])
+    
+    def _clear_state(self, idx: int):
+        """Forget the stable prediction held in a slot"""
+        self._last_time[idx] = np.nan
+        self._count[idx] = 0
+    
+    def _record_history(self, machine_id: str, timestamp: float, rul: float, health: float):
+        """Append to the trend history, at most one sample per TREND_INTERVAL_S"""
+        buf = self._trend.get(machine_id)
+        if buf is None:
+            buf = np.empty((self.TREND_SIZE, 3))
+            self._trend[machine_id] = buf
+            self._trend_n[machine_id] = 0
+        n = self._trend_n[machine_id]
+        if n and timestamp - buf[(n - 1) % self.TREND_SIZE, 0] < self.TREND_INTERVAL_S:
+            return
+        buf[n % self.TREND_SIZE] = (timestamp, rul, health)
+        self._trend_n[machine_id] = n + 1
+    
+    def _trend_rows(self, machine_id: str) -> np.ndarray:
+        """Trend samples in chronological order, shape (n, 3)"""
+        buf = self._trend.get(machine_id)
+        n = self._trend_n.get(machine_id, 0)
+        if buf is None or n == 0:
+            return np.empty((0, 3))
+        if n <= self.TREND_SIZE:
+            return buf[:n]
+        # Buffer has wrapped: oldest sample sits at the write position
+        return np.roll(buf, -(n % self.TREND_SIZE), axis=0)
     
     def predict_rul(self, sensor_data: Dict, machine_id: str, bypass_smoothing: bool = False) -> Tuple[float, float]:
         """
@@ -35,104 +195,117 @@ class StabilizedRULPredictor:
         
         If bypass_smoothing is True, skip EMA and caching (for demo mode)
         """
+        idx = self._index(machine_id)
+        
         # If bypass requested (demo mode), return raw prediction immediately
         if bypass_smoothing:
             raw_rul, raw_health = self.raw_predictor.predict_rul(sensor_data, machine_id)
             # Clear history for this machine to allow fresh predictions
-            self.prediction_history.pop(machine_id, None)
-            self.stable_predictions.pop(machine_id, None)
-            self.last_prediction_time.pop(machine_id, None)
+            self._trend.pop(machine_id, None)
+            self._trend_n.pop(machine_id, None)
+            self._clear_state(idx)
             return raw_rul, raw_health
         
-        current_time = datetime.now()
+        # Monotonic clock for rate limiting, wall clock only for history
+        now = time.monotonic()
         
-        # Check if we should update prediction (rate limiting)
-        if machine_id in self.last_prediction_time:
-            time_since_last = current_time - self.last_prediction_time[machine_id]
-            if time_since_last < self.min_interval:
-                # Return cached stable prediction
-                if machine_id in self.stable_predictions:
-                    return self.stable_predictions[machine_id]
+        # Rate limiting: return cached stable prediction
+        # (NaN last time = no prediction yet, comparison is False)
+        if now - self._last_time[idx] < self.min_interval_s:
+            return format_for_output(self._rul[idx], self._health[idx])
         
         # Get raw prediction from underlying model
         raw_rul, raw_health = self.raw_predictor.predict_rul(sensor_data, machine_id)
         
         # Apply stabilization
         stable_rul, stable_health = self._stabilize_prediction(
-            machine_id, raw_rul, raw_health, current_time
+            machine_id, raw_rul, raw_health, time.time()
         )
+        self._last_time[idx] = now
         
-        # Cache stable prediction
-        self.stable_predictions[machine_id] = (stable_rul, stable_health)
-        self.last_prediction_time[machine_id] = current_time
-        
-        return stable_rul, stable_health
+        return format_for_output(stable_rul, stable_health)
     
-    def _stabilize_prediction(self, machine_id: str, raw_rul: float, 
-                            raw_health: float, timestamp: datetime) -> Tuple[float, float]:
-        """Apply EMA smoothing and monotonic enforcement"""
-        
-        # Initialize history if needed
-        if machine_id not in self.prediction_history:
-            self.prediction_history[machine_id] = []
+    def predict_rul_batch(self, sensor_data_list: List[Dict], machine_ids: List[str],
+                          sensor_arr: Optional[np.ndarray] = None) -> List[Tuple[float, float]]:
+        """
+        Get stabilized RUL predictions for several machines at once
+        (machine_ids must be unique). EMA, monotonic and bound enforcement
+        run as one vector operation over all machines that are due.
+        sensor_arr: optional prebuilt (N, 4) sensors_to_array() of the readings
+        Returns: [(rul_hours, health_score), ...] in input order
+        """
+        idx = np.fromiter((self._index(mid) for mid in machine_ids), dtype=np.intp, count=len(machine_ids))
+        now = time.monotonic()
         
-        history = self.prediction_history[machine_id]
+        # Machines outside the rate-limit window get a fresh prediction
+        due = np.flatnonzero(~(now - self._last_time[idx] < self.min_interval_s))
+        if due.size:
+            if sensor_arr is not None:
+                due_arr = sensor_arr[due]
+            else:
+                due_arr = sensors_to_array([sensor_data_list[k] for k in due])
+            raw_rul, raw_health = self.raw_predictor.predict_rul_batch(due_arr)
+            self._stabilize_batch(idx[due], raw_rul, raw_health)
+            self._last_time[idx[due]] = now
+            
+            timestamp = time.time()
+            for k in due:
+                slot = idx[k]
+                self._record_history(machine_ids[k], timestamp, self._rul[slot], self._health[slot])
         
+        return [format_for_output(r, h) for r, h in zip(self._rul[idx], self._health[idx])]
+    
+    def _stabilize_batch(self, idx: np.ndarray, raw_rul: np.ndarray, raw_health: np.ndarray):
+        """Vectorized EMA smoothing and monotonic enforcement over state slots"""
         # First prediction - no smoothing needed
-        if len(history) == 0:
-            history.append((timestamp, raw_rul, raw_health))
-            return raw_rul, raw_health
-        
-        # Get previous stable prediction
-        prev_timestamp, prev_rul, prev_health = history[-1]
-        
-        # Apply Exponential Moving Average (EMA)
-        # new_value = alpha * raw_value + (1 - alpha) * prev_value
-        ema_rul = self.ema_alpha * raw_rul + (1 - self.ema_alpha) * prev_rul
-        ema_health = self.ema_alpha * raw_health + (1 - self.ema_alpha) * prev_health
-        
-        # Enforce monotonic RUL (can only decrease or stay constant)
-        stable_rul = min(ema_rul, prev_rul)
+        first = self._count[idx] == 0
+        self._rul[idx], self._health[idx] = self._ema_batch(
+            raw_rul, raw_health, self._rul[idx], self._health[idx], first
+        )
+        self._count[idx] += 1
+    
+    def _stabilize_prediction(self, machine_id: str, raw_rul: float, 
+                            raw_health: float, timestamp: float) -> Tuple[float, float]:
+        """Apply EMA smoothing and monotonic enforcement (timestamp: unix seconds)"""
+        idx = self._index(machine_id)
         
-        # Health can fluctuate slightly but should generally decrease
-        # Allow small increases (within 5%) to account for sensor noise
-        if ema_health > prev_health * 1.05:
-            stable_health = prev_health
+        # First prediction - no smoothing needed
+        if self._count[idx] == 0:
+            stable_rul, stable_health = raw_rul, raw_health
         else:
-            stable_health = ema_health
+            # Smooth against previous stable prediction
+            stable_rul, stable_health = self._ema_step(
+                float(raw_rul), float(raw_health), self._rul[idx], self._health[idx]
+            )
         
-        # Enforce bounds
-        stable_rul = max(Config.MIN_RUL_HOURS, min(stable_rul, Config.MAX_RUL_HOURS))
-        stable_health = max(0.0, min(100.0, stable_health))
-        
-        # Add to history (keep last 50 predictions)
-        history.append((timestamp, stable_rul, stable_health))
-        if len(history) > 50:
-            history.pop(0)
+        self._rul[idx] = stable_rul
+        self._health[idx] = stable_health
+        self._count[idx] += 1
+        self._record_history(machine_id, timestamp, stable_rul, stable_health)
         
-        return round(stable_rul, 1), round(stable_health, 2)
+        return stable_rul, stable_health
     
     def get_prediction_trend(self, machine_id: str, hours: int = 24) -> Dict:
         """Get prediction trend for analysis"""
-        if machine_id not in self.prediction_history:
+        rows = self._trend_rows(machine_id)
+        if len(rows) == 0:
             return {"status": "no_data"}
         
-        history = self.prediction_history[machine_id]
-        cutoff = datetime.now() - timedelta(hours=hours)
+        cutoff = time.time() - hours * 3600
+        recent = rows[np.searchsorted(rows[:, 0], cutoff):]
+        if len(recent) == 0:
+            return {"status": "no_recent_data"}
         
+        # Only the rows inside the window get formatted
         recent_history = [
-            {
-                "timestamp": ts.isoformat(),
-                "rul_hours": rul,
-                "health_score": health
-            }
-            for ts, rul, health in history
-            if ts >= cutoff
+            {"timestamp": ts, "rul_hours": rul, "health_score": health}
+            for ts, rul, health in zip(
+                _local_isoformat(recent[:, 0]),
+                np.round(recent[:, 1], 1).tolist(),
+                np.round(recent[:, 2], 2).tolist(),
+            )
         ]
         
-        if not recent_history:
-            return {"status": "no_recent_data"}
-        
         # Calculate trend
         if len(recent_history) >= 2:
             first_rul = recent_history[0]["rul_hours"]
@@ -157,12 +330,10 @@ class StabilizedRULPredictor:
     
     def reset_machine(self, machine_id: str):
         """Reset prediction history (after maintenance)"""
-        if machine_id in self.prediction_history:
-            self.prediction_history[machine_id] = []
-        if machine_id in self.stable_predictions:
-            del self.stable_predictions[machine_id]
-        if machine_id in self.last_prediction_time:
-            del self.last_prediction_time[machine_id]
+        if machine_id in self._trend_n:
+            self._trend_n[machine_id] = 0
+        if machine_id in self._id_of:
+            self._clear_state(self._id_of[machine_id])
         print(f"✓ Reset ML predictions for {machine_id}")
 
 
@@ -178,11 +349,19 @@ def get_stabilized_predictor() -> StabilizedRULPredictor:
 
 
 if __name__ == "__main__":
+    import sys
+    
+    # --bench: no sleeps and no rate limiting, so the timing is the stabilizer itself
+    bench = "--bench" in sys.argv
+    
     # Test ML stabilization
     print("Testing ML Stabilization...")
     print("=" * 60)
     
     predictor = StabilizedRULPredictor()
+    if bench:
+        predictor.min_interval_s = 0
+    bench_start = time.perf_counter()
     
     # Simulate oscillating raw predictions
     print("\nSimulating oscillating raw RUL predictions:")
@@ -198,12 +377,12 @@ if __name__ == "__main__":
     }
     
     # Simulate 20 predictions with artificial oscillation
-    import random
+    rng = np.random.default_rng(0)
+    noise = rng.uniform(-10, 10, size=20)
     base_rul = 100
     
-    for i in range(20):
+    for i, raw_rul_noise in enumerate(noise):
         # Add random oscillation to simulate unstable raw predictions
-        raw_rul_noise = random.uniform(-10, 10)
         test_sensor_data["temperature"] = 75 + raw_rul_noise / 2
         
         stable_rul, stable_health = predictor.predict_rul(test_sensor_data, "TEST-001")
@@ -219,7 +398,8 @@ if __name__ == "__main__":
         test_sensor_data["vibration_x"] += 0.02
         test_sensor_data["temperature"] += 0.5
         
-        time.sleep(0.1)  # Small delay
+        if not bench:
+            time.sleep(0.1)  # Small delay
     
     # Test monotonic enforcement
     print("\n" + "=" * 60)
@@ -228,6 +408,8 @@ if __name__ == "__main__":
     print()
     
     predictor2 = StabilizedRULPredictor()
+    if bench:
+        predictor2.min_interval_s = 0
     prev_rul = None
     
     for i in range(10):
@@ -243,7 +425,10 @@ if __name__ == "__main__":
         
         prev_rul = stable_rul
         test_sensor_data["vibration_x"] += 0.03
-        time.sleep(0.1)
+        if not bench:
+            time.sleep(0.1)
     
     print("\n" + "=" * 60)
+    if bench:
+        print(f"Elapsed: {(time.perf_counter() - bench_start) * 1000:.1f} ms")
     print("✓ ML Stabilization working correctly!")
@@ -8,15 +8,137 @@ Reference: https://ti.arc.nasa.gov/tech/dash/groups/pcoe/prognostic-data-reposit
 """
 
 import os
-import glob
+import hashlib
+import threading
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 
+from numba_compat import njit, NUMBA_AVAILABLE
+
 logger = logging.getLogger(__name__)
 
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _moments(x):
+        """
+        Power sums of a 1D signal in two passes: raw sums and extrema first,
+        then central moments about the mean (no cancellation for large offsets).
+        
+        Returns:
+            (sum, sum of squares, sum of squared deviations,
+             sum of 4th-power deviations, max, min)
+        """
+        s = 0.0
+        s2 = 0.0
+        mx = -np.inf
+        mn = np.inf
+        for i in range(x.shape[0]):
+            v = float(x[i])
+            s += v
+            s2 += v * v
+            if v > mx:
+                mx = v
+            if v < mn:
+                mn = v
+        
+        mean = s / x.shape[0]
+        d2 = 0.0
+        d4 = 0.0
+        for i in range(x.shape[0]):
+            d = float(x[i]) - mean
+            dd = d * d
+            d2 += dd
+            d4 += dd * dd
+        return s, s2, d2, d4, mx, mn
+else:
+    def _moments(x: np.ndarray) -> Tuple[float, float, float, float, float, float]:
+        """
+        Power sums of a 1D signal: raw sums and extrema, plus central moments
+        about the mean (no cancellation for large offsets).
+        
+        Returns:
+            (sum, sum of squares, sum of squared deviations,
+             sum of 4th-power deviations, max, min)
+        """
+        x64 = x.astype(np.float64)
+        d2 = x64 - x64.mean()
+        d2 *= d2
+        return (
+            float(x64.sum()),
+            float(np.dot(x64, x64)),
+            float(d2.sum()),
+            float(np.dot(d2, d2)),
+            float(x.max()),
+            float(x.min())
+        )
+
+
+# Order of columns in the pre-extracted feature matrix
+FEATURE_NAMES = ("rms", "kurtosis", "crest_factor", "spectral_energy", "peak_to_peak", "std_dev")
+
+
+def _feature_vector(data: np.ndarray) -> np.ndarray:
+    """
+    Extract vibration health features from raw data.
+    
+    All features are derived from one set of power sums instead of one
+    pass over the signal per feature.
+    
+    Returns:
+        float32 array ordered as FEATURE_NAMES
+    """
+    x = np.ascontiguousarray(data, dtype=np.float32)
+    n = x.shape[0]
+    s, s2, d2, d4, mx, mn = _moments(x)
+    var = d2 / n
+    
+    # RMS (Root Mean Square)
+    rms = np.sqrt(s2 / n)
+    
+    # Kurtosis (peakedness - increases with damage)
+    # Fisher (excess) kurtosis, same as scipy.stats.kurtosis defaults (NaN if constant)
+    kurtosis = (d4 / n) / (var * var) - 3.0 if var > 0 else np.nan
+    
+    # Crest Factor (peak-to-RMS ratio)
+    peak = max(mx, -mn)
+    crest_factor = peak / rms if rms > 0 else 0
+    
+    # Spectral Energy
+    # Parseval: sum(|FFT|^2) / N == sum(x^2), so no FFT is needed
+    spectral_energy = s2
+    
+    # Peak-to-Peak
+    peak_to_peak = mx - mn
+    
+    # Standard deviation
+    std_dev = np.sqrt(var)
+    
+    return np.array(
+        [rms, kurtosis, crest_factor, spectral_energy, peak_to_peak, std_dev],
+        dtype=np.float32
+    )
+
+
+def _features_to_dict(row: np.ndarray) -> Dict[str, float]:
+    """Convert a feature row to the API dictionary format."""
+    return {name: float(value) for name, value in zip(FEATURE_NAMES, row)}
+
+
+def _compute_features_for_file(filepath: str, bearing: int) -> np.ndarray:
+    """Parse one raw file and reduce a bearing to its feature row (pool worker)."""
+    try:
+        data = np.loadtxt(filepath, delimiter='\t', dtype=np.float32)
+        return _feature_vector(data[:, bearing])
+    except Exception:
+        return np.full(len(FEATURE_NAMES), np.nan, dtype=np.float32)
+
+
 class NASADataLoader:
     """
     Loads NASA IMS Bearing Dataset for realistic failure simulation.
@@ -28,25 +150,75 @@ class NASADataLoader:
     - Bearing 3 (column 2, 0-indexed) failed on Nov 25, 2003
     """
     
+    # Parsed files kept in memory (each file is ~20481 x 8 samples)
+    CACHE_SIZE = 8
+    
+    # Where pre-extracted feature matrices are cached between runs
+    FEATURE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    # Bumped whenever _feature_vector changes, so stale matrices are rebuilt
+    FEATURE_CACHE_VERSION = 2
+    
     def __init__(self, dataset_path: str):
         """Initialize loader with path to 1st_test folder."""
         self.dataset_path = dataset_path
         self.files: List[str] = []
         self.failed_bearing = 2  # Column index (0-based) of failed bearing
         self.total_files = 0
+        
+        # LRU cache of parsed files: file_index -> data
+        self._cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        # Most recently loaded file (hot path while progress stays in one file)
+        self._last_idx: Optional[int] = None
+        self._last_data: Optional[np.ndarray] = None
+        # Features of the most recent file index (progress moves slowly, so
+        # consecutive FAILING-mode readings mostly stay within one file)
+        self._last_features_idx: Optional[int] = None
+        self._last_features: Optional[Dict[str, float]] = None
+        
+        # Pre-extracted features: (total_files, len(FEATURE_NAMES)) float32,
+        # built in the background; None until complete (files are parsed
+        # one by one meanwhile)
+        self._features: Optional[np.ndarray] = None
+        self._features_ready = threading.Event()
+        
         self._load_file_list()
+        if self.total_files > 0:
+            threading.Thread(
+                target=self._load_feature_matrix, name="nasa-features", daemon=True
+            ).start()
+        else:
+            self._features_ready.set()
+    
+    def wait_for_features(self, timeout: Optional[float] = None) -> bool:
+        """Block until the feature matrix build has finished (or failed)."""
+        return self._features_ready.wait(timeout)
+    
+    def _clear_cache(self):
+        """Drop all cached file parses."""
+        self._cache.clear()
+        self._last_idx = None
+        self._last_data = None
+        self._last_features_idx = None
+        self._last_features = None
         
     def _load_file_list(self):
         """Load and sort all data files chronologically."""
+        # File indices are about to change, cached parses are stale
+        self._clear_cache()
+        
         if not os.path.exists(self.dataset_path):
             logger.warning(f"NASA dataset path not found: {self.dataset_path}")
             return
             
         # Get all files (no extension, just timestamps)
-        all_files = glob.glob(os.path.join(self.dataset_path, "*"))
-        
-        # Filter out directories, keep only files
-        self.files = sorted([f for f in all_files if os.path.isfile(f)])
+        # DirEntry.is_file() uses the cached directory entry type, so no
+        # extra stat() per file; hidden files are skipped like glob("*")
+        with os.scandir(self.dataset_path) as entries:
+            self.files = [
+                entry.path for entry in entries
+                if entry.is_file() and not entry.name.startswith(".")
+            ]
+        self.files.sort()
         self.total_files = len(self.files)
         
         if self.total_files > 0:
@@ -54,24 +226,115 @@ class NASADataLoader:
         else:
             logger.warning(f"No files found in {self.dataset_path}")
     
+    def _feature_cache_path(self) -> str:
+        """Cache file name, unique per dataset folder / bearing / file list."""
+        key = (f"v{self.FEATURE_CACHE_VERSION}|{os.path.abspath(self.dataset_path)}"
+               f"|{self.failed_bearing}|{self.total_files}")
+        if self.files:
+            key += f"|{os.path.basename(self.files[-1])}"
+        digest = hashlib.md5(key.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.FEATURE_CACHE_DIR, f"nasa_features_{digest}.npy")
+    
+    def _load_feature_matrix(self):
+        """
+        Reduce every file to its feature row once, so degradation lookups are
+        a single row read instead of a file parse.
+        
+        The matrix is cached as .npy (memory-mapped on later runs).
+        Runs on a background thread started by __init__.
+        """
+        try:
+            self._features = self._build_feature_matrix()
+        except Exception as e:
+            logger.error(f"NASA feature extraction failed: {e}")
+        finally:
+            self._features_ready.set()
+    
+    def _build_feature_matrix(self) -> np.ndarray:
+        """Feature matrix from the .npy cache, or extracted from every file."""
+        cache_path = self._feature_cache_path()
+        expected_shape = (self.total_files, len(FEATURE_NAMES))
+        
+        if os.path.exists(cache_path):
+            try:
+                features = np.load(cache_path, mmap_mode='r')
+                if features.shape == expected_shape:
+                    logger.info(f"✓ NASA features loaded from cache: {cache_path}")
+                    return features
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable NASA feature cache: {e}")
+        
+        logger.info(f"Extracting NASA features from {self.total_files} files...")
+        # Threads, not processes: this runs inside the multithreaded server,
+        # and forking it is unsafe
+        workers = min(len(self.files), os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(
+                _compute_features_for_file, self.files, repeat(self.failed_bearing)
+            ))
+        
+        features = np.stack(rows).astype(np.float32, copy=False)
+        
+        try:
+            os.makedirs(self.FEATURE_CACHE_DIR, exist_ok=True)
+            np.save(cache_path, features)
+            logger.info(f"✓ NASA features cached: {cache_path}")
+        except OSError as e:
+            logger.warning(f"Could not write NASA feature cache: {e}")
+        return features
+    
+    def _progress_to_index(self, progress: float) -> int:
+        """Map degradation progress (0.0 - 1.0) to a file index."""
+        file_index = int(progress * (self.total_files - 1))
+        return max(0, min(file_index, self.total_files - 1))
+    
     def load_file(self, file_index: int) -> Optional[np.ndarray]:
         """
         Load a single data file.
         
+        Parsed files are kept in a small LRU cache keyed by file index, so
+        repeated calls at the same progress don't re-parse the file.
+        
         Returns:
-            np.ndarray: Shape (20481, 8) - vibration samples for 8 bearings
+            np.ndarray: Shape (20481, 8) float32 - vibration samples for 8 bearings
         """
         if not self.files or file_index >= len(self.files):
             return None
-            
+        
+        # Fast path: same file as last call
+        if file_index == self._last_idx:
+            return self._last_data
+        
+        data = self._cache.get(file_index)
+        if data is not None:
+            self._cache.move_to_end(file_index)
+            self._last_idx, self._last_data = file_index, data
+            return data
+        
+        data = self._parse_file(file_index)
+        if data is None:
+            return None
+        
+        self._store(file_index, data)
+        return data
+    
+    def _parse_file(self, file_index: int) -> Optional[np.ndarray]:
+        """Parse a raw data file (no caching, safe to call from worker threads)."""
         try:
             filepath = self.files[file_index]
-            data = np.loadtxt(filepath, delimiter='\t')
-            return data
+            return np.loadtxt(filepath, delimiter='\t', dtype=np.float32)
         except Exception as e:
             logger.error(f"Error loading NASA file: {e}")
             return None
     
+    def _store(self, file_index: int, data: np.ndarray):
+        """Insert a parsed file into the LRU cache."""
+        self._cache[file_index] = data
+        self._cache.move_to_end(file_index)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        self._last_idx, self._last_data = file_index, data
+    
     def get_file_at_progress(self, progress: float) -> Optional[np.ndarray]:
         """
         Get data file at specified progress through the dataset.
@@ -85,11 +348,7 @@ class NASADataLoader:
         if not self.files:
             return None
             
-        # Map progress to file index
-        file_index = int(progress * (self.total_files - 1))
-        file_index = max(0, min(file_index, self.total_files - 1))
-        
-        return self.load_file(file_index)
+        return self.load_file(self._progress_to_index(progress))
     
     def get_bearing_data(self, file_index: int, bearing: int = None) -> Optional[np.ndarray]:
         """
@@ -122,52 +381,40 @@ class NASADataLoader:
             progress: 0.0 = healthy, 1.0 = failure
             
         Returns:
-            Dictionary of extracted features
+            Dictionary of extracted features (shared by calls that map to the
+            same file, so treat it as read-only)
         """
-        data = self.get_file_at_progress(progress)
-        
-        if data is None:
+        if not self.files:
             # Return synthetic degraded features if no data
             return self._synthetic_degradation(progress)
+        
+        file_index = self._progress_to_index(progress)
+        if file_index == self._last_features_idx:
+            return self._last_features
+        
+        # Pre-extracted features (once built): single row lookup, no file access
+        features = None
+        matrix = self._features
+        if matrix is not None:
+            row = matrix[file_index]
+            if not np.isnan(row).all():  # all-NaN marks a file that failed to parse
+                features = _features_to_dict(row)
+        
+        if features is None:
+            data = self.load_file(file_index)
+            if data is None:
+                # Synthetic features follow progress itself, so are not kept
+                return self._synthetic_degradation(progress)
             
-        # Get failed bearing data
-        bearing_data = data[:, self.failed_bearing]
+            # Extract features of the failed bearing
+            features = self._extract_features(data[:, self.failed_bearing])
         
-        # Extract features
-        return self._extract_features(bearing_data)
+        self._last_features_idx, self._last_features = file_index, features
+        return features
     
     def _extract_features(self, data: np.ndarray) -> Dict[str, float]:
         """Extract vibration health features from raw data."""
-        from scipy import stats as scipy_stats
-        
-        # RMS (Root Mean Square)
-        rms = np.sqrt(np.mean(data**2))
-        
-        # Kurtosis (peakedness - increases with damage)
-        kurtosis = float(scipy_stats.kurtosis(data))
-        
-        # Crest Factor (peak-to-RMS ratio)
-        peak = np.max(np.abs(data))
-        crest_factor = peak / rms if rms > 0 else 0
-        
-        # Spectral Energy (via FFT)
-        fft_vals = np.fft.fft(data)
-        spectral_energy = np.sum(np.abs(fft_vals)**2) / len(data)
-        
-        # Peak-to-Peak
-        peak_to_peak = np.max(data) - np.min(data)
-        
-        # Standard deviation
-        std_dev = np.std(data)
-        
-        return {
-            "rms": float(rms),
-            "kurtosis": float(kurtosis),
-            "crest_factor": float(crest_factor),
-            "spectral_energy": float(spectral_energy),
-            "peak_to_peak": float(peak_to_peak),
-            "std_dev": float(std_dev)
-        }
+        return _features_to_dict(_feature_vector(data))
     
     def _synthetic_degradation(self, progress: float) -> Dict[str, float]:
         """
@@ -0,0 +1,28 @@
+"""
+Optional Numba JIT Support
+Numeric kernels are compiled with numba when it is installed; otherwise
+the decorators below are no-ops and callers use their NumPy fallback.
+"""
+try:
+    from numba import njit, prange, vectorize
+    NUMBA_AVAILABLE = True
+except ImportError:
+    import numpy as np
+
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def vectorize(*args, **kwargs):
+        """Stand-in for numba.vectorize: np.vectorize (cast results at the call site)"""
+        def decorator(func):
+            return np.vectorize(func)
+        return decorator
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
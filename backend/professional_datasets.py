@@ -14,11 +14,30 @@ This module provides scientifically accurate sensor profiles for:
 3. Realistic degradation curves
 4. Industry-standard thresholds
 """
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import IO, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from enum import Enum
+import csv
+import io
+import logging
+import multiprocessing
+import os
+import sys
+import threading
 import numpy as np
 
+from numba_compat import njit, prange, NUMBA_AVAILABLE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None  # Parquet export unavailable
+
+logger = logging.getLogger(__name__)
+
 
 class EquipmentClass(Enum):
     """ISO 10816 equipment classification"""
@@ -77,9 +96,41 @@ INSULATION_CLASSES = {
 }
 
 
+# Ordered label tables; batch classifiers return int8 indices into these
+VIBRATION_ZONES = tuple(VibrationSeverity)
+TEMPERATURE_STATUSES = ("NORMAL", "CAUTION", "WARNING", "CRITICAL")
+PHASES = ("HEALTHY", "DEGRADING", "PRE_FAILURE", "FAILURE")
+
+# Failure progress at which each later phase starts
+_PHASE_THRESH = np.array([0.3, 0.6, 0.85])
+
+# Packed copies of the tables above for vectorized classification.
+# _VIB_LIMITS_ARR[class_row, zone] = (min, max) mm/s, shape (4, 4, 2)
+_CLASS_ROW = {eq_class: row for row, eq_class in enumerate(EquipmentClass)}
+_VIB_LIMITS_ARR = np.array([
+    [VIBRATION_LIMITS[eq_class][zone] for zone in VIBRATION_ZONES]
+    for eq_class in EquipmentClass
+])
+
+# _INS_ARR[ins_row] = lower bounds of CAUTION/WARNING/CRITICAL (°C), shape (4, 3)
+_INS_ROW = {ins: row for row, ins in enumerate(INSULATION_CLASSES)}
+_INS_ARR = np.array([
+    [c["max_temp"] - 40, c["max_temp"] - 20, c["max_temp"]]
+    for c in INSULATION_CLASSES.values()
+], dtype=np.float64)
+
+
 # ==================== PROFESSIONAL EQUIPMENT PROFILES ====================
 
-@dataclass
+# Profile records are immutable; slotted where the interpreter supports it (3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Sensor order used by all packed per-sensor arrays
+SENSOR_NAMES = ("vibration_x", "vibration_y", "temperature", "pressure", "rpm")
+SENSOR_COUNT = len(SENSOR_NAMES)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class SensorProfile:
     """Professional sensor baseline and operating ranges"""
     baseline: float           # Normal operating value
@@ -89,7 +140,7 @@ class SensorProfile:
     noise_std: float         # Normal noise standard deviation
     
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class EquipmentProfile:
     """Complete equipment profile with all sensors"""
     name: str
@@ -111,6 +162,20 @@ class EquipmentProfile:
     # Degradation model
     degradation_rate: float  # Health % loss per hour under stress
     
+    # Packed per-sensor values (order: SENSOR_NAMES) for the vectorized generator
+    _baseline: np.ndarray = field(init=False, repr=False, compare=False)
+    _noise_std: np.ndarray = field(init=False, repr=False, compare=False)
+    _warning: np.ndarray = field(init=False, repr=False, compare=False)
+    _critical: np.ndarray = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        sensors = [getattr(self, name) for name in SENSOR_NAMES]
+        # Frozen dataclass: derived fields are set through object.__setattr__
+        object.__setattr__(self, "_baseline", np.array([s.baseline for s in sensors], dtype=np.float32))
+        object.__setattr__(self, "_noise_std", np.array([s.noise_std for s in sensors], dtype=np.float32))
+        object.__setattr__(self, "_warning", np.array([s.warning for s in sensors]))
+        object.__setattr__(self, "_critical", np.array([s.critical for s in sensors]))
+    
     def to_config(self) -> Dict:
         """Convert to config-compatible format"""
         return {
@@ -306,7 +371,24 @@ EQUIPMENT_PROFILES: Dict[str, EquipmentProfile] = {
 
 # ==================== FAILURE MODE PROFILES ====================
 
-@dataclass
+# Degradation curves over the failure progression (array of 0 to 1).
+# Patterns not listed here use the *_DEFAULT curve.
+_VIB_PATTERNS = {
+    "GRADUAL": lambda progress: 1 + (progress * 5),
+    "HARMONIC": lambda progress: 1 + (progress ** 2 * 8),  # Exponential growth
+    "SPIKE": lambda progress: 1 + np.where(progress > 0.8, 3, progress),
+}
+_VIB_DEFAULT = lambda progress: 1 + (progress * 3)
+
+_TEMP_PATTERNS = {
+    "GRADUAL": lambda progress: progress * 50,
+    "RISE": lambda progress: progress ** 1.5 * 60,
+    "SPIKE": lambda progress: np.where(progress > 0.85, 40, progress * 20),
+}
+_TEMP_DEFAULT = lambda progress: progress * 25
+
+
+@dataclass(frozen=True, **_SLOTS)
 class FailureMode:
     """Definition of a specific failure mode"""
     name: str
@@ -321,6 +403,14 @@ class FailureMode:
     vibration_pattern: str     # SPIKE, GRADUAL, HARMONIC
     temperature_pattern: str   # RISE, FLUCTUATE, SPIKE
     
+    # Degradation curves resolved from the patterns once, at construction
+    _vib_fn: Callable = field(init=False, repr=False, compare=False)
+    _temp_fn: Callable = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "_vib_fn", _VIB_PATTERNS.get(self.vibration_pattern, _VIB_DEFAULT))
+        object.__setattr__(self, "_temp_fn", _TEMP_PATTERNS.get(self.temperature_pattern, _TEMP_DEFAULT))
+    
 
 FAILURE_MODES: Dict[str, FailureMode] = {
     
@@ -400,62 +490,89 @@ FAILURE_MODES: Dict[str, FailureMode] = {
 
 # ==================== DEGRADATION CURVES ====================
 
-def calculate_health_score(
-    sensors: Dict[str, float],
+def calculate_health_score_batch(
+    sensors: Dict[str, np.ndarray],
     profile: EquipmentProfile,
-    runtime_hours: float
-) -> float:
+    runtime_hours: np.ndarray
+) -> np.ndarray:
     """
-    Calculate health score based on sensor values and professional thresholds.
-    Uses weighted scoring with industry-standard limits.
+    Calculate health scores for whole sensor series at once.
+    Same weighted scoring as calculate_health_score, branch-free over samples.
     """
-    score = 100.0
+    runtime_hours = np.asarray(runtime_hours, dtype=np.float64)
+    score = np.full(runtime_hours.shape, 100.0)
     
     # Vibration contribution (40% weight)
-    vib_x = sensors.get("vibration_x", profile.vibration_x.baseline)
-    vib_y = sensors.get("vibration_y", profile.vibration_y.baseline)
+    vib_x = np.asarray(sensors.get("vibration_x", profile.vibration_x.baseline), dtype=np.float64)
+    vib_y = np.asarray(sensors.get("vibration_y", profile.vibration_y.baseline), dtype=np.float64)
     avg_vib = (vib_x + vib_y) / 2
+    vib_warn = profile.vibration_x.warning
+    vib_crit = profile.vibration_x.critical
     
-    if avg_vib >= profile.vibration_x.critical:
-        score -= 40
-    elif avg_vib >= profile.vibration_x.warning:
-        vib_factor = (avg_vib - profile.vibration_x.warning) / (
-            profile.vibration_x.critical - profile.vibration_x.warning
+    score -= np.where(
+        avg_vib >= vib_crit, 40,
+        np.where(
+            avg_vib >= vib_warn,
+            25 + 15 * (avg_vib - vib_warn) / (vib_crit - vib_warn),
+            10 * avg_vib / vib_warn
         )
-        score -= 25 + (15 * vib_factor)
-    else:
-        vib_factor = avg_vib / profile.vibration_x.warning
-        score -= 10 * vib_factor
+    )
     
     # Temperature contribution (30% weight)
-    temp = sensors.get("temperature", profile.temperature.baseline)
+    temp = np.asarray(sensors.get("temperature", profile.temperature.baseline), dtype=np.float64)
+    temp_warn = profile.temperature.warning
+    temp_crit = profile.temperature.critical
     
-    if temp >= profile.temperature.critical:
-        score -= 30
-    elif temp >= profile.temperature.warning:
-        temp_factor = (temp - profile.temperature.warning) / (
-            profile.temperature.critical - profile.temperature.warning
+    score -= np.where(
+        temp >= temp_crit, 30,
+        np.where(
+            temp >= temp_warn,
+            18 + 12 * (temp - temp_warn) / (temp_crit - temp_warn),
+            5 * temp / temp_warn
         )
-        score -= 18 + (12 * temp_factor)
-    else:
-        temp_factor = temp / profile.temperature.warning
-        score -= 5 * temp_factor
+    )
     
     # Pressure contribution (20% weight) - only for pressurized equipment
     if profile.pressure.baseline > 0:
-        pressure = sensors.get("pressure", profile.pressure.baseline)
+        pressure = np.asarray(sensors.get("pressure", profile.pressure.baseline), dtype=np.float64)
         # Pressure can be too high OR too low
-        if pressure >= profile.pressure.critical or pressure <= profile.pressure.critical * 0.3:
-            score -= 20
-        elif pressure >= profile.pressure.warning or pressure <= profile.pressure.warning * 0.5:
-            score -= 12
+        crit_band = (pressure >= profile.pressure.critical) | (pressure <= profile.pressure.critical * 0.3)
+        warn_band = (pressure >= profile.pressure.warning) | (pressure <= profile.pressure.warning * 0.5)
+        score -= np.where(crit_band, 20, np.where(warn_band, 12, 0))
     
     # Runtime age penalty (10% weight)
-    if runtime_hours > profile.mtbf_hours * 0.7:
-        age_factor = (runtime_hours - profile.mtbf_hours * 0.7) / (profile.mtbf_hours * 0.3)
-        score -= min(10, 10 * age_factor)
+    mtbf = profile.mtbf_hours
+    score -= np.clip(10 * np.maximum(0, runtime_hours - mtbf * 0.7) / (mtbf * 0.3), 0, 10)
     
-    return max(0, min(100, score))
+    return np.clip(score, 0, 100)
+
+
+def calculate_health_score(
+    sensors: Dict[str, float],
+    profile: EquipmentProfile,
+    runtime_hours: float
+) -> float:
+    """
+    Calculate health score based on sensor values and professional thresholds.
+    Uses weighted scoring with industry-standard limits.
+    """
+    return calculate_health_score_batch(sensors, profile, np.asarray(runtime_hours)).item()
+
+
+def get_vibration_severity_batch(
+    vibration_rms: np.ndarray,
+    equipment_class: EquipmentClass
+) -> np.ndarray:
+    """
+    Vectorized ISO 10816 zone lookup.
+    Returns int8 indices into VIBRATION_ZONES.
+    """
+    vibration_rms = np.asarray(vibration_rms, dtype=np.float64)
+    # Zone A-C upper bounds for this class
+    bounds = _VIB_LIMITS_ARR[_CLASS_ROW[equipment_class], :-1, 1]
+    zone = np.searchsorted(bounds, vibration_rms, side="right")
+    # Out-of-range readings (negative/NaN) fall through to zone D, as in the scalar version
+    return np.where(vibration_rms >= 0, zone, len(VIBRATION_ZONES) - 1).astype(np.int8)
 
 
 def get_vibration_severity(
@@ -466,13 +583,19 @@ def get_vibration_severity(
     Determine vibration severity zone per ISO 10816.
     This is how real industrial systems classify vibration.
     """
-    limits = VIBRATION_LIMITS[equipment_class]
-    
-    for severity, (min_val, max_val) in limits.items():
-        if min_val <= vibration_rms < max_val:
-            return severity
-    
-    return VibrationSeverity.ZONE_D
+    return VIBRATION_ZONES[int(get_vibration_severity_batch(vibration_rms, equipment_class))]
+
+
+def get_temperature_status_batch(
+    temperature: np.ndarray,
+    insulation_class: str
+) -> np.ndarray:
+    """
+    Vectorized IEC 60034 temperature status.
+    Returns int8 indices into TEMPERATURE_STATUSES.
+    """
+    bounds = _INS_ARR[_INS_ROW.get(insulation_class, _INS_ROW["F"])]
+    return np.searchsorted(bounds, temperature, side="right").astype(np.int8)
 
 
 def get_temperature_status(
@@ -482,29 +605,187 @@ def get_temperature_status(
     """
     Determine motor temperature status per IEC 60034.
     """
-    limits = INSULATION_CLASSES.get(insulation_class, INSULATION_CLASSES["F"])
-    
-    if temperature >= limits["max_temp"]:
-        return "CRITICAL"
-    elif temperature >= limits["max_temp"] - 20:
-        return "WARNING"
-    elif temperature >= limits["max_temp"] - 40:
-        return "CAUTION"
+    return TEMPERATURE_STATUSES[int(get_temperature_status_batch(temperature, insulation_class))]
+
+
+@njit(cache=True)
+def _score_phase_sample(avg_vib, t, p, runtime, prog, warning, critical,
+                        has_pressure, mtbf, phase_thresh):
+    """
+    Fused health score + phase assignment for one sample.
+    Mirrors calculate_health_score_batch; warning/critical are a profile's
+    packed arrays (SENSOR_NAMES order).
+    """
+    vib_warn, vib_crit = warning[0], critical[0]
+    temp_warn, temp_crit = warning[2], critical[2]
+    press_warn, press_crit = warning[3], critical[3]
+    
+    score = 100.0
+    
+    if avg_vib >= vib_crit:
+        score -= 40
+    elif avg_vib >= vib_warn:
+        score -= 25 + 15 * (avg_vib - vib_warn) / (vib_crit - vib_warn)
+    else:
+        score -= 10 * avg_vib / vib_warn
+    
+    if t >= temp_crit:
+        score -= 30
+    elif t >= temp_warn:
+        score -= 18 + 12 * (t - temp_warn) / (temp_crit - temp_warn)
     else:
-        return "NORMAL"
+        score -= 5 * t / temp_warn
+    
+    if has_pressure:
+        if p >= press_crit or p <= press_crit * 0.3:
+            score -= 20
+        elif p >= press_warn or p <= press_warn * 0.5:
+            score -= 12
+    
+    if runtime > mtbf * 0.7:
+        score -= min(10.0, 10 * (runtime - mtbf * 0.7) / (mtbf * 0.3))
+    
+    phase = 0
+    while phase < phase_thresh.shape[0] and prog >= phase_thresh[phase]:
+        phase += 1
+    return max(0.0, min(100.0, score)), phase
+
+
+@njit(cache=True)
+def _score_phase_rows(vib_x, vib_y, temp, pressure, runtime_hours, progress,
+                      warning, critical, has_pressure, mtbf, phase_thresh,
+                      out_score, out_phase):
+    """_score_phase_sample over a generated series, one pass"""
+    for i in range(vib_x.shape[0]):
+        out_score[i], out_phase[i] = _score_phase_sample(
+            (vib_x[i] + vib_y[i]) / 2, temp[i], pressure[i], runtime_hours[i], progress[i],
+            warning, critical, has_pressure, mtbf, phase_thresh
+        )
+
+
+@njit(parallel=True, cache=True)
+def _score_phase_rows_parallel(vib_x, vib_y, temp, pressure, runtime_hours, progress,
+                               warning, critical, has_pressure, mtbf, phase_thresh,
+                               out_score, out_phase):
+    """_score_phase_rows with the samples split across threads"""
+    for i in prange(vib_x.shape[0]):
+        out_score[i], out_phase[i] = _score_phase_sample(
+            (vib_x[i] + vib_y[i]) / 2, temp[i], pressure[i], runtime_hours[i], progress[i],
+            warning, critical, has_pressure, mtbf, phase_thresh
+        )
+
+
+# Below this many samples, thread start-up costs more than the parallel loop saves
+# (and ordinary dataset requests never start numba's threading layer)
+_PARALLEL_MIN_ROWS = 200_000
+
+
+def _score_and_phase(
+    profile: EquipmentProfile,
+    sensors: Dict[str, np.ndarray],
+    runtime_hours: np.ndarray,
+    progress: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Health scores and int8 phase codes for a generated series"""
+    if NUMBA_AVAILABLE:
+        score = np.empty(len(progress), dtype=np.float32)
+        phase_id = np.empty(len(progress), dtype=np.int8)
+        kernel = _score_phase_rows_parallel if len(progress) >= _PARALLEL_MIN_ROWS else _score_phase_rows
+        kernel(
+            sensors["vibration_x"], sensors["vibration_y"], sensors["temperature"],
+            sensors["pressure"], runtime_hours, progress,
+            profile._warning, profile._critical, profile.pressure.baseline > 0,
+            float(profile.mtbf_hours), _PHASE_THRESH, score, phase_id
+        )
+        return score, phase_id
+    
+    score = calculate_health_score_batch(sensors, profile, runtime_hours)
+    phase_id = np.searchsorted(_PHASE_THRESH, progress, side="right").astype(np.int8)
+    return score, phase_id
+
+
+if NUMBA_AVAILABLE and os.getenv("MAINTENANCE_NUMBA_WARMUP") == "1":
+    # Compile at import instead of on the first dataset request
+    _score_and_phase(
+        EQUIPMENT_PROFILES["BOILER_FEED_PUMP"],
+        {name: np.ones(1) for name in SENSOR_NAMES},
+        np.zeros(1), np.zeros(1)
+    )
 
 
 # ==================== DATASET GENERATION ====================
 
-def generate_professional_dataset(
+_RNG = np.random.default_rng()
+
+# Per-thread scratch space for the noise draw, grown on demand and reused
+_SCRATCH = threading.local()
+
+
+def _noise_buffer(samples_count: int) -> np.ndarray:
+    """Contiguous (SENSOR_COUNT, samples_count) view into this thread's noise scratch"""
+    size = SENSOR_COUNT * samples_count
+    buf = getattr(_SCRATCH, "noise", None)
+    if buf is None or buf.size < size:
+        buf = np.empty(size, dtype=np.float32)
+        _SCRATCH.noise = buf
+    return buf[:size].reshape(SENSOR_COUNT, samples_count)
+
+
+CSV_HEADER = "timestamp,vibration_x,vibration_y,temperature,pressure,rpm,health_score,phase"
+
+
+@dataclass
+class DatasetArrays:
+    """
+    Column-oriented failure dataset, one array entry per sample.
+    Sensor and health columns are float32 (values carry at most 3 decimals,
+    rpm none); timestamp/progress stay float64.
+    """
+    timestamp_minutes: np.ndarray
+    vibration_x: np.ndarray       # float32
+    vibration_y: np.ndarray       # float32
+    temperature: np.ndarray       # float32
+    pressure: np.ndarray          # float32
+    rpm: np.ndarray               # float32, whole numbers
+    health_score: np.ndarray      # float32
+    phase_id: np.ndarray          # int8 index into PHASES
+    vib_severity_id: np.ndarray   # int8 index into VIBRATION_ZONES
+    temp_status_id: np.ndarray    # int8 index into TEMPERATURE_STATUSES
+    progress: np.ndarray          # 0 to 1
+    
+    def __len__(self) -> int:
+        return len(self.progress)
+    
+    def column_list(self, name: str) -> list:
+        """Column as Python values; float32 columns are re-rounded so 0.552 stays 0.552"""
+        column = getattr(self, name)
+        if name in _COLUMN_DECIMALS:
+            return np.round(column.astype(np.float64), _COLUMN_DECIMALS[name]).tolist()
+        return column.tolist()
+
+
+# Decimal places the float32 columns were rounded to
+_COLUMN_DECIMALS = {
+    "vibration_x": 3,
+    "vibration_y": 3,
+    "temperature": 1,
+    "pressure": 1,
+    "rpm": 0,
+    "health_score": 1,
+}
+
+
+def generate_professional_dataset_arrays(
     equipment_type: str,
     failure_mode: str,
     duration_hours: float = 72,
-    sample_interval_minutes: float = 5
-) -> List[Dict]:
+    sample_interval_minutes: float = 5,
+    seed: Optional[int] = None
+) -> DatasetArrays:
     """
-    Generate a professional-grade failure dataset.
-    Uses real equipment profiles and failure mode patterns.
+    Generate a professional-grade failure dataset as columnar arrays.
+    Same data as generate_professional_dataset, without per-sample dicts.
+    Pass seed for reproducible noise.
     """
     if equipment_type not in EQUIPMENT_PROFILES:
         raise ValueError(f"Unknown equipment type: {equipment_type}")
@@ -515,111 +796,286 @@ def generate_professional_dataset(
     failure = FAILURE_MODES[failure_mode]
     
     samples_count = int(duration_hours * 60 / sample_interval_minutes)
-    dataset = []
-    
-    for i in range(samples_count):
-        # Progress through failure (0 to 1)
-        progress = i / samples_count
-        
-        # Calculate degradation based on failure mode
-        if failure.vibration_pattern == "GRADUAL":
-            vib_multiplier = 1 + (progress * 5)
-        elif failure.vibration_pattern == "HARMONIC":
-            vib_multiplier = 1 + (progress ** 2 * 8)  # Exponential growth
-        elif failure.vibration_pattern == "SPIKE":
-            vib_multiplier = 1 + (3 if progress > 0.8 else progress)
-        else:
-            vib_multiplier = 1 + (progress * 3)
-        
-        if failure.temperature_pattern == "GRADUAL":
-            temp_increase = progress * 50
-        elif failure.temperature_pattern == "RISE":
-            temp_increase = progress ** 1.5 * 60
-        elif failure.temperature_pattern == "SPIKE":
-            temp_increase = 40 if progress > 0.85 else progress * 20
-        else:
-            temp_increase = progress * 25
-        
-        # Generate sensor values with realistic noise
-        sensors = {
-            "vibration_x": round(
-                profile.vibration_x.baseline * vib_multiplier + 
-                np.random.normal(0, profile.vibration_x.noise_std), 3
-            ),
-            "vibration_y": round(
-                profile.vibration_y.baseline * vib_multiplier + 
-                np.random.normal(0, profile.vibration_y.noise_std), 3
-            ),
-            "temperature": round(
-                profile.temperature.baseline + temp_increase + 
-                np.random.normal(0, profile.temperature.noise_std), 1
-            ),
-            "pressure": round(
-                profile.pressure.baseline * (1 - progress * 0.3) + 
-                np.random.normal(0, profile.pressure.noise_std), 1
-            ) if profile.pressure.baseline > 0 else 0,
-            "rpm": round(
-                profile.rpm.baseline * (1 - progress * 0.2) + 
-                np.random.normal(0, profile.rpm.noise_std), 0
-            ),
-        }
-        
-        # Calculate derived metrics
-        health_score = calculate_health_score(sensors, profile, i * sample_interval_minutes / 60)
-        vib_severity = get_vibration_severity(
-            (sensors["vibration_x"] + sensors["vibration_y"]) / 2,
-            profile.equipment_class
-        )
-        temp_status = get_temperature_status(sensors["temperature"], profile.insulation_class)
-        
-        # Determine phase
-        if progress < 0.3:
-            phase = "HEALTHY"
-        elif progress < 0.6:
-            phase = "DEGRADING"
-        elif progress < 0.85:
-            phase = "PRE_FAILURE"
-        else:
-            phase = "FAILURE"
-        
-        dataset.append({
+    
+    # Progress through failure (0 to 1), one entry per sample
+    index = np.arange(samples_count, dtype=np.float64)
+    progress = index / samples_count
+    
+    # Calculate degradation based on failure mode
+    vib_multiplier = failure._vib_fn(progress)
+    temp_increase = failure._temp_fn(progress)
+    
+    # All sensors in one broadcast (rows: vib_x, vib_y, temp, pressure, rpm)
+    scale = np.empty((SENSOR_COUNT, samples_count), dtype=np.float32)
+    scale[0] = vib_multiplier
+    scale[1] = vib_multiplier
+    scale[2] = 1.0
+    scale[3] = 1 - progress * 0.3
+    scale[4] = 1 - progress * 0.2
+    
+    # Realistic noise for all sensors in one draw
+    rng = _RNG if seed is None else np.random.default_rng(seed)
+    noise = _noise_buffer(samples_count)
+    rng.standard_normal(out=noise, dtype=np.float32)
+    np.multiply(noise, profile._noise_std[:, None], out=noise)
+    
+    values = np.multiply(profile._baseline[:, None], scale, out=scale)
+    values += noise
+    values[2] += temp_increase
+    
+    # Round in place; the sensor columns are row views of `values`
+    vib_x = np.round(values[0], 3, out=values[0])
+    vib_y = np.round(values[1], 3, out=values[1])
+    temp = np.round(values[2], 1, out=values[2])
+    if profile.pressure.baseline > 0:
+        pressure = np.round(values[3], 1, out=values[3])
+    else:
+        pressure = np.zeros(samples_count, dtype=np.float32)
+    rpm = np.round(values[4], 0, out=values[4])
+    
+    # Calculate derived metrics from the float64 values the columns stand for,
+    # so readings on a limit (e.g. an average of exactly 1.8) score as before
+    sensors = {
+        name: np.round(column.astype(np.float64), _COLUMN_DECIMALS[name])
+        for name, column in (("vibration_x", vib_x), ("vibration_y", vib_y),
+                             ("temperature", temp), ("pressure", pressure))
+    }
+    health_score, phase_id = _score_and_phase(
+        profile, sensors, index * sample_interval_minutes / 60, progress
+    )
+    vib_severity_id = get_vibration_severity_batch(
+        (sensors["vibration_x"] + sensors["vibration_y"]) / 2, profile.equipment_class
+    )
+    temp_status_id = get_temperature_status_batch(sensors["temperature"], profile.insulation_class)
+    
+    return DatasetArrays(
+        timestamp_minutes=index * sample_interval_minutes,
+        vibration_x=vib_x,
+        vibration_y=vib_y,
+        temperature=temp,
+        pressure=pressure,
+        rpm=rpm,
+        health_score=np.round(health_score, 1).astype(np.float32, copy=False),
+        phase_id=phase_id,
+        vib_severity_id=vib_severity_id,
+        temp_status_id=temp_status_id,
+        progress=progress,
+    )
+
+
+def generate_professional_dataset(
+    equipment_type: str,
+    failure_mode: str,
+    duration_hours: float = 72,
+    sample_interval_minutes: float = 5,
+    seed: Optional[int] = None
+) -> List[Dict]:
+    """
+    Generate a professional-grade failure dataset.
+    Uses real equipment profiles and failure mode patterns.
+    """
+    arrays = generate_professional_dataset_arrays(
+        equipment_type, failure_mode, duration_hours, sample_interval_minutes, seed
+    )
+    return list(iter_professional_dataset(arrays, equipment_type, sample_interval_minutes))
+
+
+def iter_professional_dataset(arrays: DatasetArrays, equipment_type: str,
+                              sample_interval_minutes: float) -> Iterator[Dict]:
+    """
+    Per-sample dicts of a columnar dataset (the generate_professional_dataset
+    rows), produced one at a time so large datasets can be streamed
+    """
+    if EQUIPMENT_PROFILES[equipment_type].pressure.baseline > 0:
+        pressure = arrays.column_list("pressure")
+    else:
+        pressure = [0] * len(arrays)
+    
+    return (
+        {
             "sample_index": i,
             "timestamp_offset_minutes": i * sample_interval_minutes,
-            "sensors": sensors,
-            "health_score": round(health_score, 1),
-            "phase": phase,
-            "vibration_severity": vib_severity.value,
-            "temperature_status": temp_status,
-            "progress_percent": round(progress * 100, 1),
-        })
+            "sensors": {
+                "vibration_x": vx,
+                "vibration_y": vy,
+                "temperature": t,
+                "pressure": p,
+                "rpm": r,
+            },
+            "health_score": hs,
+            "phase": PHASES[ph],
+            "vibration_severity": VIBRATION_ZONES[vs].value,
+            "temperature_status": TEMPERATURE_STATUSES[ts],
+            "progress_percent": round(prog * 100, 1),
+        }
+        for i, (vx, vy, t, p, r, hs, ph, vs, ts, prog) in enumerate(zip(
+            arrays.column_list("vibration_x"),
+            arrays.column_list("vibration_y"),
+            arrays.column_list("temperature"),
+            pressure,
+            arrays.column_list("rpm"),
+            arrays.column_list("health_score"),
+            arrays.phase_id.tolist(),
+            arrays.vib_severity_id.tolist(),
+            arrays.temp_status_id.tolist(),
+            arrays.progress.tolist(),
+        ))
+    )
+
+
+def _generate_one(args: Tuple[str, str, float, float, int]) -> DatasetArrays:
+    """Process-pool worker: one equipment x failure-mode dataset"""
+    return generate_professional_dataset_arrays(*args)
+
+
+def generate_all_training_datasets(
+    duration_hours: float = 72,
+    sample_interval_minutes: float = 5,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Dict[Tuple[str, str], DatasetArrays]:
+    """
+    Generate a dataset for every equipment type x failure mode combination.
+    Combinations run in parallel across processes; each gets its own
+    independent seed (derived from `seed` if given, for reproducible output).
+    """
+    combos = [(etype, fmode) for etype in EQUIPMENT_PROFILES for fmode in FAILURE_MODES]
+    seeds = [
+        int(child.generate_state(1)[0])
+        for child in np.random.SeedSequence(seed).spawn(len(combos))
+    ]
+    tasks = [
+        (etype, fmode, duration_hours, sample_interval_minutes, task_seed)
+        for (etype, fmode), task_seed in zip(combos, seeds)
+    ]
+    
+    try:
+        # spawn, not fork: the parent may already have numba/TBB threads running
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(_generate_one, tasks, chunksize=4))
+    except Exception as e:
+        logger.warning(f"Parallel dataset generation failed ({e}), running serially")
+        results = [_generate_one(task) for task in tasks]
     
-    return dataset
+    return dict(zip(combos, results))
 
 
-def export_dataset_for_training(datasets: List[Dict], format: str = "csv") -> str:
+def _write_arrays_csv(arrays: DatasetArrays, out: IO[str]):
+    """
+    Stream the columnar form as CSV, formatted like _write_samples_csv
+    (Python float text, pressure 0 for equipment without a pressure sensor)
+    """
+    if arrays.pressure.any():
+        pressure = arrays.column_list("pressure")
+    else:
+        pressure = [0] * len(arrays)
+    
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(CSV_HEADER.split(","))
+    writer.writerows(zip(
+        arrays.timestamp_minutes.tolist(),
+        arrays.column_list("vibration_x"),
+        arrays.column_list("vibration_y"),
+        arrays.column_list("temperature"),
+        pressure,
+        arrays.column_list("rpm"),
+        arrays.column_list("health_score"),
+        [PHASES[ph] for ph in arrays.phase_id.tolist()],
+    ))
+
+
+def _write_samples_csv(datasets: List[Dict], out: IO[str]):
+    """Stream the list-of-dicts form as CSV, one row at a time"""
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(CSV_HEADER.split(","))
+    writer.writerows(
+        (
+            sample["timestamp_offset_minutes"],
+            sample["sensors"]["vibration_x"],
+            sample["sensors"]["vibration_y"],
+            sample["sensors"]["temperature"],
+            sample["sensors"]["pressure"],
+            sample["sensors"]["rpm"],
+            sample["health_score"],
+            sample["phase"],
+        )
+        for sample in datasets
+    )
+
+
+def _write_arrays_parquet(arrays: DatasetArrays, out):
+    """Write the columnar form as Snappy-compressed Parquet (dtypes preserved)"""
+    def labels(codes: np.ndarray, names) -> "pa.DictionaryArray":
+        # 1-byte codes + a small string dictionary instead of one string per row
+        return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int8()), pa.array(names))
+    
+    table = pa.table({
+        "timestamp": arrays.timestamp_minutes,
+        "vibration_x": arrays.vibration_x,
+        "vibration_y": arrays.vibration_y,
+        "temperature": arrays.temperature,
+        "pressure": arrays.pressure,
+        "rpm": arrays.rpm,
+        "health_score": arrays.health_score,
+        "phase": labels(arrays.phase_id, PHASES),
+        "vibration_severity": labels(arrays.vib_severity_id, [z.value for z in VIBRATION_ZONES]),
+        "temperature_status": labels(arrays.temp_status_id, TEMPERATURE_STATUSES),
+        "progress": arrays.progress,
+    })
+    pq.write_table(table, out, compression="snappy")
+
+
+def export_dataset_for_training(
+    datasets: Union[List[Dict], DatasetArrays],
+    format: str = "csv",
+    out=None
+) -> Union[str, bytes, None]:
     """
     Export datasets in format suitable for ML training.
+    Accepts either the list-of-dicts or the DatasetArrays form.
+    Formats: csv, json, parquet (DatasetArrays only; needs pyarrow).
+    Writes to `out` if given (returns None), otherwise returns the text
+    (or bytes for parquet). For parquet, `out` may be a path or binary file.
     """
     import json
     
+    if format not in ("csv", "json", "parquet"):
+        raise ValueError(f"Unknown format: {format}")
+    
+    if format == "parquet":
+        if pa is None:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        if not isinstance(datasets, DatasetArrays):
+            raise ValueError("Parquet export needs DatasetArrays (use generate_professional_dataset_arrays)")
+        target = io.BytesIO() if out is None else out
+        _write_arrays_parquet(datasets, target)
+        return target.getvalue() if out is None else None
+    
+    target = io.StringIO() if out is None else out
+    
     if format == "json":
-        return json.dumps(datasets, indent=2)
-    elif format == "csv":
-        lines = ["timestamp,vibration_x,vibration_y,temperature,pressure,rpm,health_score,phase"]
-        for sample in datasets:
-            s = sample["sensors"]
-            lines.append(
-                f"{sample['timestamp_offset_minutes']},{s['vibration_x']},{s['vibration_y']},"
-                f"{s['temperature']},{s['pressure']},{s['rpm']},"
-                f"{sample['health_score']},{sample['phase']}"
-            )
-        return "\n".join(lines)
+        if isinstance(datasets, DatasetArrays):
+            payload = {f.name: datasets.column_list(f.name) for f in fields(datasets)}
+        else:
+            payload = datasets
+        json.dump(payload, target, indent=2)
+    elif isinstance(datasets, DatasetArrays):
+        _write_arrays_csv(datasets, target)
     else:
-        raise ValueError(f"Unknown format: {format}")
+        _write_samples_csv(datasets, target)
+    
+    if out is not None:
+        return None
+    text = target.getvalue()
+    return text[:-1] if text.endswith("\n") else text
 
 
 # ==================== EXPORTS ====================
 
+# The profile and failure-mode tables are fixed at import, so their exports are
+# built once and shared between callers (treat them as read-only)
+
+@lru_cache(maxsize=1)
 def get_all_equipment_profiles() -> Dict[str, Dict]:
     """Get all equipment profiles as config-compatible dicts"""
     return {
@@ -628,6 +1084,7 @@ def get_all_equipment_profiles() -> Dict[str, Dict]:
     }
 
 
+@lru_cache(maxsize=1)
 def get_all_failure_modes() -> List[Dict]:
     """Get all failure mode definitions"""
     return [
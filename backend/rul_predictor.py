@@ -2,12 +2,231 @@
 Remaining Useful Life (RUL) Predictor
 Uses XGBoost model trained on NASA bearing dataset to predict time until failure
 """
+import logging
+import os
 import pickle
-import pandas as pd
+import threading
 import numpy as np
 from pathlib import Path
 from typing import Dict, Tuple
 
+from numba_compat import njit, prange, vectorize, NUMBA_AVAILABLE
+
+try:
+    import joblib
+except ImportError:
+    joblib = None
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = Path(__file__).parent / "models"
+
+
+@njit(cache=True)
+def _ramp(x, start, inv_width):
+    """0 below start, 1 above start + 1/inv_width, linear in between"""
+    return min(max((x - start) * inv_width, 0.0), 1.0)
+
+
+# Ladders below are (start, 1/width, step) ramps: reciprocals are taken once
+# here so every segment is a multiply rather than a divide
+
+# Vibration score: Calibrated to config.py thresholds
+# Baseline: 0.35-0.60 (healthy), Warning: 1.2-1.5, Critical: 2.5-3.0
+# 100 up to 0.65, -20 to 80 at 1.2, -50 to 30 at 2.5, -30 to 0 at 3.5
+_VIB_RAMPS = ((0.65, 1 / 0.55, 20.0), (1.2, 1 / 1.3, 50.0), (2.5, 1 / 1.0, 30.0))
+
+# RUL based on health (non-linear for better lead time prediction)
+# Health 100-70: RUL 144-72h (HEALTHY)
+# Health 70-40: RUL 72-24h (DEGRADING - WARNING)
+# Health 40-0: RUL 24-0h (PRE_FAILURE/FAILURE - CRITICAL)
+_RUL_RAMPS = ((0.0, 1 / 40, 24.0), (40.0, 1 / 30, 48.0), (70.0, 1 / 30, 72.0))
+
+
+# Temperature regimes, inferred from the reading itself:
+# HVAC chiller: baseline ~7.5°C, warning >10°C, critical >15°C
+# Motors: baseline ~72-82°C, warning >85°C, critical >95°C
+# Pumps: baseline ~52°C, warning >70°C, critical >85°C
+REGIME_HVAC, REGIME_PUMP, REGIME_MOTOR = 0, 1, 2
+
+# Per-regime temperature ladder (drops from 100), indexed by regime
+_TEMP_RAMPS = (
+    ((7.5, 1 / 2.5, 30.0), (10.0, 1 / 5.0, 50.0), (15.0, 1 / 5.0, 20.0)),     # HVAC
+    ((52.0, 1 / 18.0, 25.0), (70.0, 1 / 15.0, 45.0), (85.0, 1 / 15.0, 30.0)),  # pump
+    ((72.0, 1 / 13.0, 25.0), (85.0, 1 / 10.0, 45.0), (95.0, 1 / 10.0, 30.0)),  # motor
+)
+
+
+@njit(cache=True)
+def _temp_regime(temp):
+    """REGIME_* code for a temperature reading"""
+    if temp < 20:  # Likely HVAC/chiller
+        return REGIME_HVAC
+    elif temp > 60:  # Likely motor
+        return REGIME_MOTOR
+    return REGIME_PUMP
+
+
+@njit(cache=True)
+def _temp_score(temp, regime):
+    """Temperature score on the given regime's ladder"""
+    temp_score = 100.0
+    for start, inv_width, drop in _TEMP_RAMPS[regime]:
+        temp_score -= drop * _ramp(temp, start, inv_width)
+    return temp_score
+
+
+@njit(cache=True)
+def _heuristic_rul_kernel(vib_x, vib_y, temp, pressure):
+    """
+    Scalar heuristic behind RULPredictor._heuristic_rul.
+    Returns unrounded (rul_hours, health_score).
+    
+    Every ladder is continuous and piecewise linear, so it is written as a
+    sum of clamped ramps (one per segment) instead of if/elif chains.
+    """
+    # Vibration score (see _VIB_RAMPS)
+    avg_vib = (vib_x + vib_y) * 0.5
+    vib_score = 100.0
+    for start, inv_width, drop in _VIB_RAMPS:
+        vib_score -= drop * _ramp(avg_vib, start, inv_width)
+    
+    # Temperature score: context-aware per equipment type
+    temp_score = _temp_score(temp, _temp_regime(temp))
+    
+    # Combined health score (vibration weighted more heavily for industrial equipment)
+    health_score = (vib_score * 0.6) + (temp_score * 0.4)
+    health_score = min(100.0, max(0.0, health_score))  # Clamp to 0-100
+    
+    # RUL based on health (see _RUL_RAMPS)
+    rul_hours = 0.0
+    for start, inv_width, hours in _RUL_RAMPS:
+        rul_hours += hours * _ramp(health_score, start, inv_width)
+    
+    return rul_hours, health_score
+
+
+# Compile now rather than inside the first API request (cache=True makes this a load)
+_heuristic_rul_kernel(0.5, 0.5, 70.0, 100.0)
+
+
+# Failure risk labels, indexed by _risk_code
+RISK_LEVELS = np.array(["low", "medium", "high"])
+
+
+@vectorize(["int8(float32)", "int8(float64)"])
+def _risk_code(rul_hours):
+    """0 = low (> 72h), 1 = medium (> 24h), 2 = high"""
+    if rul_hours > 72:
+        return 0
+    elif rul_hours > 24:
+        return 1
+    else:
+        return 2
+
+
+# Column order of batch sensor arrays, with the defaults used for missing readings
+SENSOR_COLUMNS = ("vibration_x", "vibration_y", "temperature", "pressure")
+SENSOR_DEFAULTS = (0.5, 0.5, 70.0, 100.0)
+
+
+def sensors_to_array(sensor_data_list, columns=SENSOR_COLUMNS, defaults=SENSOR_DEFAULTS) -> np.ndarray:
+    """Stack sensor dicts into an (N, len(columns)) array (default: SENSOR_COLUMNS order)"""
+    return np.array([
+        [sd.get(col, default) for col, default in zip(columns, defaults)]
+        for sd in sensor_data_list
+    ], dtype=np.float64).reshape(-1, len(columns))
+
+
+def fill_missing(sensor_arr: np.ndarray, defaults) -> np.ndarray:
+    """Replace NaN (missing) readings column-wise with defaults"""
+    return np.where(np.isnan(sensor_arr), defaults, sensor_arr)
+
+
+def _ramp_array(x: np.ndarray, start: float, inv_width: float) -> np.ndarray:
+    """Array form of _ramp (keeps x's dtype, so float32 batches stay float32)"""
+    return np.clip((x - start) * inv_width, 0.0, 1.0)
+
+
+def _heuristic_rul_vectorized(sensor_arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    _heuristic_rul_kernel over an (N, 4) array with NumPy.
+    Returns unrounded (rul_hours[N], health_score[N]).
+    """
+    vib_x, vib_y, temp = sensor_arr[:, 0], sensor_arr[:, 1], sensor_arr[:, 2]
+    
+    avg_vib = (vib_x + vib_y) * 0.5
+    vib_score = np.full_like(avg_vib, 100.0)
+    for start, inv_width, drop in _VIB_RAMPS:
+        vib_score -= drop * _ramp_array(avg_vib, start, inv_width)
+    
+    # Temperature score: partition rows by regime and score each slice only
+    # on its own ladder
+    regime = np.where(temp < 20, REGIME_HVAC, np.where(temp > 60, REGIME_MOTOR, REGIME_PUMP))
+    temp_score = np.empty_like(temp)
+    for code, ramps in enumerate(_TEMP_RAMPS):
+        idx = np.flatnonzero(regime == code)
+        if idx.size == 0:
+            continue
+        t = temp[idx]
+        score = np.full_like(t, 100.0)
+        for start, inv_width, drop in ramps:
+            score -= drop * _ramp_array(t, start, inv_width)
+        temp_score[idx] = score
+    
+    health_score = np.clip((vib_score * 0.6) + (temp_score * 0.4), 0.0, 100.0)
+    
+    rul_hours = np.zeros_like(health_score)
+    for start, inv_width, hours in _RUL_RAMPS:
+        rul_hours += hours * _ramp_array(health_score, start, inv_width)
+    return rul_hours, health_score
+
+
+@njit(cache=True)
+def _heuristic_rul_rows(sensor_arr, rul_out, health_out):
+    """_heuristic_rul_kernel over the rows of an (N, 4) array, one pass"""
+    for i in range(sensor_arr.shape[0]):
+        rul_out[i], health_out[i] = _heuristic_rul_kernel(
+            sensor_arr[i, 0], sensor_arr[i, 1], sensor_arr[i, 2], sensor_arr[i, 3]
+        )
+
+
+@njit(parallel=True, cache=True)
+def _heuristic_rul_rows_parallel(sensor_arr, rul_out, health_out):
+    """_heuristic_rul_rows with the rows split across threads"""
+    for i in prange(sensor_arr.shape[0]):
+        rul_out[i], health_out[i] = _heuristic_rul_kernel(
+            sensor_arr[i, 0], sensor_arr[i, 1], sensor_arr[i, 2], sensor_arr[i, 3]
+        )
+
+
+# Below this many rows, thread start-up costs more than the parallel loop saves
+_PARALLEL_MIN_ROWS = 4096
+
+
+def _heuristic_rul_batch(sensor_arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Unrounded (rul_hours[N], health_score[N]) for an (N, 4) array, in its dtype.
+    Single-pass numba loop into preallocated outputs; NumPy fallback without numba.
+    """
+    if not NUMBA_AVAILABLE:
+        return _heuristic_rul_vectorized(sensor_arr)
+    
+    rul_hours = np.empty(sensor_arr.shape[0], dtype=sensor_arr.dtype)
+    health_score = np.empty_like(rul_hours)
+    if sensor_arr.shape[0] >= _PARALLEL_MIN_ROWS:
+        _heuristic_rul_rows_parallel(sensor_arr, rul_hours, health_score)
+    else:
+        _heuristic_rul_rows(sensor_arr, rul_hours, health_score)
+    return rul_hours, health_score
+
+
+if NUMBA_AVAILABLE:
+    # The fleet endpoints batch every request; compile (or load) that loop now
+    _heuristic_rul_batch(np.array([SENSOR_DEFAULTS]))
+    if os.getenv("MAINTENANCE_NUMBA_WARMUP") == "1":
+        _heuristic_rul_rows_parallel(np.array([SENSOR_DEFAULTS]), np.empty(1), np.empty(1))
+
 
 class RULPredictor:
     """Predicts Remaining Useful Life for industrial equipment"""
@@ -23,25 +242,59 @@ class RULPredictor:
             'sensor_21'
         ]
         
+        # Per-thread feature row buffers (Flask serves requests from several threads)
+        self._local = threading.local()
+        
+        # Last (readings, result) per machine: several endpoints score the same
+        # latest reading, so repeats are answered without recomputing. Entries
+        # are replaced whole, which is atomic under the GIL (no lock needed).
+        self._last_result: Dict[str, Tuple[tuple, Tuple[float, float]]] = {}
+        
         if model_path is None:
-            model_path = Path(__file__).parent / "models" / "xgb.pkl"
+            model_path = MODELS_DIR / "xgb.pkl"
         
         self.load_model(model_path)
     
     def load_model(self, model_path):
         """Load pre-trained XGBoost model"""
         try:
-            with open(model_path, "rb") as f:
-                self.model = pickle.load(f)
-            print(f"✓ RUL model loaded from {model_path}")
+            self.model = self._load_pickle(Path(model_path))
+            logger.info("✓ RUL model loaded from %s", model_path)
         except Exception as e:
-            print(f"✗ Failed to load model: {e}")
+            logger.warning("✗ Failed to load RUL model: %s", e)
             self.model = None
     
-    def _map_sensors_to_features(self, sensor_data: Dict, machine_id: str) -> pd.DataFrame:
+    @staticmethod
+    def _load_pickle(model_path: Path):
+        """
+        Unpickle a model, memory-mapping its numpy arrays when the file was
+        written with joblib.dump. Plain pickles load through joblib too; pickle
+        is the fallback when joblib is missing or rejects the file.
+        """
+        if joblib is not None:
+            try:
+                return joblib.load(model_path, mmap_mode="r")
+            except ImportError:
+                raise  # the model's own dependencies are missing either way
+            except Exception:
+                pass
+        with open(model_path, "rb") as f:
+            return pickle.load(f)
+    
+    def _feature_row(self) -> np.ndarray:
+        """This thread's (1, 25) float32 feature row"""
+        local = self._local
+        if not hasattr(local, "buf"):
+            local.buf = np.zeros((1, len(self.feature_columns)), dtype=np.float32)
+        return local.buf
+    
+    def _fill_features(self, sensor_data: Dict, machine_id: str) -> np.ndarray:
         """
         Map real sensor data to NASA dataset features
         This is an approximation since our simulated sensors differ from NASA features
+        
+        Fills and returns the per-thread (1, 25) row in feature_columns order,
+        without touching pandas.
         """
         # Extract sensor values
         vib_x = sensor_data.get("vibration_x", 0.5)
@@ -54,115 +307,94 @@ class RULPredictor:
         # In a real system, these would be actual sensor readings
         engine_no = int(machine_id.split("-")[1]) if "-" in machine_id else 1
         
-        features = {
-            'engine_no': engine_no,
-            'op_setting_1': rpm / 1500,  # Normalized RPM
-            'op_setting_2': pressure / 100,  # Normalized pressure
-            'op_setting_3': temp / 70,  # Normalized temp
-            'sensor_1': vib_x,
-            'sensor_2': vib_y,
-            'sensor_3': temp / 50,
-            'sensor_4': pressure / 80,
-            'sensor_5': vib_x * 1.1,
-            'sensor_6': vib_y * 1.1,
-            'sensor_7': temp / 100,
-            'sensor_8': pressure / 120,
-            'sensor_9': rpm / 2000,
-            'sensor_10': vib_x * vib_y,
-            'sensor_11': temp / 90,
-            'sensor_12': pressure / 110,
-            'sensor_13': vib_x * 1.2,
-            'sensor_14': vib_y * 1.2,
-            'sensor_15': temp / 85,
-            'sensor_16': pressure / 95,
-            'sensor_17': rpm / 1800,
-            'sensor_18': vib_x * 0.9,
-            'sensor_19': vib_y * 0.9,
-            'sensor_20': temp / 75,
-            'sensor_21': pressure / 105
-        }
+        buf = self._feature_row()
+        row = buf[0]
+        row[0] = engine_no             # engine_no
+        row[1] = rpm / 1500            # op_setting_1: normalized RPM
+        row[2] = pressure / 100        # op_setting_2: normalized pressure
+        row[3] = temp / 70             # op_setting_3: normalized temp
+        row[4] = vib_x                 # sensor_1
+        row[5] = vib_y                 # sensor_2
+        row[6] = temp / 50             # sensor_3
+        row[7] = pressure / 80         # sensor_4
+        row[8] = vib_x * 1.1           # sensor_5
+        row[9] = vib_y * 1.1           # sensor_6
+        row[10] = temp / 100           # sensor_7
+        row[11] = pressure / 120       # sensor_8
+        row[12] = rpm / 2000           # sensor_9
+        row[13] = vib_x * vib_y        # sensor_10
+        row[14] = temp / 90            # sensor_11
+        row[15] = pressure / 110       # sensor_12
+        row[16] = vib_x * 1.2          # sensor_13
+        row[17] = vib_y * 1.2          # sensor_14
+        row[18] = temp / 85            # sensor_15
+        row[19] = pressure / 95        # sensor_16
+        row[20] = rpm / 1800           # sensor_17
+        row[21] = vib_x * 0.9          # sensor_18
+        row[22] = vib_y * 0.9          # sensor_19
+        row[23] = temp / 75            # sensor_20
+        row[24] = pressure / 105       # sensor_21
         
-        return pd.DataFrame([features], columns=self.feature_columns)
+        return buf
     
     def predict_rul(self, sensor_data: Dict, machine_id: str) -> Tuple[float, float]:
         """
         Predict Remaining Useful Life
         Returns: (rul_hours, health_score_percentage)
         """
-        # Use heuristic method directly for now (XGBoost model has compatibility issues)
-        # In production, retrain model with current XGBoost version
-        return self._heuristic_rul(sensor_data)
+        # Keyed on the heuristic's inputs only (rpm does not affect it)
+        get = sensor_data.get
+        key = (get("vibration_x", 0.5), get("vibration_y", 0.5), get("temperature", 70),
+               get("pressure", 100))
+        last = self._last_result.get(machine_id)
+        if last is not None and last[0] == key:
+            return last[1]
+        
+        # Use heuristic method directly, like predict_rul_batch (XGBoost model has
+        # compatibility issues)
+        result = self.predict_rul_fast(*key)
+        self._last_result[machine_id] = (key, result)
+        return result
+    
+    def predict_rul_batch(self, sensor_arr: np.ndarray,
+                          dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict RUL for many machines at once.
+        sensor_arr: (N, 4) array in SENSOR_COLUMNS order (see sensors_to_array)
+        dtype: compute precision. np.float32 halves memory traffic and output
+               size for large batches (e.g. scoring generated datasets), at the
+               cost of matching predict_rul only to the rounding below.
+        Returns: (rul_hours[N], health_score[N]), rounded with np.round (can differ
+        from predict_rul's round() by one unit in the last place on ties)
+        """
+        sensor_arr = np.ascontiguousarray(sensor_arr, dtype=dtype).reshape(-1, len(SENSOR_COLUMNS))
+        rul_hours, health_score = _heuristic_rul_batch(sensor_arr)
+        return np.round(rul_hours, 1), np.round(health_score, 2)
+    
+    def predict_rul_fast(self, vib_x: float, vib_y: float, temp: float,
+                         pressure: float) -> Tuple[float, float]:
+        """
+        Heuristic RUL from plain floats, for callers that already hold the readings
+        (no sensor dict lookups, no model refinement)
+        Returns: (rul_hours, health_score_percentage)
+        """
+        rul_hours, health_score = _heuristic_rul_kernel(
+            float(vib_x), float(vib_y), float(temp), float(pressure)
+        )
+        return round(rul_hours, 1), round(health_score, 2)
     
     def _heuristic_rul(self, sensor_data: Dict) -> Tuple[float, float]:
         """
         Equipment-agnostic health heuristic for thermal power plant.
         OPTIMIZED: Thresholds synchronized with config.py warning/critical values
         """
-        vib_x = sensor_data.get("vibration_x", 0.5)
-        vib_y = sensor_data.get("vibration_y", 0.5)
-        temp = sensor_data.get("temperature", 70)
-        pressure = sensor_data.get("pressure", 100)
-        
-        # Vibration score: Calibrated to config.py thresholds
-        # Baseline: 0.35-0.60 (healthy), Warning: 1.2-1.5, Critical: 2.5-3.0
-        avg_vib = (vib_x + vib_y) / 2
-        if avg_vib <= 0.65:  # Healthy baseline range
-            vib_score = 100
-        elif avg_vib <= 1.2:  # Approaching warning (EARLY DETECTION)
-            vib_score = 100 - ((avg_vib - 0.65) / 0.55) * 20  # Linear drop to 80
-        elif avg_vib <= 2.5:  # Warning to critical range
-            vib_score = 80 - ((avg_vib - 1.2) / 1.3) * 50  # Drop to 30
-        else:  # Critical and beyond
-            vib_score = max(0, 30 - ((avg_vib - 2.5) / 1.0) * 30)  # Drop to 0
-        
-        # Temperature score: context-aware per equipment type
-        # HVAC chiller: baseline ~7.5°C, warning >10°C, critical >15°C
-        # Motors: baseline ~72-82°C, warning >85°C, critical >95°C
-        # Pumps: baseline ~52°C, warning >70°C, critical >85°C
-        if temp < 20:  # Likely HVAC/chiller
-            if temp <= 7.5:
-                temp_score = 100
-            elif temp <= 10.0:  # Warning zone
-                temp_score = 100 - ((temp - 7.5) / 2.5) * 30
-            elif temp <= 15.0:  # Critical zone
-                temp_score = 70 - ((temp - 10.0) / 5.0) * 50
-            else:
-                temp_score = max(0, 20 - ((temp - 15.0) / 5.0) * 20)
-        elif temp > 60:  # Likely motor
-            if temp <= 72:
-                temp_score = 100
-            elif temp <= 85:  # Warning zone
-                temp_score = 100 - ((temp - 72) / 13) * 25
-            elif temp <= 95:  # Critical zone
-                temp_score = 75 - ((temp - 85) / 10) * 45
-            else:
-                temp_score = max(0, 30 - ((temp - 95) / 10) * 30)
-        else:  # Pump range
-            if temp <= 52:
-                temp_score = 100
-            elif temp <= 70:  # Warning zone
-                temp_score = 100 - ((temp - 52) / 18) * 25
-            elif temp <= 85:  # Critical zone
-                temp_score = 75 - ((temp - 70) / 15) * 45
-            else:
-                temp_score = max(0, 30 - ((temp - 85) / 15) * 30)
-        
-        # Combined health score (vibration weighted more heavily for industrial equipment)
-        health_score = (vib_score * 0.6) + (temp_score * 0.4)
-        health_score = min(100, max(0, health_score))  # Clamp to 0-100
-        
-        # RUL based on health (non-linear for better lead time prediction)
-        # Health 100-70: RUL 144-72h (HEALTHY)
-        # Health 70-40: RUL 72-24h (DEGRADING - WARNING)
-        # Health 40-0: RUL 24-0h (PRE_FAILURE/FAILURE - CRITICAL)
-        if health_score >= 70:
-            rul_hours = 72 + ((health_score - 70) / 30) * 72  # 72-144h
-        elif health_score >= 40:
-            rul_hours = 24 + ((health_score - 40) / 30) * 48  # 24-72h
-        else:
-            rul_hours = (health_score / 40) * 24  # 0-24h
-        
-        return round(rul_hours, 1), round(health_score, 2)
+        get = sensor_data.get
+        return self.predict_rul_fast(
+            get("vibration_x", 0.5),
+            get("vibration_y", 0.5),
+            get("temperature", 70),
+            get("pressure", 100),
+        )
     
     def get_failure_probability(self, rul_hours: float) -> str:
         """Classify failure risk based on RUL"""
@@ -172,21 +404,32 @@ class RULPredictor:
             return "medium"
         else:
             return "high"
+    
+    def get_failure_probability_batch(self, rul_hours: np.ndarray) -> np.ndarray:
+        """
+        Risk codes for an array of RULs: int8 indices into RISK_LEVELS
+        (translate with RISK_LEVELS[codes] only where labels are needed)
+        """
+        return _risk_code(np.asarray(rul_hours, dtype=np.float64)).astype(np.int8, copy=False)
 
 
 # Global predictor instance
 predictor = None
+_predictor_lock = threading.Lock()
 
 
 def get_predictor() -> RULPredictor:
     """Get or create RUL predictor singleton"""
     global predictor
     if predictor is None:
-        predictor = RULPredictor()
+        with _predictor_lock:
+            if predictor is None:
+                predictor = RULPredictor()
     return predictor
 
 
-if __name__ == "__main__":
+def _selftest():
+    """Print predictions for a healthy, a degraded and a critical reading"""
     # Test the predictor
     print("Testing RUL Predictor...")
     pred = RULPredictor()
@@ -223,3 +466,8 @@ if __name__ == "__main__":
     }
     rul, health = pred.predict_rul(critical_data, "M-003")
     print(f"Critical Machine: RUL={rul}h, Health={health}%, Risk={pred.get_failure_probability(rul)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    _selftest()
@@ -1,19 +1,28 @@
 
-import urllib.request
 import json
 import time
 
-BASE_URL = 'http://localhost:5000/api'
+from api_client import ApiClient
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(data):
+    """JSON-encode straight to bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+loads = orjson.loads if orjson is not None else json.loads
+
+# One connection reused for every call
+client = ApiClient()
 
 def post(endpoint, data):
     try:
-        req = urllib.request.Request(
-            f'{BASE_URL}/{endpoint}',
-            data=json.dumps(data).encode('utf-8'),
-            headers={'Content-Type': 'application/json'}
-        )
-        with urllib.request.urlopen(req) as r:
-            return json.load(r)
+        return loads(client.request('POST', endpoint, dumps(data)))
     except Exception as e:
         print(f"Error calling {endpoint}: {e}")
         return None
@@ -2,13 +2,30 @@
 Production-Grade Flask REST API Server
 Industrial Predictive Maintenance with Alert Lifecycle Management
 """
-from flask import Flask, jsonify, request
+from flask import Blueprint, Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import sys
+import atexit
+import gzip
+import hashlib
+import queue
+import threading
+from collections import OrderedDict
+from functools import wraps
+from itertools import repeat
+import time
 from pathlib import Path
+from typing import Tuple
 from datetime import datetime
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add backend directory to path
 backend_dir = Path(__file__).parent
@@ -19,18 +36,58 @@ from config import Config
 from stateful_simulator import fleet
 from ml_stabilizer import get_stabilized_predictor
 from alert_manager import get_alert_manager
-from anomaly_detector import get_detector
-from ttf_forecaster import get_forecaster
+from anomaly_detector import get_detector, detectors, detect_anomaly_batch, FEATURE_COLUMNS
+from rul_predictor import fill_missing, SENSOR_COLUMNS, SENSOR_DEFAULTS
+from ttf_forecaster import get_forecaster, forecasters
 from database import get_database
 from metrics_tracker import get_metrics_tracker, seed_demo_metrics
 from demo_scenarios import get_scenario_player, get_preset_machine, get_all_preset_machines
 from professional_datasets import (
     get_all_equipment_profiles, get_all_failure_modes, 
-    generate_professional_dataset, EQUIPMENT_PROFILES, FAILURE_MODES
+    generate_professional_dataset, generate_professional_dataset_arrays, iter_professional_dataset,
+    EQUIPMENT_PROFILES, FAILURE_MODES
 )
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson when it is installed (falls
+    back to the stdlib encoder otherwise). Keeps the default provider's sorted
+    keys and its date/decimal/dataclass conversions; numpy values and non-str
+    keys are encoded natively.
+    """
+    
+    OPTIONS = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+    ) if orjson is not None else 0
+    
+    def _encode(self, obj, indent=None) -> bytes:
+        options = self.OPTIONS | orjson.OPT_INDENT_2 if indent else self.OPTIONS
+        return orjson.dumps(obj, default=self.default, option=options)
+    
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj, kwargs.get('indent')).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self._app.debug if self.compact is None else not self.compact
+        return self._app.response_class(
+            self._encode(obj, indent) + b"\n", mimetype=self.mimetype
+        )
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app, origins=Config.CORS_ORIGINS)
 
 # Initialize production components
@@ -49,18 +106,165 @@ file_handler = RotatingFileHandler(
 file_handler.setFormatter(logging.Formatter(
     '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 ))
-app.logger.addHandler(file_handler)
+# Requests only enqueue records; a listener thread does the file writes
+log_listener = QueueListener(queue.SimpleQueue(), file_handler)
+app.logger.addHandler(QueueHandler(log_listener.queue))
+# Sensor history write failures are logged by the database module
+logging.getLogger('database').addHandler(QueueHandler(log_listener.queue))
 app.logger.setLevel(getattr(logging, Config.LOG_LEVEL))
+log_listener.start()
+atexit.register(log_listener.stop)  # flush queued records on shutdown
+
+
+class RepeatFilter(logging.Filter):
+    """Drop a record identical to the previous one if it comes within window seconds"""
+    
+    def __init__(self, window: float):
+        super().__init__()
+        self.window = window
+        self._last = (None, float("-inf"))  # ((level, message), monotonic time)
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.levelno, record.getMessage())
+        now = time.monotonic()
+        last_key, last_time = self._last
+        if key == last_key and now - last_time < self.window:
+            return False
+        self._last = (key, now)
+        return True
+
+
+# A misbehaving poller hitting the same failing endpoint logs its error once a
+# window, not once per request
+app.logger.addFilter(RepeatFilter(Config.LOG_REPEAT_WINDOW_SECONDS))
+
+
+# Response timestamps: the local ISO string is rebuilt at most every 100 ms
+ISO_NOW_RESOLUTION_S = 0.1
+_iso_now = (float("-inf"), "")  # (monotonic time, string), replaced as a whole
+
+
+def iso_now() -> str:
+    """datetime.now().isoformat(), cached at ISO_NOW_RESOLUTION_S granularity"""
+    global _iso_now
+    now = time.monotonic()
+    stamp, text = _iso_now
+    if now - stamp >= ISO_NOW_RESOLUTION_S:
+        text = datetime.now().isoformat()
+        _iso_now = (now, text)
+    return text
+
+
+# Serialized bodies of constant error responses, encoded on first use. Each call
+# still builds a fresh Response: after_request hooks (CORS) add headers to it.
+_error_bodies = {}
+
+
+def error_response(message: str, status: int) -> Response:
+    """JSON {"error": message} response for a constant message"""
+    body = _error_bodies.get(message)
+    if body is None:
+        body = _error_bodies[message] = app.json.dumps({"error": message}) + "\n"
+    return Response(body, status=status, mimetype=app.json.mimetype)
+
+
+# Request body schemas: field -> (type, default). A type of None keeps the value
+# as sent; fields defaulting to OMIT appear only when the client sent them.
+OMIT = object()
+
+ACKNOWLEDGE_FIELDS = {'operator_id': (None, None)}
+RESOLVE_FIELDS = {
+    'operator_id': (None, None),
+    'root_cause': (None, None),
+    'resolution_notes': (None, None),
+    'downtime_minutes': (None, 0)
+}
+DEGRADATION_RATE_FIELDS = {'rate': (float, 0.001)}
+OVERRIDE_FIELDS = {
+    'machine_id': (None, 'M-001'),  # Default to demo machine
+    'temperature': (float, OMIT),
+    'vibration_x': (float, OMIT),
+    'vibration_y': (float, OMIT),
+    'pressure': (float, OMIT),
+    'rpm': (float, OMIT)
+}
+STOP_STRESS_FIELDS = {'machine_id': (None, None)}
+START_STRESS_FIELDS = {
+    'machine_id': (None, None),
+    'type': (None, None),
+    'severity': (float, 0.5),
+    'duration_sec': (int, 120)
+}
+RECORD_PREDICTION_FIELDS = {
+    'machine_id': (None, None),
+    'ttf_hours': (float, None),
+    'health_score': (float, None),
+    'anomaly_score': (float, 0.5),
+    'confidence': (float, 0.8)
+}
+RECORD_FAILURE_FIELDS = {
+    'machine_id': (None, None),
+    'event_type': (None, 'failure')
+}
+GENERATE_DATASET_FIELDS = {
+    'equipment_type': (None, 'BOILER_FEED_PUMP'),
+    'failure_mode': (None, 'BEARING_INNER_RACE'),
+    'duration_hours': (float, 4.0),
+    'sample_interval_minutes': (float, 5.0)
+}
+
+
+class BodyError(ValueError):
+    """A request body field could not be coerced to its schema type (HTTP 400)"""
+
+
+def parse_body(fields: dict) -> dict:
+    """Extract and coerce the JSON request body fields described by a schema"""
+    # Each handler parses its body exactly once, so skip Flask's parsed-body cache
+    data = request.get_json(silent=True, cache=False) or {}
+    parsed = {}
+    for name, (cast, default) in fields.items():
+        if name in data:
+            value = data[name]
+            if cast is None:
+                parsed[name] = value
+                continue
+            try:
+                parsed[name] = cast(value)
+            except (TypeError, ValueError):
+                raise BodyError(f"{name} must be {cast.__name__}") from None
+        elif default is not OMIT:
+            parsed[name] = default
+    return parsed
 
 
 # ==================== HEALTH & STATUS ====================
 
+@app.route('/api/live', methods=['GET'])
+def liveness_check():
+    """Liveness probe: the process is up and serving (no component checks)"""
+    return jsonify({"status": "ok"})
+
+
+# Last db.get_statistics() result and its monotonic expiry time
+_health_stats = {"expires": 0.0, "stats": None}
+
+
+def _cached_statistics() -> dict:
+    """db.get_statistics(), reused for HEALTH_STATS_TTL_SECONDS"""
+    now = time.monotonic()
+    if now >= _health_stats["expires"]:
+        _health_stats["stats"] = db.get_statistics()
+        _health_stats["expires"] = now + Config.HEALTH_STATS_TTL_SECONDS
+    return _health_stats["stats"]
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Deep health check endpoint"""
     try:
         # Check database
-        stats = db.get_statistics()
+        stats = _cached_statistics()
         
         # Check fleet
         fleet_status = len(fleet.machines) > 0
@@ -79,10 +283,10 @@ def health_check():
                 "active_alerts": stats['alerts_by_state'].get('ACTIVE', 0),
                 "total_logs": stats['total_logs']
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         })
     except Exception as e:
-        app.logger.error(f"Health check failed: {str(e)}")
+        app.logger.error("Health check failed: %s", e)
         return jsonify({
             "status": "degraded",
             "error": str(e)
@@ -91,79 +295,305 @@ def health_check():
 
 # ==================== MACHINE DATA ====================
 
+def _simulation_clock():
+    """Advance fleet time on a fixed real-time cadence (API handlers only read it)"""
+    next_tick = time.monotonic()
+    while True:
+        next_tick += Config.SIMULATION_TICK_SECONDS
+        time.sleep(max(0.0, next_tick - time.monotonic()))
+        try:
+            # Readings are served on demand, so the tick builds none
+            fleet.advance_all(hours=Config.SIMULATION_TICK_HOURS, readings=False)
+        except Exception as e:
+            app.logger.error("Error advancing simulation: %s", e)
+
+
+_clock_thread = None
+_clock_lock = threading.Lock()
+
+
+def start_simulation_clock():
+    """Start the simulation clock thread once per serving process"""
+    global _clock_thread
+    with _clock_lock:
+        if _clock_thread is None:
+            # Create the NASA loader now, outside the fleet lock, so its
+            # background feature extraction starts before the first FAILING reading
+            fleet.nasa_loader
+            _clock_thread = threading.Thread(target=_simulation_clock, name="simulation-clock", daemon=True)
+            _clock_thread.start()
+
+
+@app.before_request
+def _ensure_simulation_clock():
+    """Start the clock on the first request when served without __main__ (gunicorn)"""
+    if _clock_thread is None:
+        start_simulation_clock()
+
+# machine_id -> (machine_type, machine_name, mode); fixed for the fleet's lifetime
+_static_machine_info = {}
+
+
+def _refresh_static_machine_info():
+    """
+    Rebuild _static_machine_info and create every machine's detector and
+    forecaster, so fleet loops can index those registries directly
+    (call again if machines are added at runtime)
+    """
+    global _static_machine_info
+    _static_machine_info = {
+        machine_id: (machine.machine_type, machine.machine_name,
+                     Config.MACHINE_MODES.get(machine_id, 'SIMULATION'))
+        for machine_id, machine in fleet.machines.items()
+    }
+    for machine_id in _static_machine_info:
+        get_detector(machine_id)
+        get_forecaster(machine_id)
+
+
+_refresh_static_machine_info()
+
+# Last /api/machines body, serialized once and shared by every poller until it
+# expires (each computation feeds alerts and forecasters, so pollers must not multiply it)
+_machines_cache = {"expires": 0.0, "body": None}
+_machines_cache_lock = threading.Lock()
+
+
+# Serialized GET responses, least recently used first: key -> (monotonic expiry, body, etag)
+RESPONSE_CACHE_SIZE = 128
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Prefix for counter-based ETags, so a restarted server (counters back at 0)
+# never validates a client's copy from the previous run
+ETAG_EPOCH = format(time.time_ns(), 'x')
+
+
+def not_modified(etag: str):
+    """304 response if the client's If-None-Match already holds etag, else None"""
+    # Weak comparison (RFC 9110): gzipped responses carry the tag as W/"..."
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def json_body_response(body, etag: str) -> Response:
+    """Cached JSON body as a response tagged with etag (304 if the client has it)"""
+    response = not_modified(etag)
+    if response is None:
+        response = Response(body, mimetype=app.json.mimetype)
+        response.set_etag(etag)
+    return response
+
+# Lifetimes for cached_response: reference data vs. live scenario listings
+STATIC_RESPONSE_TTL_S = 300.0
+ACTIVE_RESPONSE_TTL_S = 2.0
+
+
+def cached_response(ttl: float, query_args: Tuple[str, ...] = ()):
+    """
+    Reuse a GET view's successful JSON body for ttl seconds (per view, URL
+    arguments and the query_args the view reads; other query parameters do
+    not split the cache), tagged with a content ETag so unchanged polls get a 304
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (view.__name__, tuple(sorted(kwargs.items())),
+                   tuple(request.args.get(name) for name in query_args))
+            now = time.monotonic()
+            with _response_cache_lock:
+                hit = _response_cache.get(key)
+                if hit is not None and now < hit[0]:
+                    _response_cache.move_to_end(key)
+                    return json_body_response(hit[1], hit[2])
+            
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.mimetype == app.json.mimetype:
+                body = response.get_data()
+                etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+                with _response_cache_lock:
+                    _response_cache[key] = (now + ttl, body, etag)
+                    _response_cache.move_to_end(key)
+                    if len(_response_cache) > RESPONSE_CACHE_SIZE:
+                        _response_cache.popitem(last=False)
+                return json_body_response(body, etag)
+            return response
+        return wrapper
+    return decorator
+
+
+# Encoded bodies of endpoints whose data never changes, built on first request
+_static_bodies = {}
+
+
+def static_json_response(name: str, build) -> Response:
+    """JSON response of build(), encoded once and reused for the process lifetime"""
+    body = _static_bodies.get(name)
+    if body is None:
+        body = _static_bodies[name] = app.json.dumps(build()) + "\n"
+    return Response(body, mimetype=app.json.mimetype)
+
+
+@app.after_request
+def expire_response_caches(response):
+    """Any state-changing call shows up on the next poll of a cached endpoint"""
+    if request.method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+        _machines_cache["expires"] = 0.0
+        with _response_cache_lock:
+            _response_cache.clear()
+    return response
+
+
+# gzip copies of recently sent bodies: cached and static endpoints hand out the
+# same body to every poller, so each distinct body is compressed only once
+GZIP_CACHE_SIZE = 32
+GZIP_CACHE_MAX_BODY = 256 * 1024  # larger (generated datasets) are one-offs
+_gzip_bodies = OrderedDict()
+_gzip_lock = threading.Lock()
+
+
+def _gzip_body(body: bytes) -> bytes:
+    """gzip-compressed body, reusing the result for recently seen bodies"""
+    if len(body) > GZIP_CACHE_MAX_BODY:
+        return gzip.compress(body, compresslevel=Config.COMPRESS_LEVEL, mtime=0)
+    with _gzip_lock:
+        compressed = _gzip_bodies.get(body)
+        if compressed is not None:
+            _gzip_bodies.move_to_end(body)
+            return compressed
+    compressed = gzip.compress(body, compresslevel=Config.COMPRESS_LEVEL, mtime=0)
+    with _gzip_lock:
+        _gzip_bodies[body] = compressed
+        if len(_gzip_bodies) > GZIP_CACHE_SIZE:
+            _gzip_bodies.popitem(last=False)
+    return compressed
+
+
+@app.after_request
+def compress_response(response):
+    """gzip JSON bodies of at least Config.COMPRESS_MIN_SIZE for clients that accept it"""
+    if (response.status_code != 200 or response.mimetype != app.json.mimetype
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    body = response.get_data()
+    if len(body) < Config.COMPRESS_MIN_SIZE:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if 'gzip' not in request.accept_encodings:
+        return response
+    
+    response.set_data(_gzip_body(body))
+    response.headers['Content-Encoding'] = 'gzip'
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # Encoded bytes differ from the identity body, so the tag is only weak
+        response.set_etag(etag, weak=True)
+    return response
+
+
+# Both models read the fleet's packed sensor matrix: RUL uses the leading columns
+assert fleet.SENSOR_COLUMNS == FEATURE_COLUMNS
+assert FEATURE_COLUMNS[:len(SENSOR_COLUMNS)] == SENSOR_COLUMNS
+
+
+def _score_fleet(readings, machine_ids):
+    """
+    Stabilized RUL predictions and anomaly results for many readings, with the
+    sensors packed once by the fleet into an (N, 5) matrix shared by both models
+    (missing readings get each model's own defaults)
+    """
+    sensor_list = [reading['sensors'] for reading in readings]
+    X = fleet.sensor_matrix(readings)
+    predictions = stabilized_predictor.predict_rul_batch(
+        sensor_list, machine_ids,
+        sensor_arr=fill_missing(X[:, :len(SENSOR_COLUMNS)], SENSOR_DEFAULTS)
+    )
+    anomalies = detect_anomaly_batch(sensor_list, machine_ids, X=fill_missing(X, 0.0))
+    return predictions, anomalies
+
+
 @app.route('/api/machines', methods=['GET'])
 def get_machines():
     """Get list of all monitored machines with current status and mode info"""
     try:
-        # Advance fleet time (simulate real-time operation)
-        fleet.advance_all(hours=0.0333)  # ~2 minutes
+        if time.monotonic() >= _machines_cache["expires"]:
+            with _machines_cache_lock:
+                # Re-check: another poller may have refreshed it while we waited
+                if time.monotonic() >= _machines_cache["expires"]:
+                    _machines_cache["body"] = app.json.dumps(_build_machines_payload()) + "\n"
+                    _machines_cache["expires"] = time.monotonic() + Config.MACHINES_CACHE_TTL_SECONDS
+        return Response(_machines_cache["body"], mimetype=app.json.mimetype)
+    
+    except Exception as e:
+        app.logger.error("Error getting machines: %s", e)
+        return error_response("Internal server error", 500)
+
+
+def _build_machines_payload() -> dict:
+    """Score every machine (the /api/machines body)"""
+    machines = []
+    new_alerts = []  # Track new alerts for this request
+    
+    readings = fleet.get_all_readings()
+    machine_ids = [reading['machine_id'] for reading in readings]
+    
+    # Get stabilized predictions and anomaly info for the whole fleet at once
+    predictions, anomalies = _score_fleet(readings, machine_ids)
+    
+    for machine_id, reading, (rul_hours, health_score), (is_anomaly, anomaly_score, _) in zip(
+            machine_ids, readings, predictions, anomalies):
+        # Check and create alerts - returns list of new alert IDs
+        created_alert_ids = alert_manager.check_and_create_alerts(
+            machine_id, reading['sensors'],
+            rul_hours, health_score,
+            is_anomaly, anomaly_score
+        )
+        if created_alert_ids:
+            for alert_id in created_alert_ids:
+                new_alerts.append({"machine_id": machine_id, "alert_id": alert_id})
         
-        machines = []
-        new_alerts = []  # Track new alerts for this request
+        # Update forecaster
+        forecasters[machine_id].add_health_reading(machine_id, health_score)
         
-        for machine_id in fleet.machines.keys():
-            reading = fleet.get_machine_reading(machine_id)
-            
-            # Get stabilized predictions
-            rul_hours, health_score = stabilized_predictor.predict_rul(
-                reading['sensors'], machine_id
-            )
-            
-            # Get anomaly info
-            detector = get_detector(machine_id)
-            is_anomaly, anomaly_score, _ = detector.detect_anomaly(reading['sensors'])
-            
-            # Check and create alerts - returns list of new alert IDs
-            created_alert_ids = alert_manager.check_and_create_alerts(
-                machine_id, reading['sensors'],
-                rul_hours, health_score,
-                is_anomaly, anomaly_score
-            )
-            if created_alert_ids:
-                for alert_id in created_alert_ids:
-                    new_alerts.append({"machine_id": machine_id, "alert_id": alert_id})
-            
-            # Update forecaster
-            forecaster = get_forecaster(machine_id)
-            forecaster.add_health_reading(machine_id, health_score)
-            
-            # Get mode info
-            mode = Config.MACHINE_MODES.get(machine_id, 'SIMULATION')
-            demo_active = fleet.is_demo_active(machine_id)
-            
-            # Get scenario info if demo is active
-            scenario_info = None
-            if demo_active and 'scenario' in reading:
-                scenario_info = reading['scenario']
-            
-            machines.append({
-                "machine_id": machine_id,
-                "machine_type": fleet.machines[machine_id].machine_type,
-                "machine_name": fleet.machines[machine_id].machine_name,
-                "status": reading['health_state'],
-                "health_score": health_score,
-                "rul_hours": rul_hours,
-                "has_anomaly": is_anomaly,
-                "anomaly_score": round(anomaly_score, 3),
-                "runtime_hours": reading['runtime_hours'],
-                "degradation_factor": reading.get('degradation_factor', 1.0),
-                # Mode info for 4-machine architecture
-                "mode": mode,
-                "demo_active": demo_active,
-                "scenario_info": scenario_info,
-                "manual_override": reading.get('manual_override', False)
-            })
+        # Get type, name and mode info
+        machine_type, machine_name, mode = _static_machine_info[machine_id]
+        demo_active = fleet.is_demo_active(machine_id)
         
-        return jsonify({
-            "plant_name": Config.PLANT_NAME,
-            "machines": machines,
-            "new_alerts": new_alerts,  # Real-time alert notifications
-            "timestamp": datetime.now().isoformat()
+        # Get scenario info if demo is active
+        scenario_info = None
+        if demo_active and 'scenario' in reading:
+            scenario_info = reading['scenario']
+        
+        machines.append({
+            "machine_id": machine_id,
+            "machine_type": machine_type,
+            "machine_name": machine_name,
+            "status": reading['health_state'],
+            "health_score": health_score,
+            "rul_hours": rul_hours,
+            "has_anomaly": is_anomaly,
+            "anomaly_score": round(anomaly_score, 3),
+            "runtime_hours": reading['runtime_hours'],
+            "degradation_factor": reading.get('degradation_factor', 1.0),
+            # Mode info for 4-machine architecture
+            "mode": mode,
+            "demo_active": demo_active,
+            "scenario_info": scenario_info,
+            "manual_override": reading.get('manual_override', False)
         })
     
-    except Exception as e:
-        app.logger.error(f"Error getting machines: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+    return {
+        "plant_name": Config.PLANT_NAME,
+        "machines": machines,
+        "new_alerts": new_alerts,  # Real-time alert notifications
+        "timestamp": iso_now()
+    }
 
 
 @app.route('/api/sensor-data', methods=['GET'])
@@ -176,7 +606,7 @@ def get_sensor_data():
             # Single machine data
             reading = fleet.get_machine_reading(machine_id)
             if reading is None:
-                return jsonify({"error": "Machine not found"}), 404
+                return error_response("Machine not found", 404)
             
             # Check if manual override is active (for demo mode)
             is_override_active = reading.get('manual_override', False)
@@ -196,7 +626,7 @@ def get_sensor_data():
                 'health_score': health_score,
                 'rul_hours': rul_hours
             }
-            db.save_sensor_reading(machine_id, sensor_data_with_predictions)
+            db.queue_sensor_reading(machine_id, sensor_data_with_predictions)
             
             return jsonify({
                 "machine_id": machine_id,
@@ -217,12 +647,12 @@ def get_sensor_data():
             readings = fleet.get_all_readings()
             enriched_readings = []
             
-            for reading in readings:
+            machine_ids = [reading['machine_id'] for reading in readings]
+            predictions, anomalies = _score_fleet(readings, machine_ids)
+            
+            for reading, (rul_hours, health_score), (is_anomaly, anomaly_score, _) in zip(
+                    readings, predictions, anomalies):
                 mid = reading['machine_id']
-                detector = get_detector(mid)
-                is_anomaly, anomaly_score, _ = detector.detect_anomaly(reading['sensors'])
-                
-                rul_hours, health_score = stabilized_predictor.predict_rul(reading['sensors'], mid)
                 
                 enriched_readings.append({
                     "machine_id": mid,
@@ -239,8 +669,8 @@ def get_sensor_data():
             })
     
     except Exception as e:
-        app.logger.error(f"Error getting sensor data: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting sensor data: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/sensor-history/<machine_id>', methods=['GET'])
@@ -248,39 +678,24 @@ def get_sensor_history(machine_id):
     """Get historical sensor readings for a machine (for live charts)"""
     try:
         hours = request.args.get('hours', 1, type=int)  # Default last hour
-        limit = request.args.get('limit', 60, type=int)  # Default 60 points
+        limit = max(1, request.args.get('limit', 60, type=int))  # Default 60 points
         
-        # Get from database
-        history = db.get_sensor_history(machine_id, hours=hours)
+        # Get from database, already downsampled to `limit` points
+        rows = db.get_sensor_history_downsampled(machine_id, hours=hours, limit=limit)
         
-        # Limit results
-        if len(history) > limit:
-            step = len(history) // limit
-            history = history[::step][:limit]
-        
-        # Format for charts
-        chart_data = []
-        for reading in history:
-            chart_data.append({
-                "timestamp": reading['timestamp'],
-                "temperature": reading.get('temperature'),
-                "vibration": (reading.get('vibration_x', 0) + reading.get('vibration_y', 0)) / 2,
-                "pressure": reading.get('pressure'),
-                "rpm": reading.get('rpm'),
-                "health_score": reading.get('health_score'),
-                "rul_hours": reading.get('rul_hours')
-            })
+        # Format for charts: one dict per row, built by C-level map/zip
+        chart_data = list(map(dict, map(zip, repeat(db.CHART_COLUMNS), rows)))
         
         return jsonify({
             "machine_id": machine_id,
             "history": chart_data,
             "count": len(chart_data),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         })
     
     except Exception as e:
-        app.logger.error(f"Error getting sensor history: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting sensor history: %s", e)
+        return error_response("Internal server error", 500)
 
 
 # ==================== ALERT MANAGEMENT ====================
@@ -295,20 +710,19 @@ def get_alerts():
         return jsonify({
             "alerts": alerts,
             "count": len(alerts),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         })
     
     except Exception as e:
-        app.logger.error(f"Error getting alerts: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting alerts: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/alerts/<alert_id>/acknowledge', methods=['POST'])
 def acknowledge_alert(alert_id):
     """Acknowledge an alert"""
     try:
-        data = request.get_json()
-        operator_id = data.get('operator_id')
+        operator_id = parse_body(ACKNOWLEDGE_FIELDS)['operator_id']
         
         if not operator_id:
             return jsonify({"error": "operator_id required"}), 400
@@ -316,26 +730,26 @@ def acknowledge_alert(alert_id):
         result = alert_manager.acknowledge_alert(alert_id, operator_id)
         
         if result['success']:
-            app.logger.info(f"Alert {alert_id} acknowledged by {operator_id}")
+            app.logger.info("Alert %s acknowledged by %s", alert_id, operator_id)
             return jsonify(result)
         else:
             return jsonify(result), 400
     
     except Exception as e:
-        app.logger.error(f"Error acknowledging alert: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error acknowledging alert: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/alerts/<alert_id>/resolve', methods=['POST'])
 def resolve_alert(alert_id):
     """Resolve an alert and create maintenance log"""
     try:
-        data = request.get_json()
+        body = parse_body(RESOLVE_FIELDS)
         
-        operator_id = data.get('operator_id')
-        root_cause = data.get('root_cause')
-        resolution_notes = data.get('resolution_notes')
-        downtime_minutes = data.get('downtime_minutes', 0)
+        operator_id = body['operator_id']
+        root_cause = body['root_cause']
+        resolution_notes = body['resolution_notes']
+        downtime_minutes = body['downtime_minutes']
         
         if not all([operator_id, root_cause, resolution_notes]):
             return jsonify({
@@ -348,14 +762,14 @@ def resolve_alert(alert_id):
         )
         
         if result['success']:
-            app.logger.info(f"Alert {alert_id} resolved by {operator_id}")
+            app.logger.info("Alert %s resolved by %s", alert_id, operator_id)
             return jsonify(result)
         else:
             return jsonify(result), 400
     
     except Exception as e:
-        app.logger.error(f"Error resolving alert: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error resolving alert: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/alerts/statistics', methods=['GET'])
@@ -366,8 +780,8 @@ def get_alert_statistics():
         return jsonify(stats)
     
     except Exception as e:
-        app.logger.error(f"Error getting alert statistics: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting alert statistics: %s", e)
+        return error_response("Internal server error", 500)
 
 
 # ==================== MAINTENANCE LOGS ====================
@@ -384,12 +798,12 @@ def get_maintenance_logs():
         return jsonify({
             "logs": logs,
             "count": len(logs),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         })
     
     except Exception as e:
-        app.logger.error(f"Error getting logs: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting logs: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/logs', methods=['POST'])
@@ -416,7 +830,7 @@ def create_maintenance_log():
         }), 201
     
     except Exception as e:
-        app.logger.error(f"Error creating log: {str(e)}")
+        app.logger.error("Error creating log: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
@@ -435,7 +849,7 @@ def delete_maintenance_log(log_id):
             return jsonify({"error": "Log not found"}), 404
     
     except Exception as e:
-        app.logger.error(f"Error deleting log: {str(e)}")
+        app.logger.error("Error deleting log: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
@@ -459,7 +873,7 @@ def update_maintenance_log(log_id):
             return jsonify({"error": "Log not found or no changes made"}), 404
     
     except Exception as e:
-        app.logger.error(f"Error updating log: {str(e)}")
+        app.logger.error("Error updating log: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
@@ -479,7 +893,7 @@ def predict_rul():
         # Get current reading
         reading = fleet.get_machine_reading(machine_id)
         if reading is None:
-            return jsonify({"error": "Machine not found"}), 404
+            return error_response("Machine not found", 404)
         
         # Predict RUL (stabilized)
         rul_hours, health_score = stabilized_predictor.predict_rul(reading['sensors'], machine_id)
@@ -496,8 +910,8 @@ def predict_rul():
         })
     
     except Exception as e:
-        app.logger.error(f"Error predicting RUL: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error predicting RUL: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/health-trend/<machine_id>', methods=['GET'])
@@ -505,7 +919,7 @@ def get_health_trend(machine_id):
     """Get health trend and time-to-failure forecast"""
     try:
         if machine_id not in fleet.machines:
-            return jsonify({"error": "Machine not found"}), 404
+            return error_response("Machine not found", 404)
         
         forecaster = get_forecaster(machine_id)
         
@@ -526,8 +940,8 @@ def get_health_trend(machine_id):
         })
     
     except Exception as e:
-        app.logger.error(f"Error getting health trend: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting health trend: %s", e)
+        return error_response("Internal server error", 500)
 
 
 # ==================== ANOMALY DETECTION ====================
@@ -544,7 +958,7 @@ def anomaly_check():
             # Single machine
             reading = fleet.get_machine_reading(machine_id)
             if reading is None:
-                return jsonify({"error": "Machine not found"}), 404
+                return error_response("Machine not found", 404)
             
             detector = get_detector(machine_id)
             is_anomaly, score, details = detector.detect_anomaly(reading['sensors'])
@@ -560,10 +974,12 @@ def anomaly_check():
         else:
             # All machines
             readings = fleet.get_all_readings()
-            for reading in readings:
+            results = detect_anomaly_batch(
+                [reading['sensors'] for reading in readings],
+                [reading['machine_id'] for reading in readings]
+            )
+            for reading, (is_anomaly, score, details) in zip(readings, results):
                 mid = reading['machine_id']
-                detector = get_detector(mid)
-                is_anomaly, score, details = detector.detect_anomaly(reading['sensors'])
                 
                 if is_anomaly:
                     anomalies.append({
@@ -579,8 +995,8 @@ def anomaly_check():
         })
     
     except Exception as e:
-        app.logger.error(f"Error checking anomalies: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error checking anomalies: %s", e)
+        return error_response("Internal server error", 500)
 
 
 # ==================== MAINTENANCE OPERATIONS ====================
@@ -590,7 +1006,7 @@ def perform_maintenance(machine_id):
     """Perform maintenance on a machine (reset to healthy state)"""
     try:
         if machine_id not in fleet.machines:
-            return jsonify({"error": "Machine not found"}), 404
+            return error_response("Machine not found", 404)
         
         # Perform maintenance
         fleet.perform_maintenance(machine_id)
@@ -598,36 +1014,45 @@ def perform_maintenance(machine_id):
         # Reset ML predictions
         stabilized_predictor.reset_machine(machine_id)
         
-        app.logger.info(f"Maintenance performed on {machine_id}")
+        app.logger.info("Maintenance performed on %s", machine_id)
         
         return jsonify({
             "success": True,
             "machine_id": machine_id,
             "message": "Maintenance completed successfully",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         })
     
     except Exception as e:
-        app.logger.error(f"Error performing maintenance: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error performing maintenance: %s", e)
+        return error_response("Internal server error", 500)
+
+
+# Optional simulator capabilities, checked once (the fleet object never changes)
+FLEET_HAS_SET_RATE = hasattr(fleet, 'set_degradation_rate')
+FLEET_HAS_RESET_FAILING = hasattr(fleet, 'reset_failing_mode')
+FLEET_HAS_STRESS_CONTROL = (hasattr(fleet, 'start_stress_scenario')
+                            and hasattr(fleet, 'stop_stress_scenario'))
+stress_engine = getattr(fleet, 'stress_engine', None)
 
 
 @app.route('/api/machines/<machine_id>/degradation-rate', methods=['POST'])
 def set_degradation_rate(machine_id):
     """Set custom degradation rate for a machine"""
     try:
-        data = request.json
-        rate = float(data.get('rate', 0.001))
+        rate = parse_body(DEGRADATION_RATE_FIELDS)['rate']
         
-        if hasattr(fleet, 'set_degradation_rate'):
+        if FLEET_HAS_SET_RATE:
             success = fleet.set_degradation_rate(machine_id, rate)
             if success:
                 return jsonify({"status": "success", "rate": rate})
-            return jsonify({"error": "Machine not found"}), 404
+            return error_response("Machine not found", 404)
             
         return jsonify({"error": "Not supported"}), 501
+    except BodyError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        app.logger.error(f"Error setting degradation rate: {str(e)}")
+        app.logger.error("Error setting degradation rate: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
@@ -635,7 +1060,7 @@ def set_degradation_rate(machine_id):
 def reset_degradation(machine_id):
     """Reset degradation progress for FAILING mode"""
     try:
-        if hasattr(fleet, 'reset_failing_mode'):
+        if FLEET_HAS_RESET_FAILING:
             success = fleet.reset_failing_mode(machine_id)
             if success:
                 # Also reset ML
@@ -645,7 +1070,7 @@ def reset_degradation(machine_id):
             
         return jsonify({"error": "Not supported"}), 501
     except Exception as e:
-        app.logger.error(f"Error resetting degradation: {str(e)}")
+        app.logger.error("Error resetting degradation: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
@@ -653,13 +1078,13 @@ def reset_degradation(machine_id):
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({"error": "Endpoint not found"}), 404
+    return error_response("Endpoint not found", 404)
 
 
 @app.errorhandler(500)
 def internal_error(error):
-    app.logger.error(f"Internal server error: {str(error)}")
-    return jsonify({"error": "Internal server error"}), 500
+    app.logger.error("Internal server error: %s", error)
+    return error_response("Internal server error", 500)
 
 
 # ==================== DEMO CONTROL (HIDDEN) ====================
@@ -668,20 +1093,8 @@ def internal_error(error):
 def set_manual_override():
     """Set manual sensor values for demo machine (HIDDEN - use from separate window)"""
     try:
-        data = request.get_json()
-        machine_id = data.get('machine_id', 'M-001')  # Default to demo machine
-        
-        sensor_values = {}
-        if 'temperature' in data:
-            sensor_values['temperature'] = float(data['temperature'])
-        if 'vibration_x' in data:
-            sensor_values['vibration_x'] = float(data['vibration_x'])
-        if 'vibration_y' in data:
-            sensor_values['vibration_y'] = float(data['vibration_y'])
-        if 'pressure' in data:
-            sensor_values['pressure'] = float(data['pressure'])
-        if 'rpm' in data:
-            sensor_values['rpm'] = float(data['rpm'])
+        sensor_values = parse_body(OVERRIDE_FIELDS)
+        machine_id = sensor_values.pop('machine_id')
         
         if not sensor_values:
             return jsonify({"error": "No sensor values provided"}), 400
@@ -696,11 +1109,13 @@ def set_manual_override():
                 "message": f"Manual override set for {machine_id}"
             })
         else:
-            return jsonify({"error": "Machine not found"}), 404
+            return error_response("Machine not found", 404)
     
+    except BodyError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        app.logger.error(f"Error setting manual override: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error setting manual override: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/demo/override/<machine_id>', methods=['DELETE'])
@@ -722,8 +1137,8 @@ def clear_manual_override(machine_id):
             })
     
     except Exception as e:
-        app.logger.error(f"Error clearing manual override: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error clearing manual override: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/demo/status', methods=['GET'])
@@ -757,8 +1172,8 @@ def get_scenarios():
         })
     
     except Exception as e:
-        app.logger.error(f"Error getting scenarios: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting scenarios: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/scenarios/start', methods=['POST'])
@@ -774,13 +1189,13 @@ def start_scenario():
         # Use fleet's integrated method for proper mode handling
         result = fleet.start_demo_scenario(machine_id, scenario_id, speed)
         
-        app.logger.info(f"Started scenario {scenario_id} for {machine_id} at {speed}x speed")
+        app.logger.info("Started scenario %s for %s at %sx speed", scenario_id, machine_id, speed)
         
         return jsonify(result)
     
     except Exception as e:
-        app.logger.error(f"Error starting scenario: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error starting scenario: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/scenarios/stop/<machine_id>', methods=['POST'])
@@ -790,13 +1205,13 @@ def stop_scenario(machine_id):
         # Use fleet's integrated method which resets machine state
         result = fleet.stop_demo_scenario(machine_id)
         
-        app.logger.info(f"Stopped scenario for {machine_id}, machine reset to healthy")
+        app.logger.info("Stopped scenario for %s, machine reset to healthy", machine_id)
         
         return jsonify(result)
     
     except Exception as e:
-        app.logger.error(f"Error stopping scenario: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error stopping scenario: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/scenarios/pause/<machine_id>', methods=['POST'])
@@ -808,8 +1223,8 @@ def pause_scenario(machine_id):
         return jsonify(result)
     
     except Exception as e:
-        app.logger.error(f"Error pausing scenario: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error pausing scenario: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/scenarios/resume/<machine_id>', methods=['POST'])
@@ -821,103 +1236,145 @@ def resume_scenario(machine_id):
         return jsonify(result)
     
     except Exception as e:
-        app.logger.error(f"Error resuming scenario: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error resuming scenario: %s", e)
+        return error_response("Internal server error", 500)
+
+
+# Status of a machine with no scenario running: most status polls get this one
+INACTIVE_SCENARIO = {"active": False}
+
+
+def _inactive_scenario_response() -> Response:
+    """The no-scenario status, encoded once"""
+    return static_json_response('inactive_scenario', lambda: INACTIVE_SCENARIO)
+
+
+def _scenario_status(machine_id: str, player) -> dict:
+    """Active scenario of a machine: stress scenarios take priority over legacy ones"""
+    if stress_engine is not None:
+        stress = stress_engine.get_scenario(machine_id)
+        if stress:
+            return {
+                "active": True,
+                "type": "STRESS",
+                "scenario": stress.to_dict()
+            }
+    
+    status = player.get_scenario_status(machine_id)
+    if status and status.get('active'):
+        return {
+            "active": True,
+            "type": "LEGACY",
+            "scenario": status
+        }
+    
+    return INACTIVE_SCENARIO
+
+
+@app.route('/api/scenarios/status', methods=['GET'])
+def get_all_scenario_status():
+    """
+    Scenario status of every machine in one response, keyed by machine_id
+    (?ids=M-001,M-003 limits it to those machines)
+    """
+    try:
+        ids = request.args.get('ids')
+        machine_ids = ids.split(',') if ids else fleet.machines
+        player = get_scenario_player()
+        
+        return jsonify({
+            machine_id: _scenario_status(machine_id, player) for machine_id in machine_ids
+        })
+    
+    except Exception as e:
+        app.logger.error("Error getting scenario statuses: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/scenarios/status/<machine_id>', methods=['GET'])
 def get_scenario_status(machine_id):
     """Get status of active scenario (both Legacy and Stress)"""
     try:
-        # Check Stress Scenario first (Priority)
-        if hasattr(fleet, 'stress_engine'):
-            stress = fleet.stress_engine.get_scenario(machine_id)
-            if stress:
-                return jsonify({
-                    "active": True,
-                    "type": "STRESS",
-                    "scenario": stress.to_dict()
-                })
-
-        # Check Legacy Demo Scenario
-        player = get_scenario_player()
-        status = player.get_scenario_status(machine_id)
-        
-        if status and status.get('active'):
-            return jsonify({
-                "active": True,
-                "type": "LEGACY",
-                "scenario": status
-            })
-            
-        return jsonify({"active": False})
+        status = _scenario_status(machine_id, get_scenario_player())
+        if status is INACTIVE_SCENARIO:
+            return _inactive_scenario_response()
+        return jsonify(status)
     
     except Exception as e:
-        app.logger.error(f"Error getting scenario status: {str(e)}")
+        app.logger.warning("Error getting scenario status: %s", e)
         # Return empty status instead of 500 to avoid breaking UI pollers
-        return jsonify({"active": False})
+        return _inactive_scenario_response()
 
 
 # ==================== STRESS SCENARIO CONTROL (NEW) ====================
 
-@app.route('/api/scenarios/stress/start', methods=['POST'])
+stress_bp = Blueprint('stress', __name__, url_prefix='/api/scenarios/stress')
+
+
+@stress_bp.before_request
+def require_stress_control():
+    """Starting/stopping needs the fleet's stress control (listing works without it)"""
+    if request.method == 'POST' and not FLEET_HAS_STRESS_CONTROL:
+        return jsonify({"error": "Stress engine not ready"}), 503
+    return None
+
+
+@stress_bp.route('/start', methods=['POST'])
 def start_stress_scenario():
     """Start an industrial stress scenario (LOAD_SPIKE, LUBRICATION_LOSS, etc.)"""
     try:
-        data = request.json
-        machine_id = data.get('machine_id')
-        scenario_type = data.get('type')
-        severity = float(data.get('severity', 0.5))
-        duration = int(data.get('duration_sec', 120))
+        body = parse_body(START_STRESS_FIELDS)
+        machine_id = body['machine_id']
+        scenario_type = body['type']
         
         if not machine_id or not scenario_type:
             return jsonify({"error": "machine_id and type required"}), 400
-            
-        # Fleet integration
-        if hasattr(fleet, 'start_stress_scenario'):
-            result = fleet.start_stress_scenario(machine_id, scenario_type, severity, duration)
-            
-            if result.get("success"):
-                app.logger.info(f"Started stress scenario {scenario_type} on {machine_id}")
-                return jsonify(result)
-            else:
-                return jsonify(result), 400
+        
+        result = fleet.start_stress_scenario(
+            machine_id, scenario_type, body['severity'], body['duration_sec']
+        )
+        
+        if result.get("success"):
+            app.logger.info("Started stress scenario %s on %s", scenario_type, machine_id)
+            return jsonify(result)
         else:
-            return jsonify({"error": "Stress engine not ready"}), 503
+            return jsonify(result), 400
             
+    except BodyError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        app.logger.error(f"Error starting stress scenario: {str(e)}")
+        app.logger.error("Error starting stress scenario: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
-@app.route('/api/scenarios/stress/stop', methods=['POST'])
+@stress_bp.route('/stop', methods=['POST'])
 def stop_stress_scenario():
     """Stop active stress scenario"""
     try:
-        data = request.json
-        machine_id = data.get('machine_id')
+        machine_id = parse_body(STOP_STRESS_FIELDS)['machine_id']
         
         if not machine_id:
             return jsonify({"error": "machine_id required"}), 400
-            
-        if hasattr(fleet, 'stop_stress_scenario'):
-            result = fleet.stop_stress_scenario(machine_id)
-            return jsonify(result)
-        return jsonify({"error": "Stress engine not ready"}), 503
+        
+        return jsonify(fleet.stop_stress_scenario(machine_id))
         
     except Exception as e:
-        app.logger.error(f"Error stopping stress scenario: {str(e)}")
+        app.logger.error("Error stopping stress scenario: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
-@app.route('/api/scenarios/stress/active', methods=['GET'])
+@stress_bp.route('/active', methods=['GET'])
+@cached_response(ACTIVE_RESPONSE_TTL_S)
 def get_active_stress_scenarios():
     """Get all active stress scenarios"""
-    if hasattr(fleet, 'stress_engine'):
-        return jsonify(fleet.stress_engine.get_all_active())
+    if stress_engine is not None:
+        return jsonify(stress_engine.get_all_active())
     return jsonify({})
 
 
+app.register_blueprint(stress_bp)
+
+
 @app.route('/api/scenarios/reading/<machine_id>', methods=['GET'])
 def get_scenario_reading(machine_id):
     """Get current sensor reading from active scenario"""
@@ -931,11 +1388,12 @@ def get_scenario_reading(machine_id):
             return jsonify({"error": "No active scenario for this machine"}), 404
     
     except Exception as e:
-        app.logger.error(f"Error getting scenario reading: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting scenario reading: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/scenarios/active', methods=['GET'])
+@cached_response(ACTIVE_RESPONSE_TTL_S)
 def get_all_active_scenarios():
     """Get all currently active scenarios"""
     try:
@@ -948,13 +1406,14 @@ def get_all_active_scenarios():
         })
     
     except Exception as e:
-        app.logger.error(f"Error getting active scenarios: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting active scenarios: %s", e)
+        return error_response("Internal server error", 500)
 
 
 # ==================== PRESET (VIRTUAL) MACHINES ====================
 
 @app.route('/api/presets', methods=['GET'])
+@cached_response(STATIC_RESPONSE_TTL_S)
 def get_presets():
     """Get all preset (virtual) machines with static values"""
     try:
@@ -967,11 +1426,12 @@ def get_presets():
         })
     
     except Exception as e:
-        app.logger.error(f"Error getting presets: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting presets: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/presets/<preset_id>', methods=['GET'])
+@cached_response(STATIC_RESPONSE_TTL_S)
 def get_preset(preset_id):
     """Get specific preset machine"""
     try:
@@ -983,73 +1443,116 @@ def get_preset(preset_id):
             return jsonify({"error": f"Preset not found: {preset_id}"}), 404
     
     except Exception as e:
-        app.logger.error(f"Error getting preset: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting preset: %s", e)
+        return error_response("Internal server error", 500)
 
 
 
 
 # ==================== PROFESSIONAL DATASETS (Industry Standards) ====================
 
+# Valid choices echoed back on a 400; the profile tables are fixed at import
+VALID_EQUIPMENT_TYPES = tuple(EQUIPMENT_PROFILES)
+VALID_FAILURE_MODES = tuple(FAILURE_MODES)
+
+
+def _equipment_profiles_payload() -> dict:
+    """The /api/datasets/equipment-profiles body"""
+    profiles = get_all_equipment_profiles()
+    return {
+        "equipment_profiles": profiles,
+        "count": len(profiles),
+        "standards": ["ISO 10816", "IEC 60034"],
+        "description": "Industry-standard equipment specifications"
+    }
+
+
 @app.route('/api/datasets/equipment-profiles', methods=['GET'])
 def get_equipment_profiles():
     """Get all professional equipment profiles (ISO 10816 compliant)"""
     try:
-        profiles = get_all_equipment_profiles()
-        
-        return jsonify({
-            "equipment_profiles": profiles,
-            "count": len(profiles),
-            "standards": ["ISO 10816", "IEC 60034"],
-            "description": "Industry-standard equipment specifications"
-        })
+        # Profiles are fixed at import, so the encoded body never changes
+        return static_json_response('equipment_profiles', _equipment_profiles_payload)
     
     except Exception as e:
-        app.logger.error(f"Error getting equipment profiles: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting equipment profiles: %s", e)
+        return error_response("Internal server error", 500)
+
+
+def _failure_modes_payload() -> dict:
+    """The /api/datasets/failure-modes body"""
+    modes = get_all_failure_modes()
+    return {
+        "failure_modes": modes,
+        "count": len(modes),
+        "description": "Common industrial equipment failure patterns"
+    }
 
 
 @app.route('/api/datasets/failure-modes', methods=['GET'])
 def get_failure_modes_api():
     """Get all defined failure modes with characteristics"""
     try:
-        modes = get_all_failure_modes()
-        
-        return jsonify({
-            "failure_modes": modes,
-            "count": len(modes),
-            "description": "Common industrial equipment failure patterns"
-        })
+        # Failure modes are fixed at import, so the encoded body never changes
+        return static_json_response('failure_modes', _failure_modes_payload)
     
     except Exception as e:
-        app.logger.error(f"Error getting failure modes: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting failure modes: %s", e)
+        return error_response("Internal server error", 500)
+
+
+def _ndjson_dataset(header: dict, rows):
+    """NDJSON stream: the header object, then one line per sample"""
+    yield app.json.dumps(header) + "\n"
+    for row in rows:
+        yield app.json.dumps(row) + "\n"
 
 
 @app.route('/api/datasets/generate', methods=['POST'])
 def generate_dataset():
-    """Generate a professional failure dataset for ML training"""
+    """
+    Generate a professional failure dataset for ML training
+    (?format=ndjson streams the samples line by line instead of one JSON document)
+    """
     try:
-        data = request.get_json()
+        body = parse_body(GENERATE_DATASET_FIELDS)
         
-        equipment_type = data.get('equipment_type', 'BOILER_FEED_PUMP')
-        failure_mode = data.get('failure_mode', 'BEARING_INNER_RACE')
-        duration_hours = float(data.get('duration_hours', 4))
-        sample_interval = float(data.get('sample_interval_minutes', 5))
+        equipment_type = body['equipment_type']
+        failure_mode = body['failure_mode']
+        duration_hours = body['duration_hours']
+        sample_interval = body['sample_interval_minutes']
         
         # Validate inputs
         if equipment_type not in EQUIPMENT_PROFILES:
             return jsonify({
                 "error": f"Unknown equipment type: {equipment_type}",
-                "valid_types": list(EQUIPMENT_PROFILES.keys())
+                "valid_types": VALID_EQUIPMENT_TYPES
             }), 400
         
         if failure_mode not in FAILURE_MODES:
             return jsonify({
                 "error": f"Unknown failure mode: {failure_mode}",
-                "valid_modes": list(FAILURE_MODES.keys())
+                "valid_modes": VALID_FAILURE_MODES
             }), 400
         
+        if request.args.get('format') == 'ndjson':
+            # Columns are generated up front (vectorized); per-sample dicts are
+            # built and encoded only as the client reads them
+            arrays = generate_professional_dataset_arrays(
+                equipment_type, failure_mode, duration_hours, sample_interval
+            )
+            header = {
+                "success": True,
+                "equipment_type": equipment_type,
+                "failure_mode": failure_mode,
+                "duration_hours": duration_hours,
+                "sample_count": len(arrays)
+            }
+            return Response(
+                _ndjson_dataset(header, iter_professional_dataset(arrays, equipment_type, sample_interval)),
+                mimetype='application/x-ndjson'
+            )
+        
         dataset = generate_professional_dataset(
             equipment_type=equipment_type,
             failure_mode=failure_mode,
@@ -1066,8 +1569,10 @@ def generate_dataset():
             "dataset": dataset
         })
     
+    except BodyError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        app.logger.error(f"Error generating dataset: {str(e)}")
+        app.logger.error("Error generating dataset: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
@@ -1078,16 +1583,26 @@ def get_prediction_metrics():
     """Get comprehensive prediction metrics for hackathon evaluation"""
     try:
         tracker = get_metrics_tracker()
+        
+        # Metrics only change with the tracker's records (expiry included)
+        tracker.expire_pending_predictions()
+        etag = f"{ETAG_EPOCH}-{tracker.generation}"
+        response = not_modified(etag)
+        if response is not None:
+            return response
+        
         metrics = tracker.calculate_metrics()
         
-        return jsonify({
+        response = jsonify({
             "success": True,
             **metrics
         })
+        response.set_etag(etag)
+        return response
     
     except Exception as e:
-        app.logger.error(f"Error getting metrics: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting metrics: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/metrics/predictions', methods=['GET'])
@@ -1098,17 +1613,24 @@ def get_predictions_history():
         limit = int(request.args.get('limit', 20))
         
         tracker = get_metrics_tracker()
+        etag = f"{ETAG_EPOCH}-{tracker.generation}"
+        response = not_modified(etag)
+        if response is not None:
+            return response
+        
         predictions = tracker.get_prediction_history(machine_id, limit)
         
-        return jsonify({
+        response = jsonify({
             "predictions": predictions,
             "count": len(predictions),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         })
+        response.set_etag(etag)
+        return response
     
     except Exception as e:
-        app.logger.error(f"Error getting predictions: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting predictions: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/metrics/failures', methods=['GET'])
@@ -1119,32 +1641,40 @@ def get_failures_history():
         limit = int(request.args.get('limit', 20))
         
         tracker = get_metrics_tracker()
+        etag = f"{ETAG_EPOCH}-{tracker.generation}"
+        response = not_modified(etag)
+        if response is not None:
+            return response
+        
         failures = tracker.get_failure_history(machine_id, limit)
         
-        return jsonify({
+        response = jsonify({
             "failures": failures,
             "count": len(failures),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         })
+        response.set_etag(etag)
+        return response
     
     except Exception as e:
-        app.logger.error(f"Error getting failures: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error getting failures: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/metrics/record-prediction', methods=['POST'])
 def record_prediction():
     """Manually record a prediction (for tracking)"""
     try:
-        data = request.get_json()
+        body = parse_body(RECORD_PREDICTION_FIELDS)
         
-        machine_id = data.get('machine_id')
-        ttf_hours = data.get('ttf_hours')
-        health_score = data.get('health_score')
-        anomaly_score = data.get('anomaly_score', 0.5)
-        confidence = data.get('confidence', 0.8)
+        machine_id = body['machine_id']
+        ttf_hours = body['ttf_hours']
+        health_score = body['health_score']
+        anomaly_score = body['anomaly_score']
+        confidence = body['confidence']
         
-        if not all([machine_id, ttf_hours, health_score]):
+        # 0 is a legitimate TTF / health score, so test for absence, not falsiness
+        if not machine_id or ttf_hours is None or health_score is None:
             return jsonify({"error": "machine_id, ttf_hours, and health_score required"}), 400
         
         tracker = get_metrics_tracker()
@@ -1158,19 +1688,21 @@ def record_prediction():
             "message": f"Prediction recorded for {machine_id}"
         })
     
+    except BodyError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        app.logger.error(f"Error recording prediction: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error recording prediction: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/metrics/record-failure', methods=['POST'])
 def record_failure():
     """Record an actual failure event"""
     try:
-        data = request.get_json()
+        body = parse_body(RECORD_FAILURE_FIELDS)
         
-        machine_id = data.get('machine_id')
-        event_type = data.get('event_type', 'failure')
+        machine_id = body['machine_id']
+        event_type = body['event_type']
         
         if not machine_id:
             return jsonify({"error": "machine_id required"}), 400
@@ -1185,8 +1717,8 @@ def record_failure():
         })
     
     except Exception as e:
-        app.logger.error(f"Error recording failure: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error recording failure: %s", e)
+        return error_response("Internal server error", 500)
 
 
 @app.route('/api/metrics/seed-demo', methods=['POST'])
@@ -1202,67 +1734,87 @@ def seed_metrics_demo():
         })
     
     except Exception as e:
-        app.logger.error(f"Error seeding demo: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        app.logger.error("Error seeding demo: %s", e)
+        return error_response("Internal server error", 500)
 
 
 # ==================== STARTUP ====================
 
 if __name__ == '__main__':
-    print("=" * 60)
-    print("🏭 PRODUCTION-GRADE PREDICTIVE MAINTENANCE API")
-    print("=" * 60)
-    print(f"\n✓ Environment: {Config.get_env()}")
-    print(f"✓ Database: {Config.DB_PATH}")
-    print(f"✓ Logs: {log_file}")
-    print(f"✓ Fleet initialized: {len(fleet.machines)} machines")
-    print("✓ ML stabilization: EMA smoothing + monotonic RUL")
-    print("✓ Alert lifecycle: ACTIVE → ACKNOWLEDGED → RESOLVED → LOGGED")
-    
-    print("\n📋 API Endpoints:")
-    print("  GET  /api/health                          - Deep health check")
-    print("  GET  /api/machines                        - List all machines")
-    print("  GET  /api/sensor-data                     - Get sensor readings")
-    print("  POST /api/predict-rul                     - Predict RUL")
-    print("  GET  /api/anomaly-check                   - Check anomalies")
-    print("  GET  /api/health-trend/:id                - Get health forecast")
-    print("\n  GET  /api/alerts                          - Get active alerts")
-    print("  POST /api/alerts/:id/acknowledge          - Acknowledge alert")
-    print("  POST /api/alerts/:id/resolve              - Resolve alert")
-    print("  GET  /api/alerts/statistics               - Alert statistics")
-    print("\n  GET  /api/logs                            - Get maintenance logs")
-    print("  GET  /api/sensor-history/:id              - Get sensor history")
-    print("  POST /api/machines/:id/maintenance        - Perform maintenance")
-    
-    print("\n🎮 DEMO CONTROL (Hidden):")
-    print("  POST /api/demo/override                   - Set manual sensor values")
-    print("  DELETE /api/demo/override/:id             - Clear manual override")
-    print("  GET  /api/demo/status                     - Get override status")
-    
-    print("\n📊 METRICS & EVALUATION (For Judges):")
-    print("  GET  /api/metrics                         - Get precision/recall/lead time")
-    print("  GET  /api/metrics/predictions             - Prediction history")
-    print("  GET  /api/metrics/failures                - Failure events history")
-    print("  POST /api/metrics/seed-demo               - Seed demo metrics data")
-    
-    print("\n🎬 DEMO SCENARIOS (Failure Playback):")
-    print("  GET  /api/scenarios                       - List available scenarios")
-    print("  POST /api/scenarios/start                 - Start failure scenario")
-    print("  POST /api/scenarios/stop/:id              - Stop scenario")
-    print("  GET  /api/scenarios/reading/:id           - Get scenario reading")
-    print("  GET  /api/scenarios/active                - All active scenarios")
-    
-    print("\n🖥️  PRESET MACHINES (Static Reference):")
-    print("  GET  /api/presets                         - List all preset machines")
-    print("  GET  /api/presets/:id                     - Get specific preset")
-    
-    print("\n📦 PROFESSIONAL DATASETS (Industry Standards):")
-    print("  GET  /api/datasets/equipment-profiles     - ISO 10816 equipment specs")
-    print("  GET  /api/datasets/failure-modes          - Failure mode definitions")
-    print("  POST /api/datasets/generate               - Generate ML training data")
+    banner = [
+        "=" * 60,
+        "🏭 PRODUCTION-GRADE PREDICTIVE MAINTENANCE API",
+        "=" * 60,
+        f"\n✓ Environment: {Config.get_env()}",
+        f"✓ Database: {Config.DB_PATH}",
+        f"✓ Logs: {log_file}",
+        f"✓ Fleet initialized: {len(fleet.machines)} machines",
+        "✓ ML stabilization: EMA smoothing + monotonic RUL",
+        "✓ Alert lifecycle: ACTIVE → ACKNOWLEDGED → RESOLVED → LOGGED",
+        
+        "\n📋 API Endpoints:",
+        "  GET  /api/health                          - Deep health check",
+        "  GET  /api/live                            - Liveness probe",
+        "  GET  /api/machines                        - List all machines",
+        "  GET  /api/sensor-data                     - Get sensor readings",
+        "  POST /api/predict-rul                     - Predict RUL",
+        "  GET  /api/anomaly-check                   - Check anomalies",
+        "  GET  /api/health-trend/:id                - Get health forecast",
+        "\n  GET  /api/alerts                          - Get active alerts",
+        "  POST /api/alerts/:id/acknowledge          - Acknowledge alert",
+        "  POST /api/alerts/:id/resolve              - Resolve alert",
+        "  GET  /api/alerts/statistics               - Alert statistics",
+        "\n  GET  /api/logs                            - Get maintenance logs",
+        "  GET  /api/sensor-history/:id              - Get sensor history",
+        "  POST /api/machines/:id/maintenance        - Perform maintenance",
+        
+        "\n🎮 DEMO CONTROL (Hidden):",
+        "  POST /api/demo/override                   - Set manual sensor values",
+        "  DELETE /api/demo/override/:id             - Clear manual override",
+        "  GET  /api/demo/status                     - Get override status",
+        
+        "\n📊 METRICS & EVALUATION (For Judges):",
+        "  GET  /api/metrics                         - Get precision/recall/lead time",
+        "  GET  /api/metrics/predictions             - Prediction history",
+        "  GET  /api/metrics/failures                - Failure events history",
+        "  POST /api/metrics/seed-demo               - Seed demo metrics data",
+        
+        "\n🎬 DEMO SCENARIOS (Failure Playback):",
+        "  GET  /api/scenarios                       - List available scenarios",
+        "  POST /api/scenarios/start                 - Start failure scenario",
+        "  POST /api/scenarios/stop/:id              - Stop scenario",
+        "  GET  /api/scenarios/reading/:id           - Get scenario reading",
+        "  GET  /api/scenarios/active                - All active scenarios",
+        "  GET  /api/scenarios/status                - Scenario status of all machines",
+        
+        "\n🖥️  PRESET MACHINES (Static Reference):",
+        "  GET  /api/presets                         - List all preset machines",
+        "  GET  /api/presets/:id                     - Get specific preset",
+        
+        "\n📦 PROFESSIONAL DATASETS (Industry Standards):",
+        "  GET  /api/datasets/equipment-profiles     - ISO 10816 equipment specs",
+        "  GET  /api/datasets/failure-modes          - Failure mode definitions",
+        "  POST /api/datasets/generate               - Generate ML training data",
+        
+        f"\n🚀 Starting server on http://localhost:5000",
+        "=" * 60,
+        "",
+    ]
+    banner = "\n".join(banner) + "\n"
+    # Consoles without UTF-8 (e.g. Windows cp1252) cannot encode the emoji
+    if 'utf' not in (sys.stdout.encoding or '').lower():
+        banner = banner.encode('ascii', 'ignore').decode('ascii')
+    sys.stdout.write(banner)  # one write: no interleaving with server log lines
+    sys.stdout.flush()
     
-    print(f"\n🚀 Starting server on http://localhost:5000")
-    print("=" * 60)
-    print()
+    start_simulation_clock()
     
-    app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
+    # One thread per request: concurrent pollers never queue behind each other.
+    # Handlers are CPU-bound (models, simulation) or in-memory, and the heavier
+    # shared state is protected by the caches/locks above, so threads are the
+    # right concurrency model here (an asyncio port would block its loop).
+    # The werkzeug debugger only runs in development; for production serving
+    # use gunicorn with ONE worker (the fleet lives in this process):
+    #   gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:5000 server:app
+    app.run(debug=Config.is_development(), host='0.0.0.0', port=5000,
+            use_reloader=False, threaded=True)
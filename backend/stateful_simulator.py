@@ -9,58 +9,128 @@ Integrates NASA IMS Bearing Dataset for realistic failure simulation
 - M-004: MANUAL (operator control)
 """
 import numpy as np
+import threading
+import time
+from bisect import bisect_right
 from datetime import datetime
-from typing import Dict, Optional
+from functools import wraps
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, List, Optional
 from config import Config
+from demo_scenarios import get_scenario_player
+from numba_compat import njit, NUMBA_AVAILABLE
+from stress_scenarios import get_stress_engine
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sensors of every machine, in the order of the per-machine state arrays
+SENSOR_NAMES = ("vibration_x", "vibration_y", "temperature", "pressure", "rpm")
+SENSOR_DEFAULT_BASELINES = {
+    "vibration_x": 0.5,
+    "vibration_y": 0.5,
+    "temperature": 70.0,
+    "pressure": 100.0,
+    "rpm": 1500.0
+}
+# Physical (min, max) of each sensor, row per sensor in SENSOR_NAMES order
+SENSOR_LIMITS = np.array([Config.SENSOR_LIMITS[name] for name in SENSOR_NAMES], dtype=np.float64)
+
+# Sensor noise source of every simulated machine
+_RNG = np.random.default_rng()
+
+# FAILING-mode health state by degradation progress: below 0.3 healthy, below
+# 0.6 degrading, below 0.85 pre_failure, else failure
+FAILING_PROGRESS_THRESHOLDS = (0.3, 0.6, 0.85)
+FAILING_HEALTH_STATES = ('healthy', 'degrading', 'pre_failure', 'failure')
+
+
+def _fleet_locked(method):
+    """Run a FleetSimulator method under the fleet lock (clock thread vs. request threads)"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@njit(cache=True)
+def _sensor_step(baseline, min_limit, max_limit, drift, current, noise, factors, hours):
+    """
+    One time step of (machines, sensors) state in place: drift accumulates
+    by the row's degradation factor and each value is clipped to its limits
+    (the MachineSimulator.update_sensors arithmetic, without temporaries)
+    """
+    for i in range(baseline.shape[0]):
+        drift_step = (factors[i] - 1.0) * 0.001 * hours
+        for j in range(baseline.shape[1]):
+            drift[i, j] += drift_step
+            value = baseline[i, j] * factors[i] + drift[i, j] + noise[i, j]
+            current[i, j] = min(max(value, min_limit[i, j]), max_limit[i, j])
+
 
 class StatefulSensor:
-    """Individual sensor with memory and degradation"""
+    """
+    Individual sensor with memory and degradation.
+    A view of one slot of its machine's sensor arrays (the machine updates all
+    of its sensors together), so reads and writes go straight to that state.
+    """
     
-    def __init__(self, name: str, baseline: float, limits: tuple):
-        self.name = name
-        self.baseline = baseline
-        self.min_limit, self.max_limit = limits
-        
-        # Current state
-        self.current_value = baseline
-        self.drift_accumulator = 0.0
-        self.noise_level = 0.02  # 2% noise
-        
-    def update(self, degradation_factor: float, dt: float = 1.0):
-        """Update sensor value with physics-based degradation"""
-        # Brownian motion (time-correlated noise)
-        noise = np.random.normal(0, self.noise_level * self.baseline)
-        
-        # Drift towards degraded state
-        drift_rate = (degradation_factor - 1.0) * 0.001  # Slow drift
-        self.drift_accumulator += drift_rate * dt
-        
-        # Calculate new value
-        degraded_baseline = self.baseline * degradation_factor
-        self.current_value = degraded_baseline + self.drift_accumulator + noise
-        
-        # Enforce physical limits
-        self.current_value = np.clip(self.current_value, self.min_limit, self.max_limit)
-        
-        return self.current_value
+    __slots__ = ('_machine', '_index', 'name')
+    
+    def __init__(self, machine: "MachineSimulator", index: int):
+        self._machine = machine
+        self._index = index
+        self.name = SENSOR_NAMES[index]
+    
+    @property
+    def baseline(self) -> float:
+        return float(self._machine.baseline[self._index])
+    
+    @property
+    def min_limit(self) -> float:
+        return float(self._machine.min_limit[self._index])
+    
+    @property
+    def max_limit(self) -> float:
+        return float(self._machine.max_limit[self._index])
+    
+    @property
+    def noise_level(self) -> float:
+        return float(self._machine.noise_level[self._index])
+    
+    @noise_level.setter
+    def noise_level(self, value: float):
+        self._machine.noise_level[self._index] = value
+    
+    @property
+    def current_value(self) -> float:
+        return self._machine.current_value[self._index]
+    
+    @property
+    def drift_accumulator(self) -> float:
+        return self._machine.drift_accumulator[self._index]
     
     def reset(self):
         """Reset sensor to healthy baseline (after maintenance)"""
-        self.current_value = self.baseline
-        self.drift_accumulator = 0.0
+        self._machine.current_value[self._index] = self.baseline
+        self._machine.drift_accumulator[self._index] = 0.0
 
 
 class MachineSimulator:
     """Stateful machine simulator with realistic degradation"""
     
+    __slots__ = ('machine_id', 'runtime_hours', 'last_update', '_degradation_cache',
+                 'machine_type', 'machine_name', 'machine_description',
+                 'baseline', 'min_limit', 'max_limit', 'noise_level',
+                 'current_value', 'drift_accumulator', 'rounded_value', 'sensors')
+    
     def __init__(self, machine_id: str, machine_type: str = None, initial_runtime_hours: float = 0.0):
         self.machine_id = machine_id
         self.runtime_hours = initial_runtime_hours
         self.last_update = datetime.now()
+        self._degradation_cache = (None, None, None)  # (runtime_hours, phase, factor)
         
         # Get machine type from config or use provided
         if machine_type is None:
@@ -75,34 +145,23 @@ class MachineSimulator:
         self.machine_name = type_config["name"]
         self.machine_description = type_config["description"]
         
-        # Initialize sensors with type-specific baselines
-        self.sensors = {
-            'vibration_x': StatefulSensor(
-                'vibration_x',
-                baselines.get('vibration_x', 0.5),
-                Config.SENSOR_LIMITS['vibration_x']
-            ),
-            'vibration_y': StatefulSensor(
-                'vibration_y',
-                baselines.get('vibration_y', 0.5),
-                Config.SENSOR_LIMITS['vibration_y']
-            ),
-            'temperature': StatefulSensor(
-                'temperature',
-                baselines.get('temperature', 70.0),
-                Config.SENSOR_LIMITS['temperature']
-            ),
-            'pressure': StatefulSensor(
-                'pressure',
-                baselines.get('pressure', 100.0),
-                Config.SENSOR_LIMITS['pressure']
-            ),
-            'rpm': StatefulSensor(
-                'rpm',
-                baselines.get('rpm', 1500.0),
-                Config.SENSOR_LIMITS['rpm']
-            )
-        }
+        # Sensor state as one float64 array per quantity (SENSOR_NAMES order),
+        # so a time step updates all sensors in a few array operations. float64
+        # on purpose: the whole fleet is a few dozen values, and float32 would
+        # move 3-decimal readings and let the slow drift lose precision
+        self.baseline = np.array(
+            [baselines.get(name, SENSOR_DEFAULT_BASELINES[name]) for name in SENSOR_NAMES],
+            dtype=np.float64
+        )
+        self.min_limit = SENSOR_LIMITS[:, 0].copy()
+        self.max_limit = SENSOR_LIMITS[:, 1].copy()
+        self.noise_level = np.full(len(SENSOR_NAMES), 0.02)  # 2% noise
+        self.current_value = self.baseline.copy()
+        self.drift_accumulator = np.zeros(len(SENSOR_NAMES))
+        self.rounded_value = np.empty(len(SENSOR_NAMES))  # current_value to 3 decimals, for readings
+        
+        # Per-sensor views of the arrays above
+        self.sensors = {name: StatefulSensor(self, i) for i, name in enumerate(SENSOR_NAMES)}
         
         # Set type-specific noise levels based on variance
         if variance:
@@ -113,53 +172,85 @@ class MachineSimulator:
                 self.sensors['pressure'].noise_level = variance.get('pressure', 5.0) / baselines.get('pressure', 100.0)
             self.sensors['rpm'].noise_level = variance.get('rpm', 15.0) / baselines.get('rpm', 1500.0)
     
-    def advance_time(self, hours: float = 0.0333):  # Default: ~2 minutes
-        """Advance machine runtime and update sensors"""
-        self.runtime_hours += hours
+    def update_sensors(self, degradation_factor: float, dt: float = 1.0) -> np.ndarray:
+        """Update all sensor values with physics-based degradation"""
+        # Brownian motion (time-correlated noise), drawn in sensor order
+        noise = _RNG.normal(0, self.noise_level * self.baseline)
         
-        # Get current degradation phase and factor
-        phase = Config.get_degradation_phase(self.runtime_hours)
-        degradation_factor = Config.get_degradation_factor(phase)
+        # Drift towards degraded state
+        drift_rate = (degradation_factor - 1.0) * 0.001  # Slow drift
+        self.drift_accumulator += drift_rate * dt
         
-        # Update all sensors
-        sensor_readings = {}
-        for name, sensor in self.sensors.items():
-            value = sensor.update(degradation_factor, dt=hours)
-            sensor_readings[name] = round(value, 3)
+        # New values within physical limits
+        degraded_baseline = self.baseline * degradation_factor
+        np.clip(degraded_baseline + self.drift_accumulator + noise,
+                self.min_limit, self.max_limit, out=self.current_value)
         
-        self.last_update = datetime.now()
+        return self.current_value
+    
+    def advance_time(self, hours: float = 0.0333):  # Default: ~2 minutes
+        """Advance machine runtime and update sensors"""
+        phase, degradation_factor = self.advance_runtime(hours)
+        self.update_sensors(degradation_factor, dt=hours)
+        return self.advanced_reading(phase, degradation_factor)
+    
+    def advance_runtime(self, hours: float):
+        """Add runtime hours; returns the resulting degradation (phase, factor)"""
+        self.runtime_hours += hours
+        return self.degradation()
+    
+    def degradation(self):
+        """
+        Degradation (phase, factor) at the current runtime; reused until the
+        runtime changes, since every reading between ticks asks for it again
+        """
+        runtime, phase, factor = self._degradation_cache
+        if runtime != self.runtime_hours:
+            phase = Config.get_degradation_phase(self.runtime_hours)
+            factor = Config.get_degradation_factor(phase)
+            self._degradation_cache = (self.runtime_hours, phase, factor)
+        return phase, factor
+    
+    def advanced_reading(self, phase: str, degradation_factor: float,
+                         now: Optional[datetime] = None, rounded: bool = False) -> Dict:
+        """
+        Reading of a time step whose sensors have just been updated (at now);
+        rounded=True when rounded_value has already been refreshed for it
+        """
+        sensor_readings = self.sensor_readings(rounded)
         
+        self.last_update = now or datetime.now()
+        return self.reading(sensor_readings, phase.lower(), degradation_factor, self.last_update)
+    
+    def sensor_readings(self, rounded: bool = False) -> Dict:
+        """Sensor values rounded to 3 decimals, by sensor name"""
+        if not rounded:
+            np.round(self.current_value, 3, out=self.rounded_value)
+        return dict(zip(SENSOR_NAMES, self.rounded_value.tolist()))
+    
+    def reading(self, sensor_readings: Dict, health_state: str, degradation_factor: float,
+                now: datetime) -> Dict:
+        """Reading dict of this machine with the given sensor values and state"""
         return {
             'machine_id': self.machine_id,
-            'timestamp': self.last_update.isoformat(),
+            'timestamp': now.isoformat(),
             'runtime_hours': round(self.runtime_hours, 2),
             'sensors': sensor_readings,
-            'health_state': phase.lower(),
+            'health_state': health_state,
             'degradation_factor': degradation_factor
         }
     
-    def get_current_reading(self):
-        """Get current sensor reading without advancing time"""
-        sensor_readings = {
-            name: round(sensor.current_value, 3)
-            for name, sensor in self.sensors.items()
-        }
-        
-        phase = Config.get_degradation_phase(self.runtime_hours)
+    def get_current_reading(self, now: Optional[datetime] = None):
+        """Get current sensor reading without advancing time (stamped now)"""
+        sensor_readings = self.sensor_readings()
         
-        return {
-            'machine_id': self.machine_id,
-            'timestamp': datetime.now().isoformat(),
-            'runtime_hours': round(self.runtime_hours, 2),
-            'sensors': sensor_readings,
-            'health_state': phase.lower(),
-            'degradation_factor': Config.get_degradation_factor(phase)
-        }
+        phase, degradation_factor = self.degradation()
+        return self.reading(sensor_readings, phase.lower(), degradation_factor, now or datetime.now())
     
     def perform_maintenance(self):
         """Simulate maintenance - reset sensors and runtime"""
-        for sensor in self.sensors.values():
-            sensor.reset()
+        self.current_value[:] = self.baseline
+        self.drift_accumulator[:] = 0.0
         self.runtime_hours = 0.0
         print(f"✓ Maintenance performed on {self.machine_id}")
 
@@ -175,6 +266,10 @@ class FleetSimulator:
     """
     
     def __init__(self):
+        # Guards the sensor matrices, noise buffer and mode state: the simulation
+        # clock advances them while request threads read and run maintenance
+        self._lock = threading.RLock()
+        
         # Initialize fleet with 4-machine architecture
         self.machines = {
             # M-001: NORMAL - Stable baseline
@@ -201,20 +296,62 @@ class FleetSimulator:
         # NASA Data Loader (lazy init)
         self._nasa_loader = None
         
+        # Degradation rate per second: custom rates (set_degradation_rate) override the config
+        self.custom_degradation_rates: Dict[str, float] = {}
+        self.default_degradation_rate = Config.MACHINE_MODE_CONFIG.get('FAILING', {}).get('degradation_rate', 0.001)
+        
         # Noise level for NORMAL mode machines
         self.noise_levels = {
             'M-001': 0.02,  # 2% noise - very stable
             'M-002': 0.10,  # 10% noise - occasional spikes
         }
         
+        # Operating mode per machine (the config assignment is fixed for the process)
+        self.modes = {mid: Config.MACHINE_MODES.get(mid, 'NORMAL') for mid in self.machines}
+        
+        # NORMAL-mode machines and their rows in the fleet sensor matrices
+        self._normal_ids = [mid for mid, mode in self.modes.items() if mode == 'NORMAL']
+        self._normal_rows = np.array(
+            [i for i, mid in enumerate(self.machines) if self.modes[mid] == 'NORMAL'], dtype=np.intp
+        )
+        
+        # Reading builder per mode; other modes fall through to legacy demo + stress
+        self._mode_readers = {
+            'NORMAL': self._read_normal,
+            'FAILING': self._read_failing,
+            'MANUAL': self._read_manual,
+        }
+        
         print(f"✓ {Config.PLANT_NAME} fleet initialized with {len(self.machines)} equipment:")
         for mid, machine in self.machines.items():
-            mode = Config.MACHINE_MODES.get(mid, 'NORMAL')
-            print(f"  - {mid}: {machine.machine_name} [{mode}]")
+            print(f"  - {mid}: {machine.machine_name} [{self.modes[mid]}]")
             
         # ==================== STRESS SCENARIO ENGINE ====================
-        from stress_scenarios import get_stress_engine
         self.stress_engine = get_stress_engine()
+        
+        self._stack_sensor_state()
+        if NUMBA_AVAILABLE:
+            # Compile (or load from cache) the tick kernel now, not on the first tick
+            state = np.zeros((1, len(SENSOR_NAMES)))
+            _sensor_step(state, state, state, state, state, state, np.ones(1), 0.0)
+    
+    # Per-machine sensor arrays that the fleet stacks into (n_machines, 5) matrices
+    SENSOR_STATE = ("baseline", "min_limit", "max_limit", "noise_level",
+                    "current_value", "drift_accumulator", "rounded_value")
+    
+    def _stack_sensor_state(self):
+        """
+        Stack every machine's sensor arrays into fleet matrices (row i is the
+        i-th machine) and point the machines at their rows, so one fleet-wide
+        update and per-machine updates/maintenance share the same state
+        """
+        machines = list(self.machines.values())
+        for attr in self.SENSOR_STATE:
+            matrix = np.stack([getattr(machine, attr) for machine in machines])
+            setattr(self, '_' + attr, matrix)
+            for machine, row in zip(machines, matrix):
+                setattr(machine, attr, row)
+        self._noise_buffer = np.empty_like(self._baseline)
 
     
     @property
@@ -236,7 +373,9 @@ class FleetSimulator:
         if machine_id not in self.machines:
             return False
         self.manual_override[machine_id] = sensor_values
-        print(f"✓ Manual override set for {machine_id}: {sensor_values}")
+        # Debug level: demo UIs resend overrides many times per second while a
+        # slider is dragged, and a console write per call dominated the handler
+        logger.debug(f"✓ Manual override set for {machine_id}: {sensor_values}")
         return True
     
     def clear_manual_override(self, machine_id: str) -> bool:
@@ -247,27 +386,106 @@ class FleetSimulator:
             return True
         return False
     
-    def advance_all(self, hours: float = 0.0333):
-        """Advance time for all machines"""
-        readings = []
-        for machine in self.machines.values():
-            reading = machine.advance_time(hours)
-            readings.append(reading)
-        return readings
+    @_fleet_locked
+    def advance_all(self, hours: float = 0.0333, readings: bool = True):
+        """
+        Advance time for all machines (one array update for the whole fleet).
+        readings=False skips building the tick's readings (returns []) for
+        callers that only move the simulation forward.
+        """
+        machines = list(self.machines.values())
+        phases = [machine.advance_runtime(hours) for machine in machines]
+        factors = np.array([factor for _, factor in phases])
+        
+        # Same arithmetic as MachineSimulator.update_sensors, row per machine,
+        # with the noise drawn into a buffer reused every tick
+        noise = self._noise_buffer
+        _RNG.standard_normal(out=noise)
+        noise *= self._noise_level * self._baseline
+        if NUMBA_AVAILABLE:
+            _sensor_step(self._baseline, self._min_limit, self._max_limit,
+                         self._drift_accumulator, self._current_value, noise, factors, float(hours))
+        else:
+            self._drift_accumulator += ((factors - 1.0) * 0.001 * hours)[:, None]
+            np.clip(self._baseline * factors[:, None] + self._drift_accumulator + noise,
+                    self._min_limit, self._max_limit, out=self._current_value)
+        
+        now = datetime.now()  # one timestamp for the whole tick
+        if not readings:
+            for machine in machines:
+                machine.last_update = now
+            return []
+        
+        # Round the whole fleet for the readings in one pass
+        np.round(self._current_value, 3, out=self._rounded_value)
+        return [
+            machine.advanced_reading(phase, factor, now, rounded=True)
+            for machine, (phase, factor) in zip(machines, phases)
+        ]
     
+    @_fleet_locked
     def get_all_readings(self):
         """Get current readings from all machines (using mode-aware logic)"""
         readings = []
+        now = datetime.now()  # one timestamp for the whole fleet snapshot
+        normal_readings = self._normal_readings(now)
         for machine_id in self.machines:
-            # Use get_machine_reading to ensure all modes/stress/overrides are applied
-            reading = self.get_machine_reading(machine_id)
+            reading = normal_readings.get(machine_id)
+            if reading is None:
+                # Use get_machine_reading to ensure all modes/stress/overrides are applied
+                reading = self.get_machine_reading(machine_id, now)
             if reading:
                 readings.append(reading)
         return readings
     
-    def get_machine_reading(self, machine_id: str):
+    def _normal_readings(self, now: datetime) -> Dict[str, Dict]:
+        """
+        Readings of every NORMAL-mode machine from the fleet sensor matrix with
+        one noise draw: the values _read_normal gives machine by machine (the
+        draw runs in the same machine/sensor order, and no other mode draws)
+        """
+        if not self._normal_ids:
+            return {}
+        
+        base = np.round(self._current_value[self._normal_rows], 3)
+        noise_levels = np.array([self.noise_levels.get(mid, 0.02) for mid in self._normal_ids])
+        noise = _RNG.standard_normal(base.shape) * (noise_levels[:, None] * np.abs(base))
+        values = np.round(base + noise, 3)
+        
+        readings = {}
+        for machine_id, row in zip(self._normal_ids, values.tolist()):
+            reading = self.machines[machine_id].reading(dict(zip(SENSOR_NAMES, row)), 'healthy', 1.0, now)
+            reading['mode'] = 'NORMAL'
+            reading['manual_override'] = False
+            readings[machine_id] = reading
+        return readings
+    
+    # Column order of sensor_matrix (matches the ML models' feature order)
+    SENSOR_COLUMNS = SENSOR_NAMES
+    _sensor_values = itemgetter(*SENSOR_COLUMNS)
+    
+    def sensor_matrix(self, readings: List[Dict]) -> np.ndarray:
+        """
+        Pack the readings' sensors into one (N, 5) float64 matrix in
+        SENSOR_COLUMNS order, NaN where a reading lacks a sensor
+        """
+        sensors = [reading['sensors'] for reading in readings]
+        try:
+            # Simulated readings carry every sensor: one flat pass, no per-key lookups
+            return np.fromiter(
+                chain.from_iterable(map(self._sensor_values, sensors)),
+                dtype=np.float64, count=len(sensors) * len(self.SENSOR_COLUMNS)
+            ).reshape(-1, len(self.SENSOR_COLUMNS))
+        except KeyError:
+            return np.array([
+                [sd.get(col, np.nan) for col in self.SENSOR_COLUMNS] for sd in sensors
+            ], dtype=np.float64).reshape(-1, len(self.SENSOR_COLUMNS))
+    
+    @_fleet_locked
+    def get_machine_reading(self, machine_id: str, now: Optional[datetime] = None):
         """
         Get reading from specific machine - MODE AWARE
+        (now: the reading time, shared by fleet-wide callers; default the current time)
         
         Modes:
         - NORMAL: Stable baseline with low noise
@@ -277,110 +495,23 @@ class FleetSimulator:
         if machine_id not in self.machines:
             return None
         
-        from config import Config
-        mode = Config.MACHINE_MODES.get(machine_id, 'NORMAL')
+        mode = self.modes[machine_id]
+        
+        if now is None:
+            now = datetime.now()
         
         # Get base reading from simulation
-        reading = self.machines[machine_id].get_current_reading()
+        reading = self.machines[machine_id].get_current_reading(now)
         reading['mode'] = mode
         reading['manual_override'] = False
         
-        # ==================== NORMAL MODE ====================
-        if mode == 'NORMAL':
-            # Stable baseline with configurable noise
-            noise_level = self.noise_levels.get(machine_id, 0.02)
-            
-            # Apply slight noise to sensors (but keep them stable)
-            for sensor_name in reading['sensors']:
-                base_value = reading['sensors'][sensor_name]
-                noise = np.random.normal(0, noise_level * abs(base_value))
-                reading['sensors'][sensor_name] = round(base_value + noise, 3)
-            
-            # Force healthy state for NORMAL mode
-            reading['health_state'] = 'healthy'
-            reading['degradation_factor'] = 1.0
-            return reading
-        
-        # ==================== FAILING MODE (NASA DATA) ====================
-        elif mode == 'FAILING':
-            # Initialize start time if not set
-            if self.degradation_start_time.get(machine_id) is None:
-                self.degradation_start_time[machine_id] = datetime.now()
-            
-            # Calculate degradation progress based on elapsed time
-            elapsed = (datetime.now() - self.degradation_start_time[machine_id]).total_seconds()
-            
-            # Get degradation rate (custom if set, otherwise from config)
-            if hasattr(self, 'custom_degradation_rates') and machine_id in self.custom_degradation_rates:
-                degradation_rate = self.custom_degradation_rates[machine_id]
-            else:
-                mode_config = Config.MACHINE_MODE_CONFIG.get('FAILING', {})
-                degradation_rate = mode_config.get('degradation_rate', 0.001)
-            
-            # Update progress (capped at 1.0)
-            self.degradation_progress[machine_id] = min(1.0, elapsed * degradation_rate)
-            progress = self.degradation_progress[machine_id]
-            
-            # Get NASA features for current progress
-            if self.nasa_loader:
-                nasa_features = self.nasa_loader.get_degradation_features(progress)
-            else:
-                nasa_features = None
-            
-            # Apply NASA degradation to sensors
-            if nasa_features:
-                # Map NASA features to sensor readings
-                # RMS → vibration (normalized to baseline)
-                baseline_vib = self.machines[machine_id].sensors['vibration_x'].baseline
-                rms_ratio = nasa_features['rms'] / 0.13  # Normalize to healthy baseline
-                reading['sensors']['vibration_x'] = round(baseline_vib * rms_ratio, 3)
-                reading['sensors']['vibration_y'] = round(baseline_vib * rms_ratio * 1.1, 3)
-                
-                # Temperature increases with degradation
-                baseline_temp = self.machines[machine_id].sensors['temperature'].baseline
-                temp_increase = progress * 20  # Up to 20°C increase at failure
-                reading['sensors']['temperature'] = round(baseline_temp + temp_increase, 1)
-                
-                # Pressure decreases with degradation (for pumps)
-                baseline_pressure = self.machines[machine_id].sensors['pressure'].baseline
-                if baseline_pressure > 0:
-                    pressure_drop = progress * 30  # Up to 30 PSI drop at failure
-                    reading['sensors']['pressure'] = round(baseline_pressure - pressure_drop, 1)
-            else:
-                # Synthetic degradation fallback
-                degradation_factor = 1 + progress * 1.5
-                for sensor_name in ['vibration_x', 'vibration_y']:
-                    reading['sensors'][sensor_name] = round(
-                        reading['sensors'][sensor_name] * degradation_factor, 3
-                    )
-            
-            # Update health state based on progress
-            if progress < 0.3:
-                reading['health_state'] = 'healthy'
-            elif progress < 0.6:
-                reading['health_state'] = 'degrading'
-            elif progress < 0.85:
-                reading['health_state'] = 'pre_failure'
-            else:
-                reading['health_state'] = 'failure'
-            
-            reading['degradation_factor'] = 1 + progress * 1.5
-            reading['degradation_progress'] = round(progress, 3)
-            return reading
-        
-        # ==================== MANUAL MODE ====================
-        elif mode == 'MANUAL':
-            # Apply manual override if set
-            if machine_id in self.manual_override:
-                override = self.manual_override[machine_id]
-                reading['sensors'].update(override)
-                reading['manual_override'] = True
-            return reading
+        read_mode = self._mode_readers.get(mode)
+        if read_mode is not None:
+            return read_mode(machine_id, reading, now)
         
         # ==================== LEGACY DEMO MODE ====================
         # Check for active scenario (backward compatibility)
         if self.demo_mode_active.get(machine_id, False):
-            from demo_scenarios import get_scenario_player
             player = get_scenario_player()
             scenario_reading = player.get_current_reading(machine_id)
             if scenario_reading:
@@ -390,30 +521,110 @@ class FleetSimulator:
         
         # ==================== APPLY STRESS SCENARIOS ====================
         # Inject stress BEFORE returning readings (affects ML & Alerts)
-        if hasattr(self, 'stress_engine'):
-            # Apply stress to sensor readings
-            stressed_sensors = self.stress_engine.apply_stress(machine_id, reading['sensors'])
-            reading['sensors'] = stressed_sensors
-            
-            # Check if active scenario exists
-            scenario = self.stress_engine.get_scenario(machine_id)
-            if scenario:
-                reading['active_scenario'] = scenario.to_dict()
+        stress_now = time.monotonic()  # scenario clock, read once for this reading
+        scenario = self.stress_engine.get_scenario(machine_id, stress_now)
+        if scenario:
+            reading['sensors'] = self.stress_engine.apply_scenario(scenario, reading['sensors'], stress_now)
+            reading['active_scenario'] = scenario.to_dict(stress_now)
         
         return reading
+    
+    # ==================== NORMAL MODE ====================
+    def _read_normal(self, machine_id: str, reading: Dict, now: datetime) -> Dict:
+        """NORMAL mode: stable baseline with configurable noise"""
+        noise_level = self.noise_levels.get(machine_id, 0.02)
+        
+        # Apply slight noise to sensors (but keep them stable), one draw for
+        # all of them; rounded_value holds the reading's sensors in order
+        base = self.machines[machine_id].rounded_value
+        noise = _RNG.standard_normal(len(SENSOR_NAMES)) * (noise_level * np.abs(base))
+        values = np.round(base + noise, 3)
+        reading['sensors'] = dict(zip(SENSOR_NAMES, values.tolist()))
+        
+        # Force healthy state for NORMAL mode
+        reading['health_state'] = 'healthy'
+        reading['degradation_factor'] = 1.0
+        return reading
+    
+    # ==================== FAILING MODE (NASA DATA) ====================
+    def _read_failing(self, machine_id: str, reading: Dict, now: datetime) -> Dict:
+        """FAILING mode: progressive degradation along the NASA IMS run-to-failure data"""
+        # Initialize start time if not set
+        if self.degradation_start_time.get(machine_id) is None:
+            self.degradation_start_time[machine_id] = now
+        
+        # Calculate degradation progress based on elapsed time
+        elapsed = (now - self.degradation_start_time[machine_id]).total_seconds()
+        
+        # Get degradation rate (custom if set, otherwise from config)
+        degradation_rate = self.custom_degradation_rates.get(machine_id, self.default_degradation_rate)
+        
+        # Update progress (capped at 1.0)
+        self.degradation_progress[machine_id] = min(1.0, elapsed * degradation_rate)
+        progress = self.degradation_progress[machine_id]
+        
+        # Get NASA features for current progress
+        if self.nasa_loader:
+            nasa_features = self.nasa_loader.get_degradation_features(progress)
+        else:
+            nasa_features = None
+        
+        # Apply NASA degradation to sensors
+        if nasa_features:
+            # Map NASA features to sensor readings (baselines in SENSOR_NAMES order)
+            sensors = reading['sensors']
+            baseline_vib, _, baseline_temp, baseline_pressure, _ = self.machines[machine_id].baseline.tolist()
+            
+            # RMS → vibration (normalized to baseline)
+            rms_ratio = nasa_features['rms'] / 0.13  # Normalize to healthy baseline
+            vibration = baseline_vib * rms_ratio
+            sensors['vibration_x'] = round(vibration, 3)
+            sensors['vibration_y'] = round(vibration * 1.1, 3)
+            
+            # Temperature increases with degradation
+            temp_increase = progress * 20  # Up to 20°C increase at failure
+            sensors['temperature'] = round(baseline_temp + temp_increase, 1)
+            
+            # Pressure decreases with degradation (for pumps)
+            if baseline_pressure > 0:
+                pressure_drop = progress * 30  # Up to 30 PSI drop at failure
+                sensors['pressure'] = round(baseline_pressure - pressure_drop, 1)
+        else:
+            # Synthetic degradation fallback
+            degradation_factor = 1 + progress * 1.5
+            for sensor_name in ['vibration_x', 'vibration_y']:
+                reading['sensors'][sensor_name] = round(
+                    reading['sensors'][sensor_name] * degradation_factor, 3
+                )
+        
+        # Update health state based on progress
+        reading['health_state'] = FAILING_HEALTH_STATES[
+            bisect_right(FAILING_PROGRESS_THRESHOLDS, progress)
+        ]
+        
+        reading['degradation_factor'] = 1 + progress * 1.5
+        reading['degradation_progress'] = round(progress, 3)
+        return reading
+    
+    # ==================== MANUAL MODE ====================
+    def _read_manual(self, machine_id: str, reading: Dict, now: datetime) -> Dict:
+        """MANUAL mode: operator-set sensor values replace the simulated ones"""
+        # Apply manual override if set
+        if machine_id in self.manual_override:
+            override = self.manual_override[machine_id]
+            reading['sensors'].update(override)
+            reading['manual_override'] = True
+        return reading
 
     def start_stress_scenario(self, machine_id: str, scenario_type: str, severity: float = 0.5, duration_sec: int = 120):
         """Start a stress scenario on a machine."""
-        if hasattr(self, 'stress_engine'):
-            return self.stress_engine.start_scenario(machine_id, scenario_type, severity, duration_sec)
-        return {"error": "Stress engine not initialized"}
+        return self.stress_engine.start_scenario(machine_id, scenario_type, severity, duration_sec)
 
     def stop_stress_scenario(self, machine_id: str):
         """Stop any active stress scenario on a machine."""
-        if hasattr(self, 'stress_engine'):
-            return self.stress_engine.stop_scenario(machine_id)
-        return {"error": "Stress engine not initialized"}
+        return self.stress_engine.stop_scenario(machine_id)
 
+    @_fleet_locked
     def reset_failing_mode(self, machine_id: str) -> bool:
         """Reset FAILING mode machine to start degradation from beginning."""
         if machine_id in self.degradation_progress:
@@ -432,8 +643,6 @@ class FleetSimulator:
         """Set degradation rate for a machine (for testing/demo)."""
         if machine_id in self.machines:
             # Store custom rate (used by get_machine_reading)
-            if not hasattr(self, 'custom_degradation_rates'):
-                self.custom_degradation_rates = {}
             self.custom_degradation_rates[machine_id] = rate
             logger.info(f"✓ Set degradation rate for {machine_id}: {rate}")
             return True
@@ -441,15 +650,14 @@ class FleetSimulator:
     
     def start_demo_scenario(self, machine_id: str, scenario_id: str = 'BFP-A1-FAILURE', speed: float = 1.0):
         """Start a failure scenario for demo machine (usually M-002)"""
-        from demo_scenarios import get_scenario_player
         player = get_scenario_player()
         self.demo_mode_active[machine_id] = True
         result = player.start_scenario(machine_id, scenario_id, speed)
         return result
     
+    @_fleet_locked
     def stop_demo_scenario(self, machine_id: str):
         """Stop demo scenario and return to simulation mode"""
-        from demo_scenarios import get_scenario_player
         player = get_scenario_player()
         result = player.stop_scenario(machine_id)
         self.demo_mode_active[machine_id] = False
@@ -465,6 +673,7 @@ class FleetSimulator:
         """Check if demo scenario is active for machine"""
         return self.demo_mode_active.get(machine_id, False)
     
+    @_fleet_locked
     def perform_maintenance(self, machine_id: str):
         """Perform maintenance on a specific machine"""
         if machine_id in self.machines:
@@ -16,9 +16,10 @@ Stress is injected at sensor level to preserve metric validity.
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from enum import Enum
 import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,51 +34,97 @@ class ScenarioType(Enum):
     RUNAWAY_FAILURE = "RUNAWAY_FAILURE"
 
 
+# Scenario type by its (upper-case) API name
+SCENARIO_TYPES_BY_NAME: Dict[str, ScenarioType] = {t.value: t for t in ScenarioType}
+
+# Severity-only terms of each scenario's sensor formulas (fixed for a
+# scenario's lifetime, so computed once when it is created)
+_SCENARIO_COEFFICIENTS = {
+    ScenarioType.LOAD_SPIKE: lambda s: (1 + 0.5 * s, 1 + 0.3 * s),      # vib_mul, rpm_mul
+    ScenarioType.LUBRICATION_LOSS: lambda s: (0.3 * s, 10 * s),         # vib_add, temp_add
+    ScenarioType.COOLING_FAILURE: lambda s: (15 * s,),                  # temp_add
+    ScenarioType.RUNAWAY_FAILURE: lambda s: (2 * s, 20 * s, 0.3 * s),   # accel, temp, pressure rates
+}
+
+
 @dataclass
 class StressScenario:
     """Active stress scenario configuration."""
     scenario_type: ScenarioType = ScenarioType.NONE
     severity: float = 0.0  # 0.0 - 1.0 (continuous, not binary)
     duration_sec: int = 0
-    start_time: Optional[datetime] = None
+    start_time: Optional[datetime] = None  # wall-clock start
+    start_monotonic: Optional[float] = None  # time.monotonic() at start, for elapsed time
     machine_id: str = ""
     is_demo_tagged: bool = True  # Excluded from baseline metrics
+    coefficients: Tuple[float, ...] = field(default=(), init=False, repr=False)
+    
+    def __post_init__(self):
+        coefficients = _SCENARIO_COEFFICIENTS.get(self.scenario_type)
+        if coefficients is not None:
+            self.coefficients = coefficients(self.severity)
     
     @property
     def is_active(self) -> bool:
         """Check if scenario is currently active."""
-        if self.scenario_type == ScenarioType.NONE:
-            return False
-        if self.start_time is None:
-            return False
-        elapsed = (datetime.now() - self.start_time).total_seconds()
-        return elapsed < self.duration_sec
+        return self.is_active_at(time.monotonic())
     
     @property
     def progress(self) -> float:
         """Progress through scenario (0.0 - 1.0)."""
-        if not self.is_active:
-            return 0.0
-        elapsed = (datetime.now() - self.start_time).total_seconds()
-        return min(1.0, elapsed / self.duration_sec) if self.duration_sec > 0 else 1.0
+        return self.progress_at(time.monotonic())
     
     @property
     def remaining_sec(self) -> float:
         """Seconds remaining in scenario."""
-        if not self.is_active:
+        return self.remaining_sec_at(time.monotonic())
+    
+    # The *_at variants take a time.monotonic() reading from the caller, so
+    # one clock read serves every check made while handling a reading, and
+    # elapsed time is float math unaffected by wall-clock adjustments
+    def is_active_at(self, now: float) -> bool:
+        """Check if scenario is active at the given time."""
+        return self._elapsed_at(now) is not None
+    
+    def progress_at(self, now: float) -> float:
+        """Progress through scenario (0.0 - 1.0) at the given time."""
+        return self._progress(self._elapsed_at(now))
+    
+    def remaining_sec_at(self, now: float) -> float:
+        """Seconds remaining in scenario at the given time."""
+        return self._remaining_sec(self._elapsed_at(now))
+    
+    def _elapsed_at(self, now: float) -> Optional[float]:
+        """Seconds since start if the scenario is active at now, else None."""
+        if self.scenario_type is ScenarioType.NONE:
+            return None
+        if self.start_monotonic is None:
+            return None
+        elapsed = now - self.start_monotonic
+        return elapsed if elapsed < self.duration_sec else None
+    
+    def _progress(self, elapsed: Optional[float]) -> float:
+        if elapsed is None:
+            return 0.0
+        return min(1.0, elapsed / self.duration_sec) if self.duration_sec > 0 else 1.0
+    
+    def _remaining_sec(self, elapsed: Optional[float]) -> float:
+        if elapsed is None:
             return 0
-        elapsed = (datetime.now() - self.start_time).total_seconds()
         return max(0, self.duration_sec - elapsed)
     
-    def to_dict(self) -> Dict:
-        """Convert to API-friendly dictionary."""
+    def to_dict(self, now: Optional[float] = None) -> Dict:
+        """Convert to API-friendly dictionary (state as of now, default: current time)."""
+        if now is None:
+            now = time.monotonic()
+        elapsed = self._elapsed_at(now)  # one activity check for all three fields
         return {
             "type": self.scenario_type.value,
             "severity": self.severity,
             "duration_sec": self.duration_sec,
-            "remaining_sec": round(self.remaining_sec, 1),
-            "progress": round(self.progress, 3),
-            "is_active": self.is_active,
+            "remaining_sec": round(self._remaining_sec(elapsed), 1),
+            "progress": round(self._progress(elapsed), 3),
+            "is_active": elapsed is not None,
             "machine_id": self.machine_id,
             "is_demo_tagged": self.is_demo_tagged
         }
@@ -92,12 +139,24 @@ class StressScenarioEngine:
     """
     
     def __init__(self):
-        self._lock = threading.RLock()
+        # Both dicts are copy-on-write snapshots: writers build a new dict
+        # under the lock and swap the reference, readers (every sensor
+        # reading) just dereference the current one without locking
+        self._lock = threading.Lock()  # writers only, never re-entered
         self._active_scenarios: Dict[str, StressScenario] = {}
         
         # Drift bias for SENSOR_DRIFT (persists during scenario)
         self._drift_bias: Dict[str, float] = {}
         
+        # Sensor transform per scenario type (NONE has none)
+        self._handlers = {
+            ScenarioType.LOAD_SPIKE: self._apply_load_spike,
+            ScenarioType.LUBRICATION_LOSS: self._apply_lubrication_loss,
+            ScenarioType.COOLING_FAILURE: self._apply_cooling_failure,
+            ScenarioType.SENSOR_DRIFT: self._apply_sensor_drift,
+            ScenarioType.RUNAWAY_FAILURE: self._apply_runaway_failure,
+        }
+        
         logger.info("✓ Stress Scenario Engine initialized")
     
     def start_scenario(
@@ -118,9 +177,8 @@ class StressScenarioEngine:
         """
         with self._lock:
             # Parse scenario type
-            try:
-                stype = ScenarioType(scenario_type.upper())
-            except ValueError:
+            stype = SCENARIO_TYPES_BY_NAME.get(scenario_type.upper())
+            if stype is None:
                 return {"error": f"Unknown scenario type: {scenario_type}"}
             
             # Validate severity
@@ -132,16 +190,17 @@ class StressScenarioEngine:
                 severity=severity,
                 duration_sec=duration_sec,
                 start_time=datetime.now(),
+                start_monotonic=time.monotonic(),
                 machine_id=machine_id,
                 is_demo_tagged=True
             )
             
-            self._active_scenarios[machine_id] = scenario
-            
-            # Initialize drift bias for sensor drift
-            if stype == ScenarioType.SENSOR_DRIFT:
+            # Initialize drift bias for sensor drift (before the scenario is visible)
+            if stype is ScenarioType.SENSOR_DRIFT:
                 import random
-                self._drift_bias[machine_id] = random.uniform(-0.1, 0.1)
+                self._drift_bias = {**self._drift_bias, machine_id: random.uniform(-0.1, 0.1)}
+            
+            self._active_scenarios = {**self._active_scenarios, machine_id: scenario}
             
             logger.info(f"✓ Started {stype.value} on {machine_id} (severity={severity}, duration={duration_sec}s)")
             
@@ -155,44 +214,53 @@ class StressScenarioEngine:
         with self._lock:
             if machine_id in self._active_scenarios:
                 scenario = self._active_scenarios[machine_id]
-                del self._active_scenarios[machine_id]
-                
-                # Clear drift bias
-                if machine_id in self._drift_bias:
-                    del self._drift_bias[machine_id]
+                self._remove(machine_id)
                 
                 logger.info(f"✓ Stopped scenario on {machine_id}")
                 return {"success": True, "stopped": scenario.to_dict()}
             
             return {"success": False, "error": "No active scenario"}
     
-    def get_scenario(self, machine_id: str) -> Optional[StressScenario]:
-        """Get active scenario for a machine (if any)."""
-        with self._lock:
-            scenario = self._active_scenarios.get(machine_id)
-            if scenario and not scenario.is_active:
-                # Scenario expired
-                del self._active_scenarios[machine_id]
-                return None
-            return scenario
+    def get_scenario(self, machine_id: str, now: Optional[float] = None) -> Optional[StressScenario]:
+        """Get active scenario for a machine (if any) as of now (time.monotonic(), default: current)."""
+        scenario = self._active_scenarios.get(machine_id)
+        if scenario is None:
+            return None
+        if now is None:
+            now = time.monotonic()
+        if not scenario.is_active_at(now):
+            # Scenario expired
+            self._expire(machine_id, scenario)
+            return None
+        return scenario
     
     def get_all_active(self) -> Dict[str, Dict]:
         """Get all active scenarios."""
+        now = time.monotonic()  # one clock reading for the whole sweep
+        result = {}
+        for mid, scenario in self._active_scenarios.items():
+            if scenario.is_active_at(now):
+                result[mid] = scenario.to_dict(now)
+            else:
+                # Clean up expired
+                self._expire(mid, scenario)
+        return result
+    
+    def _expire(self, machine_id: str, scenario: StressScenario):
+        """Remove an expired scenario, unless a new one has replaced it meanwhile."""
         with self._lock:
-            result = {}
-            expired = []
-            
-            for mid, scenario in self._active_scenarios.items():
-                if scenario.is_active:
-                    result[mid] = scenario.to_dict()
-                else:
-                    expired.append(mid)
-            
-            # Clean up expired
-            for mid in expired:
-                del self._active_scenarios[mid]
-            
-            return result
+            if self._active_scenarios.get(machine_id) is scenario:
+                self._remove(machine_id)
+    
+    def _remove(self, machine_id: str):
+        """Publish snapshots without the machine's scenario and drift bias (hold the lock)."""
+        self._active_scenarios = {
+            mid: s for mid, s in self._active_scenarios.items() if mid != machine_id
+        }
+        if machine_id in self._drift_bias:
+            self._drift_bias = {
+                mid: bias for mid, bias in self._drift_bias.items() if mid != machine_id
+            }
     
     def apply_stress(self, machine_id: str, sensor_state: Dict) -> Dict:
         """
@@ -207,60 +275,88 @@ class StressScenarioEngine:
         Returns:
             Modified sensor_state with stress applied
         """
-        scenario = self.get_scenario(machine_id)
-        if not scenario or not scenario.is_active:
+        now = time.monotonic()
+        scenario = self.get_scenario(machine_id, now)
+        if not scenario:
             return sensor_state
+        return self.apply_scenario(scenario, sensor_state, now)
+    
+    def apply_scenario(self, scenario: StressScenario, sensor_state: Dict,
+                       now: Optional[float] = None) -> Dict:
+        """
+        Apply an active scenario (from get_scenario) to sensor readings as of
+        now (time.monotonic(), default: current time).
         
+        Lets callers that also report the scenario look it up only once.
+        """
         # Copy to avoid mutating original
         stressed = sensor_state.copy()
         severity = scenario.severity
         stype = scenario.scenario_type
         
-        # ==================== LOAD_SPIKE ====================
-        if stype == ScenarioType.LOAD_SPIKE:
-            # Sudden high load → increased vibration and RPM
-            stressed['vibration_x'] = stressed.get('vibration_x', 0.5) * (1 + 0.5 * severity)
-            stressed['vibration_y'] = stressed.get('vibration_y', 0.5) * (1 + 0.5 * severity)
-            stressed['rpm'] = stressed.get('rpm', 1500) * (1 + 0.3 * severity)
-        
-        # ==================== LUBRICATION_LOSS ====================
-        elif stype == ScenarioType.LUBRICATION_LOSS:
-            # Accelerated wear → vibration increase + temp rise
-            stressed['vibration_x'] = stressed.get('vibration_x', 0.5) + 0.3 * severity
-            stressed['vibration_y'] = stressed.get('vibration_y', 0.5) + 0.3 * severity
-            stressed['temperature'] = stressed.get('temperature', 70) + 10 * severity
-        
-        # ==================== COOLING_FAILURE ====================
-        elif stype == ScenarioType.COOLING_FAILURE:
-            # Temperature rise only
-            stressed['temperature'] = stressed.get('temperature', 70) + 15 * severity
-        
-        # ==================== SENSOR_DRIFT ====================
-        elif stype == ScenarioType.SENSOR_DRIFT:
-            # Gradual sensor bias
-            drift = self._drift_bias.get(machine_id, 0.05)
-            stressed['vibration_x'] = stressed.get('vibration_x', 0.5) + drift * severity
-            stressed['vibration_y'] = stressed.get('vibration_y', 0.5) + drift * severity * 0.8
-        
-        # ==================== RUNAWAY_FAILURE (WOW MOMENT) ====================
-        elif stype == ScenarioType.RUNAWAY_FAILURE:
-            # Rapid degradation - all parameters degrade fast
-            progress = scenario.progress  # Use progress for acceleration
-            accel = 1 + 2 * severity * progress  # Accelerating factor
-            
-            stressed['vibration_x'] = stressed.get('vibration_x', 0.5) * accel
-            stressed['vibration_y'] = stressed.get('vibration_y', 0.5) * accel
-            stressed['temperature'] = stressed.get('temperature', 70) + 20 * severity * progress
-            
-            # Pressure drops
-            if stressed.get('pressure', 0) > 0:
-                stressed['pressure'] = stressed.get('pressure', 100) * (1 - 0.3 * severity * progress)
+        handler = self._handlers.get(stype)
+        if handler is not None:
+            handler(stressed, severity, scenario, now)
         
         # Mark as stressed
         stressed['_stress_scenario'] = stype.value
         stressed['_stress_severity'] = severity
         
         return stressed
+    
+    # Scenario transforms: update the copied sensor dict in place
+    
+    # ==================== LOAD_SPIKE ====================
+    def _apply_load_spike(self, stressed: Dict, severity: float,
+                          scenario: StressScenario, now: Optional[float]):
+        """Sudden high load → increased vibration and RPM"""
+        vib_mul, rpm_mul = scenario.coefficients
+        stressed['vibration_x'] = stressed.get('vibration_x', 0.5) * vib_mul
+        stressed['vibration_y'] = stressed.get('vibration_y', 0.5) * vib_mul
+        stressed['rpm'] = stressed.get('rpm', 1500) * rpm_mul
+    
+    # ==================== LUBRICATION_LOSS ====================
+    def _apply_lubrication_loss(self, stressed: Dict, severity: float,
+                                scenario: StressScenario, now: Optional[float]):
+        """Accelerated wear → vibration increase + temp rise"""
+        vib_add, temp_add = scenario.coefficients
+        stressed['vibration_x'] = stressed.get('vibration_x', 0.5) + vib_add
+        stressed['vibration_y'] = stressed.get('vibration_y', 0.5) + vib_add
+        stressed['temperature'] = stressed.get('temperature', 70) + temp_add
+    
+    # ==================== COOLING_FAILURE ====================
+    def _apply_cooling_failure(self, stressed: Dict, severity: float,
+                               scenario: StressScenario, now: Optional[float]):
+        """Temperature rise only"""
+        temp_add, = scenario.coefficients
+        stressed['temperature'] = stressed.get('temperature', 70) + temp_add
+    
+    # ==================== SENSOR_DRIFT ====================
+    def _apply_sensor_drift(self, stressed: Dict, severity: float,
+                            scenario: StressScenario, now: Optional[float]):
+        """Gradual sensor bias"""
+        drift = self._drift_bias.get(scenario.machine_id, 0.05)
+        stressed['vibration_x'] = stressed.get('vibration_x', 0.5) + drift * severity
+        stressed['vibration_y'] = stressed.get('vibration_y', 0.5) + drift * severity * 0.8
+    
+    # ==================== RUNAWAY_FAILURE (WOW MOMENT) ====================
+    def _apply_runaway_failure(self, stressed: Dict, severity: float,
+                               scenario: StressScenario, now: Optional[float]):
+        """Rapid degradation - all parameters degrade fast"""
+        if now is None:
+            now = time.monotonic()
+        progress = scenario.progress_at(now)  # Use progress for acceleration
+        accel_rate, temp_rate, pressure_rate = scenario.coefficients
+        accel = 1 + accel_rate * progress  # Accelerating factor
+        
+        stressed['vibration_x'] = stressed.get('vibration_x', 0.5) * accel
+        stressed['vibration_y'] = stressed.get('vibration_y', 0.5) * accel
+        stressed['temperature'] = stressed.get('temperature', 70) + temp_rate * progress
+        
+        # Pressure drops (only a present, positive pressure; read it once)
+        pressure = stressed.get('pressure', 0)
+        if pressure > 0:
+            stressed['pressure'] = pressure * (1 - pressure_rate * progress)
 
 
 # Global singleton
@@ -0,0 +1,121 @@
+"""
+Regression tests: the SQL chart downsampling against the original
+slice-in-Python version of /api/sensor-history, and the background sensor
+history writer's shutdown flush.
+"""
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from database import Database
+
+
+def reference_downsample(db, machine_id, hours, limit):
+    """The original /api/sensor-history thinning and chart formatting"""
+    history = db.get_sensor_history(machine_id, hours=hours)
+    if len(history) > limit:
+        step = len(history) // limit
+        history = history[::step][:limit]
+    return [
+        (
+            reading['timestamp'],
+            reading.get('temperature'),
+            (reading.get('vibration_x', 0) + reading.get('vibration_y', 0)) / 2,
+            reading.get('pressure'),
+            reading.get('rpm'),
+            reading.get('health_score'),
+            reading.get('rul_hours'),
+        )
+        for reading in history
+    ]
+
+
+class DownsampleRegressionTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.db = Database(db_path=os.path.join(cls.tmpdir, "test.db"))
+
+        rng = random.Random(5)
+        now = datetime.now()
+        rows = []
+        # One reading every 10 s for the last ~3 h per machine, plus stale
+        # readings outside any window and readings for other machines
+        for machine_id, count in (("M1", 1000), ("M2", 7), ("M3", 241)):
+            for i in range(count):
+                timestamp = (now - timedelta(seconds=10 * i + 5)).isoformat()
+                rows.append(Database._sensor_row(machine_id, {
+                    "vibration_x": round(rng.uniform(0.5, 5), 3),
+                    "vibration_y": round(rng.uniform(0.5, 5), 3),
+                    "temperature": round(rng.uniform(40, 90), 1),
+                    "pressure": round(rng.uniform(0, 150), 1),
+                    "rpm": float(rng.randint(1000, 3000)),
+                    "health_score": round(rng.uniform(0, 100), 1),
+                    "rul_hours": round(rng.uniform(0, 500), 1),
+                }, timestamp))
+            rows.append(Database._sensor_row(
+                machine_id, {"vibration_x": 1.0, "vibration_y": 1.0},
+                (now - timedelta(days=3)).isoformat()
+            ))
+        rng.shuffle(rows)
+
+        with cls.db.get_connection() as conn:
+            conn.executemany(Database._SENSOR_INSERT, rows)
+            conn.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+
+    def test_matches_reference(self):
+        for machine_id in ("M1", "M2", "M3"):
+            for hours in (1, 2, 24):
+                for limit in (1, 7, 60, 61, 240, 241, 1000, 5000):
+                    with self.subTest(machine_id=machine_id, hours=hours, limit=limit):
+                        self.assertEqual(
+                            [tuple(row) for row in self.db.get_sensor_history_downsampled(machine_id, hours, limit)],
+                            reference_downsample(self.db, machine_id, hours, limit)
+                        )
+
+    def test_unknown_machine_is_empty(self):
+        self.assertEqual(self.db.get_sensor_history_downsampled("NOPE", 1, 60), [])
+
+
+class SensorWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = Database(db_path=os.path.join(self.tmpdir, "test.db"))
+
+    def tearDown(self):
+        self.db._stop_sensor_writer()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def count_rows(self):
+        with self.db.get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sensor_history").fetchone()[0]
+
+    def test_stop_flushes_queued_readings(self):
+        for i in range(500):
+            self.assertTrue(self.db.queue_sensor_reading("M-001", {"temperature": float(i)}))
+        self.db._stop_sensor_writer()
+        self.assertFalse(self.db._sensor_writer.is_alive())
+        self.assertEqual(self.count_rows(), 500)
+        self.assertEqual(self.db.dropped_sensor_readings, 0)
+
+    def test_write_failure_is_logged_and_counted(self):
+        self.db._SENSOR_INSERT = "INSERT INTO no_such_table VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        with self.assertLogs("database", "ERROR") as logs:
+            for _ in range(3):
+                self.db.queue_sensor_reading("M-001", {"temperature": 70.0})
+            self.db._stop_sensor_writer()
+        self.assertEqual(self.db.dropped_sensor_readings, 3)
+        self.assertIn("3 in total", "\n".join(logs.output))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Regression tests: the struct-of-arrays stabilizer (scalar and batch paths)
+against the original per-machine history implementation.
+"""
+import unittest
+
+import numpy as np
+
+from config import Config
+from ml_stabilizer import StabilizedRULPredictor
+
+
+class ReferenceStabilizer:
+    """The original StabilizedRULPredictor smoothing, without rate limiting"""
+
+    def __init__(self):
+        self.history = {}
+
+    def stabilize(self, machine_id, raw_rul, raw_health):
+        history = self.history.setdefault(machine_id, [])
+        if not history:
+            history.append((raw_rul, raw_health))
+            return raw_rul, raw_health
+
+        prev_rul, prev_health = history[-1]
+        alpha = Config.EMA_ALPHA
+        ema_rul = alpha * raw_rul + (1 - alpha) * prev_rul
+        ema_health = alpha * raw_health + (1 - alpha) * prev_health
+
+        stable_rul = min(ema_rul, prev_rul)
+        stable_health = prev_health if ema_health > prev_health * 1.05 else ema_health
+
+        stable_rul = max(Config.MIN_RUL_HOURS, min(stable_rul, Config.MAX_RUL_HOURS))
+        stable_health = max(0.0, min(100.0, stable_health))
+
+        history.append((stable_rul, stable_health))
+        return round(stable_rul, 1), round(stable_health, 2)
+
+    def reset(self, machine_id):
+        self.history.pop(machine_id, None)
+
+
+class ScriptedPredictor:
+    """Raw predictor returning a fixed (rul, health) per machine, set by the test"""
+
+    def __init__(self):
+        self.next = {}
+
+    def predict_rul(self, sensor_data, machine_id):
+        return self.next[machine_id]
+
+    def predict_rul_batch(self, sensor_arr):
+        rows = [self.next[mid] for mid in self.batch_ids]
+        return np.array([r for r, _ in rows]), np.array([h for _, h in rows])
+
+
+def raw_sequence(rng, steps):
+    """Noisy, mostly falling raw predictions with occasional jumps back up"""
+    rul = 144.0 - np.cumsum(rng.uniform(-3.0, 6.0, steps))
+    health = 100.0 - np.cumsum(rng.uniform(-2.0, 4.0, steps))
+    return [(round(float(r), 1), round(float(h), 2)) for r, h in zip(rul, health)]
+
+
+class StabilizerRegressionTest(unittest.TestCase):
+
+    def make_stabilizer(self):
+        stabilizer = StabilizedRULPredictor()
+        stabilizer.raw_predictor = ScriptedPredictor()
+        stabilizer.min_interval_s = 0.0  # every call is a fresh prediction
+        return stabilizer
+
+    def test_scalar_path_matches_reference(self):
+        rng = np.random.default_rng(7)
+        stabilizer, reference = self.make_stabilizer(), ReferenceStabilizer()
+        # More machines than INITIAL_CAPACITY, so the state arrays grow
+        machine_ids = [f"M-{i:03d}" for i in range(40)]
+        sequences = {mid: raw_sequence(rng, 60) for mid in machine_ids}
+
+        for step in range(60):
+            for mid in machine_ids:
+                stabilizer.raw_predictor.next[mid] = sequences[mid][step]
+                expected = reference.stabilize(mid, *sequences[mid][step])
+                self.assertEqual(stabilizer.predict_rul({}, mid), expected, (mid, step))
+            if step == 30:
+                stabilizer.reset_machine("M-005")
+                reference.reset("M-005")
+
+    def test_batch_path_matches_reference(self):
+        rng = np.random.default_rng(11)
+        stabilizer, reference = self.make_stabilizer(), ReferenceStabilizer()
+        machine_ids = [f"M-{i:03d}" for i in range(20)]
+        sequences = {mid: raw_sequence(rng, 40) for mid in machine_ids}
+        stabilizer.raw_predictor.batch_ids = machine_ids
+        sensor_arr = np.zeros((len(machine_ids), 4))
+
+        for step in range(40):
+            for mid in machine_ids:
+                stabilizer.raw_predictor.next[mid] = sequences[mid][step]
+            actual = stabilizer.predict_rul_batch([{}] * len(machine_ids), machine_ids, sensor_arr)
+            expected = [reference.stabilize(mid, *sequences[mid][step]) for mid in machine_ids]
+            self.assertEqual(actual, expected, step)
+
+    def test_rul_never_increases(self):
+        stabilizer = self.make_stabilizer()
+        previous = None
+        for raw in raw_sequence(np.random.default_rng(3), 200):
+            stabilizer.raw_predictor.next["M-001"] = raw
+            rul, _ = stabilizer.predict_rul({}, "M-001")
+            if previous is not None:
+                self.assertLessEqual(rul, previous)
+            previous = rul
+
+    def test_bypass_returns_raw_and_restarts_smoothing(self):
+        stabilizer = self.make_stabilizer()
+        stabilizer.raw_predictor.next["M-001"] = (100.0, 80.0)
+        stabilizer.predict_rul({}, "M-001")
+        stabilizer.raw_predictor.next["M-001"] = (130.0, 95.0)
+        self.assertEqual(stabilizer.predict_rul({}, "M-001", bypass_smoothing=True), (130.0, 95.0))
+        # The next smoothed prediction starts from scratch, as after a reset
+        self.assertEqual(stabilizer.predict_rul({}, "M-001"), (130.0, 95.0))
+
+    def test_rate_limit_returns_last_stable_prediction(self):
+        stabilizer = self.make_stabilizer()
+        stabilizer.min_interval_s = 3600.0
+        stabilizer.raw_predictor.next["M-001"] = (100.0, 80.0)
+        first = stabilizer.predict_rul({}, "M-001")
+        stabilizer.raw_predictor.next["M-001"] = (50.0, 40.0)
+        self.assertEqual(stabilizer.predict_rul({}, "M-001"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
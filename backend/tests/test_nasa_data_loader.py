@@ -0,0 +1,116 @@
+"""
+Regression tests: the pre-extracted NASA feature matrix against the original
+per-file feature extraction, and the per-file fallback while it is built.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+from scipy import stats as scipy_stats
+
+from nasa_data_loader import FEATURE_NAMES, NASADataLoader
+
+
+def reference_features(data):
+    """The original NASADataLoader._extract_features (float64 file parse)"""
+    rms = np.sqrt(np.mean(data**2))
+    peak = np.max(np.abs(data))
+    return {
+        "rms": float(rms),
+        "kurtosis": float(scipy_stats.kurtosis(data)),
+        "crest_factor": float(peak / rms if rms > 0 else 0),
+        "spectral_energy": float(np.sum(np.abs(np.fft.fft(data))**2) / len(data)),
+        "peak_to_peak": float(np.max(data) - np.min(data)),
+        "std_dev": float(np.std(data)),
+    }
+
+
+class FeatureMatrixTest(unittest.TestCase):
+
+    FILE_COUNT = 12
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.dataset = os.path.join(self.tmpdir, "1st_test")
+        os.makedirs(self.dataset)
+
+        rng = np.random.default_rng(2)
+        self.raw = []
+        for i in range(self.FILE_COUNT):
+            # IMS-like files: 8 tab-separated channels, 3 decimals, growing amplitude
+            data = np.round(rng.normal(-0.1, 0.05 * (1 + i), size=(512, 8)), 3)
+            np.savetxt(os.path.join(self.dataset, f"2003.11.{i:02d}.12.00.00"),
+                       data, delimiter="\t", fmt="%.3f")
+            self.raw.append(np.loadtxt(os.path.join(self.dataset, f"2003.11.{i:02d}.12.00.00"),
+                                       delimiter="\t"))
+
+        patcher = mock.patch.object(NASADataLoader, "FEATURE_CACHE_DIR", os.path.join(self.tmpdir, "cache"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def progress_of(self, index):
+        return index / (self.FILE_COUNT - 1)
+
+    def assert_features_match(self, loader):
+        for i in range(self.FILE_COUNT):
+            expected = reference_features(self.raw[i][:, loader.failed_bearing])
+            actual = loader.get_degradation_features(self.progress_of(i))
+            self.assertEqual(list(actual), list(FEATURE_NAMES))
+            for name in FEATURE_NAMES:
+                # Files are parsed as float32 and features stored as float32
+                self.assertAlmostEqual(actual[name], expected[name], delta=1e-4 * max(1.0, abs(expected[name])),
+                                       msg=f"file {i} {name}")
+
+    def test_matrix_matches_original_extraction(self):
+        loader = NASADataLoader(self.dataset)
+        self.assertTrue(loader.wait_for_features(30))
+        self.assertEqual(loader._features.shape, (self.FILE_COUNT, len(FEATURE_NAMES)))
+        self.assert_features_match(loader)
+
+    def test_cached_matrix_is_reused(self):
+        first = NASADataLoader(self.dataset)
+        self.assertTrue(first.wait_for_features(30))
+
+        with mock.patch("nasa_data_loader._compute_features_for_file") as compute:
+            second = NASADataLoader(self.dataset)
+            self.assertTrue(second.wait_for_features(30))
+        compute.assert_not_called()
+        np.testing.assert_array_equal(second._features, first._features)
+
+    def test_files_are_parsed_until_matrix_is_ready(self):
+        release = threading.Event()
+        build = NASADataLoader._build_feature_matrix
+
+        def blocked_build(loader):
+            release.wait(30)
+            return build(loader)
+
+        with mock.patch.object(NASADataLoader, "_build_feature_matrix", blocked_build):
+            loader = NASADataLoader(self.dataset)
+            try:
+                # Lookups neither block on nor wait for the background build
+                self.assertFalse(loader.wait_for_features(0))
+                self.assertIsNone(loader._features)
+                self.assert_features_match(loader)
+            finally:
+                release.set()
+            self.assertTrue(loader.wait_for_features(30))
+
+        self.assertIsNotNone(loader._features)
+        self.assert_features_match(loader)
+
+    def test_missing_dataset_uses_synthetic_features(self):
+        loader = NASADataLoader(os.path.join(self.tmpdir, "missing"))
+        self.assertTrue(loader.wait_for_features(0))
+        self.assertEqual(loader.get_degradation_features(0.5), loader._synthetic_degradation(0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
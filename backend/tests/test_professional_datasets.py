@@ -0,0 +1,180 @@
+"""
+Regression tests: the vectorized/numba dataset generator against the original
+per-sample scoring, failure curves and output format.
+"""
+import unittest
+
+import numpy as np
+
+from professional_datasets import (
+    EQUIPMENT_PROFILES, FAILURE_MODES, INSULATION_CLASSES, PHASES, VIBRATION_LIMITS,
+    export_dataset_for_training, generate_professional_dataset,
+    generate_professional_dataset_arrays, iter_professional_dataset,
+)
+
+
+def reference_health_score(sensors, profile, runtime_hours):
+    """The original calculate_health_score"""
+    score = 100.0
+    avg_vib = (sensors["vibration_x"] + sensors["vibration_y"]) / 2
+    vib = profile.vibration_x
+    if avg_vib >= vib.critical:
+        score -= 40
+    elif avg_vib >= vib.warning:
+        score -= 25 + 15 * (avg_vib - vib.warning) / (vib.critical - vib.warning)
+    else:
+        score -= 10 * avg_vib / vib.warning
+
+    temp = sensors["temperature"]
+    limits = profile.temperature
+    if temp >= limits.critical:
+        score -= 30
+    elif temp >= limits.warning:
+        score -= 18 + 12 * (temp - limits.warning) / (limits.critical - limits.warning)
+    else:
+        score -= 5 * temp / limits.warning
+
+    if profile.pressure.baseline > 0:
+        pressure = sensors["pressure"]
+        if pressure >= profile.pressure.critical or pressure <= profile.pressure.critical * 0.3:
+            score -= 20
+        elif pressure >= profile.pressure.warning or pressure <= profile.pressure.warning * 0.5:
+            score -= 12
+
+    if runtime_hours > profile.mtbf_hours * 0.7:
+        age_factor = (runtime_hours - profile.mtbf_hours * 0.7) / (profile.mtbf_hours * 0.3)
+        score -= min(10, 10 * age_factor)
+    return max(0, min(100, score))
+
+
+def reference_vibration_severity(vibration_rms, equipment_class):
+    """The original get_vibration_severity"""
+    for severity, (min_val, max_val) in VIBRATION_LIMITS[equipment_class].items():
+        if min_val <= vibration_rms < max_val:
+            return severity.value
+    return "Unacceptable"
+
+
+def reference_temperature_status(temperature, insulation_class):
+    """The original get_temperature_status"""
+    limits = INSULATION_CLASSES.get(insulation_class, INSULATION_CLASSES["F"])
+    if temperature >= limits["max_temp"]:
+        return "CRITICAL"
+    elif temperature >= limits["max_temp"] - 20:
+        return "WARNING"
+    elif temperature >= limits["max_temp"] - 40:
+        return "CAUTION"
+    return "NORMAL"
+
+
+def reference_phase(progress):
+    if progress < 0.3:
+        return "HEALTHY"
+    elif progress < 0.6:
+        return "DEGRADING"
+    elif progress < 0.85:
+        return "PRE_FAILURE"
+    return "FAILURE"
+
+
+def reference_curves(failure, progress):
+    """The original per-sample (vib_multiplier, temp_increase) of a failure mode"""
+    if failure.vibration_pattern == "GRADUAL":
+        vib_multiplier = 1 + (progress * 5)
+    elif failure.vibration_pattern == "HARMONIC":
+        vib_multiplier = 1 + (progress ** 2 * 8)
+    elif failure.vibration_pattern == "SPIKE":
+        vib_multiplier = 1 + (3 if progress > 0.8 else progress)
+    else:
+        vib_multiplier = 1 + (progress * 3)
+
+    if failure.temperature_pattern == "GRADUAL":
+        temp_increase = progress * 50
+    elif failure.temperature_pattern == "RISE":
+        temp_increase = progress ** 1.5 * 60
+    elif failure.temperature_pattern == "SPIKE":
+        temp_increase = 40 if progress > 0.85 else progress * 20
+    else:
+        temp_increase = progress * 25
+    return vib_multiplier, temp_increase
+
+
+class DatasetRegressionTest(unittest.TestCase):
+
+    def test_failure_curves_match_reference(self):
+        progress = np.arange(1000) / 1000
+        for name, failure in FAILURE_MODES.items():
+            expected = np.array([reference_curves(failure, p) for p in progress.tolist()])
+            np.testing.assert_allclose(failure._vib_fn(progress), expected[:, 0], rtol=1e-12, err_msg=name)
+            np.testing.assert_allclose(failure._temp_fn(progress), expected[:, 1], rtol=1e-12,
+                                       atol=1e-12, err_msg=name)
+
+    def test_derived_columns_match_reference(self):
+        interval = 5.0
+        for equipment_type, profile in EQUIPMENT_PROFILES.items():
+            for failure_mode in FAILURE_MODES:
+                samples = generate_professional_dataset(
+                    equipment_type, failure_mode, duration_hours=48,
+                    sample_interval_minutes=interval, seed=17
+                )
+                for i, sample in enumerate(samples):
+                    sensors = sample["sensors"]
+                    health = reference_health_score(sensors, profile, i * interval / 60)
+                    # The score column is float32: allow one unit in the last (rounded) place
+                    self.assertLessEqual(abs(sample["health_score"] - round(health, 1)), 0.1 + 1e-9)
+                    self.assertEqual(sample["phase"], reference_phase(i / len(samples)))
+                    self.assertEqual(
+                        sample["vibration_severity"],
+                        reference_vibration_severity((sensors["vibration_x"] + sensors["vibration_y"]) / 2,
+                                                     profile.equipment_class)
+                    )
+                    self.assertEqual(sample["temperature_status"],
+                                     reference_temperature_status(sensors["temperature"], profile.insulation_class))
+
+    def test_rows_keep_original_types(self):
+        samples = generate_professional_dataset("ID_FAN_MOTOR", "BEARING_INNER_RACE", 2, 5.0, seed=1)
+        self.assertEqual(samples[0]["timestamp_offset_minutes"], 0.0)
+        for sample in samples:
+            sensors = sample["sensors"]
+            self.assertEqual(list(sensors), ["vibration_x", "vibration_y", "temperature", "pressure", "rpm"])
+            self.assertIsInstance(sensors["rpm"], float)
+            self.assertEqual(sensors["rpm"], round(sensors["rpm"]))
+            # ID fans have no pressure sensor: the original generator emitted int 0
+            self.assertIs(type(sensors["pressure"]), int)
+            self.assertEqual(sensors["pressure"], 0)
+
+        pump = generate_professional_dataset("BOILER_FEED_PUMP", "BEARING_INNER_RACE", 2, 5.0, seed=1)
+        self.assertIsInstance(pump[0]["sensors"]["pressure"], float)
+
+    def test_seed_reproduces_dataset(self):
+        first = generate_professional_dataset_arrays("BOILER_FEED_PUMP", "CAVITATION", 24, 5.0, seed=3)
+        second = generate_professional_dataset_arrays("BOILER_FEED_PUMP", "CAVITATION", 24, 5.0, seed=3)
+        for name in ("vibration_x", "temperature", "pressure", "rpm", "health_score", "phase_id"):
+            np.testing.assert_array_equal(getattr(first, name), getattr(second, name))
+
+    def test_csv_matches_original_format(self):
+        for equipment_type in ("BOILER_FEED_PUMP", "ID_FAN_MOTOR"):
+            arrays = generate_professional_dataset_arrays(equipment_type, "BEARING_INNER_RACE", 4, 5.0, seed=8)
+            samples = list(iter_professional_dataset(arrays, equipment_type, 5.0))
+
+            # The original export_dataset_for_training CSV
+            lines = ["timestamp,vibration_x,vibration_y,temperature,pressure,rpm,health_score,phase"]
+            for sample in samples:
+                s = sample["sensors"]
+                lines.append(
+                    f"{sample['timestamp_offset_minutes']},{s['vibration_x']},{s['vibration_y']},"
+                    f"{s['temperature']},{s['pressure']},{s['rpm']},"
+                    f"{sample['health_score']},{sample['phase']}"
+                )
+            expected = "\n".join(lines)
+
+            self.assertEqual(export_dataset_for_training(samples, "csv"), expected)
+            self.assertEqual(export_dataset_for_training(arrays, "csv"), expected)
+
+    def test_phase_labels_cover_all_samples(self):
+        arrays = generate_professional_dataset_arrays("CRAC_CHILLER", "MOTOR_OVERHEATING", 72, 5.0, seed=4)
+        self.assertEqual(set(np.array(PHASES)[arrays.phase_id].tolist()), set(PHASES))
+
+
+if __name__ == "__main__":
+    unittest.main()
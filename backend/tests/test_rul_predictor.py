@@ -0,0 +1,171 @@
+"""
+Regression tests: the ramp-sum RUL heuristic (scalar, batch and float32 batch)
+against the original branch-per-segment implementation.
+"""
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from rul_predictor import RULPredictor, RISK_LEVELS, sensors_to_array
+
+
+def reference_heuristic(vib_x, vib_y, temp):
+    """The original RULPredictor._heuristic_rul (pressure never entered the score)"""
+    avg_vib = (vib_x + vib_y) / 2
+    if avg_vib <= 0.65:
+        vib_score = 100
+    elif avg_vib <= 1.2:
+        vib_score = 100 - ((avg_vib - 0.65) / 0.55) * 20
+    elif avg_vib <= 2.5:
+        vib_score = 80 - ((avg_vib - 1.2) / 1.3) * 50
+    else:
+        vib_score = max(0, 30 - ((avg_vib - 2.5) / 1.0) * 30)
+
+    if temp < 20:
+        if temp <= 7.5:
+            temp_score = 100
+        elif temp <= 10.0:
+            temp_score = 100 - ((temp - 7.5) / 2.5) * 30
+        elif temp <= 15.0:
+            temp_score = 70 - ((temp - 10.0) / 5.0) * 50
+        else:
+            temp_score = max(0, 20 - ((temp - 15.0) / 5.0) * 20)
+    elif temp > 60:
+        if temp <= 72:
+            temp_score = 100
+        elif temp <= 85:
+            temp_score = 100 - ((temp - 72) / 13) * 25
+        elif temp <= 95:
+            temp_score = 75 - ((temp - 85) / 10) * 45
+        else:
+            temp_score = max(0, 30 - ((temp - 95) / 10) * 30)
+    else:
+        if temp <= 52:
+            temp_score = 100
+        elif temp <= 70:
+            temp_score = 100 - ((temp - 52) / 18) * 25
+        elif temp <= 85:
+            temp_score = 75 - ((temp - 70) / 15) * 45
+        else:
+            temp_score = max(0, 30 - ((temp - 85) / 15) * 30)
+
+    health_score = min(100, max(0, vib_score * 0.6 + temp_score * 0.4))
+    if health_score >= 70:
+        rul_hours = 72 + ((health_score - 70) / 30) * 72
+    elif health_score >= 40:
+        rul_hours = 24 + ((health_score - 40) / 30) * 48
+    else:
+        rul_hours = (health_score / 40) * 24
+    return rul_hours, health_score
+
+
+def reference_risk(rul_hours):
+    """The original RULPredictor.get_failure_probability"""
+    if rul_hours > 72:
+        return "low"
+    elif rul_hours > 24:
+        return "medium"
+    return "high"
+
+
+class HeuristicRegressionTest(unittest.TestCase):
+    """Every segment boundary of both ladders, plus random readings"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.predictor = RULPredictor()
+
+        rng = np.random.default_rng(1234)
+        vib = np.concatenate([
+            [0.0, 0.3, 0.65, 0.651, 1.2, 1.21, 2.5, 2.51, 3.5, 4.0, 6.0],
+            rng.uniform(0.0, 4.5, 400),
+        ])
+        temp = np.concatenate([
+            [0.0, 7.5, 7.6, 10.0, 12.0, 15.0, 19.9, 20.0, 35.0, 52.0, 60.0, 60.1,
+             70.0, 72.0, 80.0, 85.0, 90.0, 95.0, 105.0, 130.0],
+            rng.uniform(-5.0, 140.0, 400),
+        ])
+        cls.readings = [
+            {"vibration_x": float(vx), "vibration_y": float(vy), "temperature": float(t),
+             "pressure": float(p), "rpm": 1500.0}
+            for vx, vy, t, p in zip(
+                np.resize(vib, 5000), np.resize(vib[::-1], 5000) * 1.1,
+                np.resize(temp, 5000), rng.uniform(0.0, 200.0, 5000)
+            )
+        ]
+        cls.expected = [
+            reference_heuristic(r["vibration_x"], r["vibration_y"], r["temperature"])
+            for r in cls.readings
+        ]
+
+    def assert_close(self, actual, expected, places):
+        # The ramp sum and the original branches may differ in the last bit,
+        # which can move a rounding tie by one unit in the last place
+        self.assertLessEqual(abs(actual - round(expected, places)), 10 ** -places + 1e-9)
+
+    def test_predict_rul_matches_reference(self):
+        for i, (reading, (rul, health)) in enumerate(zip(self.readings, self.expected)):
+            actual_rul, actual_health = self.predictor.predict_rul(reading, f"M-{i}")
+            self.assert_close(actual_rul, rul, 1)
+            self.assert_close(actual_health, health, 2)
+
+    def test_predict_rul_fast_matches_reference(self):
+        for reading, (rul, health) in zip(self.readings, self.expected):
+            actual_rul, actual_health = self.predictor.predict_rul_fast(
+                reading["vibration_x"], reading["vibration_y"],
+                reading["temperature"], reading["pressure"]
+            )
+            self.assert_close(actual_rul, rul, 1)
+            self.assert_close(actual_health, health, 2)
+
+    def test_batch_matches_reference(self):
+        # 5000 rows take the parallel kernel (_PARALLEL_MIN_ROWS), 100 the serial one
+        sensor_arr = sensors_to_array(self.readings)
+        for rows in (slice(0, 100), slice(None)):
+            rul, health = self.predictor.predict_rul_batch(sensor_arr[rows])
+            expected = np.array(self.expected[rows])
+            np.testing.assert_allclose(rul, np.round(expected[:, 0], 1), atol=0.1 + 1e-9)
+            np.testing.assert_allclose(health, np.round(expected[:, 1], 2), atol=0.01 + 1e-9)
+
+    def test_float32_batch_close_to_reference(self):
+        rul, health = self.predictor.predict_rul_batch(sensors_to_array(self.readings), dtype=np.float32)
+        expected = np.array(self.expected)
+        np.testing.assert_allclose(rul, expected[:, 0], atol=0.1)
+        np.testing.assert_allclose(health, expected[:, 1], atol=0.02)
+
+    def test_missing_sensors_use_defaults(self):
+        rul, health = reference_heuristic(0.5, 0.5, 70)
+        self.assertEqual(self.predictor.predict_rul({}, "M-001"), (round(rul, 1), round(health, 2)))
+
+    def test_memo_tracks_heuristic_inputs(self):
+        predictor = RULPredictor()
+        reading = {"vibration_x": 1.3, "vibration_y": 1.1, "temperature": 88.0,
+                   "pressure": 120.0, "rpm": 1500}
+        first = predictor.predict_rul(reading, "M-001")
+
+        # rpm is not a heuristic input: answered from the memo
+        with mock.patch.object(predictor, "predict_rul_fast") as fast:
+            self.assertEqual(predictor.predict_rul(dict(reading, rpm=1400), "M-001"), first)
+        fast.assert_not_called()
+
+        # Any heuristic input change is recomputed
+        for name in ("vibration_x", "vibration_y", "temperature"):
+            changed = dict(reading, **{name: reading[name] + 0.5})
+            rul, health = reference_heuristic(changed["vibration_x"], changed["vibration_y"],
+                                              changed["temperature"])
+            actual = predictor.predict_rul(changed, "M-001")
+            self.assert_close(actual[0], rul, 1)
+            self.assert_close(actual[1], health, 2)
+            predictor.predict_rul(reading, "M-001")
+
+    def test_risk_codes_match_reference(self):
+        ruls = np.array([0.0, 23.9, 24.0, 24.1, 71.9, 72.0, 72.1, 144.0])
+        codes = self.predictor.get_failure_probability_batch(ruls)
+        self.assertEqual(RISK_LEVELS[codes].tolist(), [reference_risk(r) for r in ruls])
+        self.assertEqual([self.predictor.get_failure_probability(r) for r in ruls],
+                         [reference_risk(r) for r in ruls])
+
+
+if __name__ == "__main__":
+    unittest.main()
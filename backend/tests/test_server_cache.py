@@ -0,0 +1,198 @@
+"""
+Tests for the server's short-lived GET response cache (cached_response) and
+its conditional GETs (ETag / If-None-Match / 304)
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from flask import jsonify, request
+
+from config import Config
+
+server = None
+_tmpdir = None
+_config = {}
+calls = []
+
+
+def setUpModule():
+    global server, _tmpdir
+    # Keep the server's database and log out of the repository's data/ and logs/
+    _tmpdir = tempfile.mkdtemp()
+    for name, value in (("DB_PATH", os.path.join(_tmpdir, "test.db")), ("LOG_DIR", _tmpdir)):
+        _config[name] = getattr(Config, name)
+        setattr(Config, name, value)
+
+    import server as server_module
+    server = server_module
+    # Don't let the first test request start the simulation clock
+    server._clock_thread = object()
+
+    @server.app.route('/api/_test/cached/<item>', methods=['GET'])
+    @server.cached_response(60, query_args=("q",))
+    def cached_item(item):
+        calls.append((item, request.args.get("q")))
+        if item == "missing":
+            return jsonify({"error": "not found"}), 404
+        return jsonify({"item": item, "q": request.args.get("q"), "call": len(calls)})
+
+    @server.app.route('/api/_test/short', methods=['GET'])
+    @server.cached_response(0.05)
+    def cached_short():
+        calls.append(("short", None))
+        return jsonify({"call": len(calls)})
+
+    @server.app.route('/api/_test/fixed', methods=['GET'])
+    @server.cached_response(60)
+    def cached_fixed():
+        # Same body on every computation, large enough to be gzipped
+        return jsonify({"values": list(range(Config.COMPRESS_MIN_SIZE))})
+
+    @server.app.route('/api/_test/touch', methods=['POST'])
+    def touch():
+        return jsonify({"success": True})
+
+
+def tearDownModule():
+    for name, value in _config.items():
+        setattr(Config, name, value)
+    shutil.rmtree(_tmpdir, ignore_errors=True)
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = server.app.test_client()
+        with server._response_cache_lock:
+            server._response_cache.clear()
+        calls.clear()
+
+    def test_repeat_gets_reuse_the_body(self):
+        first = self.client.get('/api/_test/cached/a')
+        second = self.client.get('/api/_test/cached/a')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.mimetype, "application/json")
+        self.assertEqual(len(calls), 1)
+
+    def test_key_covers_url_and_declared_query_args(self):
+        self.client.get('/api/_test/cached/a')
+        self.client.get('/api/_test/cached/b')
+        self.client.get('/api/_test/cached/a?q=1')
+        self.client.get('/api/_test/cached/a?q=2')
+        self.assertEqual(len(calls), 4)
+
+        # Undeclared parameters share the entry
+        response = self.client.get('/api/_test/cached/a?q=1&other=x')
+        self.assertEqual(response.get_json()["q"], "1")
+        self.assertEqual(len(calls), 4)
+
+    def test_entries_expire(self):
+        self.client.get('/api/_test/short')
+        self.client.get('/api/_test/short')
+        self.assertEqual(len(calls), 1)
+        time.sleep(0.1)
+        self.assertEqual(self.client.get('/api/_test/short').get_json()["call"], 2)
+
+    def test_state_changes_clear_the_cache(self):
+        self.client.get('/api/_test/cached/a')
+        self.client.get('/api/_test/cached/a')
+        self.assertEqual(len(calls), 1)
+        self.client.post('/api/_test/touch')
+        self.assertEqual(self.client.get('/api/_test/cached/a').get_json()["call"], 2)
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get('/api/_test/cached/missing').status_code, 404)
+        self.assertEqual(len(calls), 2)
+
+    def test_cache_is_bounded_lru(self):
+        with mock.patch.object(server, "RESPONSE_CACHE_SIZE", 2):
+            self.client.get('/api/_test/cached/a')
+            self.client.get('/api/_test/cached/b')
+            self.client.get('/api/_test/cached/a')  # a is now the most recent
+            self.client.get('/api/_test/cached/c')  # evicts b
+            self.assertEqual(len(server._response_cache), 2)
+            self.assertEqual(len(calls), 3)
+            self.client.get('/api/_test/cached/a')
+            self.assertEqual(len(calls), 3)
+            self.client.get('/api/_test/cached/b')
+            self.assertEqual(len(calls), 4)
+
+    def test_preset_endpoints(self):
+        listing = self.client.get('/api/presets')
+        self.assertEqual(listing.status_code, 200)
+        self.assertEqual(self.client.get('/api/presets').get_data(), listing.get_data())
+        self.assertEqual(self.client.get('/api/presets/NO-SUCH-PRESET').status_code, 404)
+
+
+class ConditionalGetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = server.app.test_client()
+        with server._response_cache_lock:
+            server._response_cache.clear()
+        calls.clear()
+
+    def test_cached_view_answers_matching_etag_with_304(self):
+        first = self.client.get('/api/_test/cached/a')
+        etag = first.headers["ETag"]
+        self.assertTrue(etag)
+
+        hit = self.client.get('/api/_test/cached/a', headers={"If-None-Match": etag})
+        self.assertEqual(hit.status_code, 304)
+        self.assertEqual(hit.get_data(), b"")
+        self.assertEqual(hit.headers["ETag"], etag)
+
+        miss = self.client.get('/api/_test/cached/a', headers={"If-None-Match": '"other"'})
+        self.assertEqual(miss.status_code, 200)
+        self.assertEqual(miss.get_data(), first.get_data())
+        self.assertEqual(len(calls), 1)
+
+    def test_etag_follows_content(self):
+        first = self.client.get('/api/_test/fixed')
+        with server._response_cache_lock:
+            server._response_cache.clear()
+        # Recomputed identical body: same tag, so the client's copy stays valid
+        again = self.client.get('/api/_test/fixed', headers={"If-None-Match": first.headers["ETag"]})
+        self.assertEqual(again.status_code, 304)
+
+        # A different body gets a different tag
+        other = self.client.get('/api/_test/cached/b')
+        self.assertNotEqual(other.headers["ETag"], first.headers["ETag"])
+
+    def test_gzipped_response_validates_weakly(self):
+        plain = self.client.get('/api/_test/fixed')
+        self.assertNotIn("Content-Encoding", plain.headers)
+        zipped = self.client.get('/api/_test/fixed', headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(zipped.headers["Content-Encoding"], "gzip")
+        self.assertEqual(zipped.headers["ETag"], "W/" + plain.headers["ETag"])
+
+        for tag in (zipped.headers["ETag"], plain.headers["ETag"]):
+            response = self.client.get('/api/_test/fixed', headers={
+                "Accept-Encoding": "gzip", "If-None-Match": tag
+            })
+            self.assertEqual(response.status_code, 304)
+
+    def test_metrics_etag_tracks_generation(self):
+        tracker = server.get_metrics_tracker()
+        for url in ('/api/metrics', '/api/metrics/predictions', '/api/metrics/failures'):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                etag = first.headers["ETag"]
+                self.assertTrue(etag.startswith(f'"{server.ETAG_EPOCH}-'))
+                self.assertEqual(self.client.get(url, headers={"If-None-Match": etag}).status_code, 304)
+
+                tracker.record_prediction("M-001", ttf_hours=12.0, health_score=40.0, anomaly_score=0.5)
+                changed = self.client.get(url, headers={"If-None-Match": etag})
+                self.assertEqual(changed.status_code, 200)
+                self.assertNotEqual(changed.headers["ETag"], etag)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Regression tests: the array-backed simulator (per-machine updates and the
+fleet-wide numba/NumPy tick) against the original per-sensor implementation,
+fed the same noise stream.
+"""
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from config import Config
+import stateful_simulator
+from stateful_simulator import FleetSimulator, MachineSimulator, SENSOR_NAMES
+
+
+class ReferenceMachine:
+    """The original MachineSimulator/StatefulSensor arithmetic, one sensor at a time"""
+
+    def __init__(self, machine_type, runtime_hours, rng):
+        self.runtime_hours = runtime_hours
+        self.rng = rng
+        type_config = Config.MACHINE_TYPES[machine_type]
+        baselines = type_config["baselines"]
+        variance = type_config.get("variance", {})
+        defaults = {"vibration_x": 0.5, "vibration_y": 0.5, "temperature": 70.0,
+                    "pressure": 100.0, "rpm": 1500.0}
+
+        self.baseline = {name: baselines.get(name, defaults[name]) for name in SENSOR_NAMES}
+        self.limits = {name: Config.SENSOR_LIMITS[name] for name in SENSOR_NAMES}
+        self.noise_level = {name: 0.02 for name in SENSOR_NAMES}
+        if variance:
+            self.noise_level["vibration_x"] = variance.get("vibration", 0.08) / baselines.get("vibration_x", 0.5) * 0.5
+            self.noise_level["vibration_y"] = variance.get("vibration", 0.08) / baselines.get("vibration_y", 0.5) * 0.5
+            self.noise_level["temperature"] = variance.get("temperature", 3.0) / baselines.get("temperature", 70.0)
+            if baselines.get("pressure", 0) > 0:
+                self.noise_level["pressure"] = variance.get("pressure", 5.0) / baselines.get("pressure", 100.0)
+            self.noise_level["rpm"] = variance.get("rpm", 15.0) / baselines.get("rpm", 1500.0)
+        self.reset()
+
+    def reset(self):
+        self.current = {name: np.float64(value) for name, value in self.baseline.items()}
+        self.drift = {name: 0.0 for name in SENSOR_NAMES}
+
+    def advance_time(self, hours):
+        self.runtime_hours += hours
+        phase = Config.get_degradation_phase(self.runtime_hours)
+        factor = Config.get_degradation_factor(phase)
+        for name in SENSOR_NAMES:
+            noise = self.rng.normal(0, self.noise_level[name] * self.baseline[name])
+            self.drift[name] += (factor - 1.0) * 0.001 * hours
+            value = self.baseline[name] * factor + self.drift[name] + noise
+            # np.float64, so round() below is NumPy's rounding, as it was originally
+            self.current[name] = np.clip(value, *self.limits[name])
+        return {
+            "runtime_hours": round(self.runtime_hours, 2),
+            "sensors": {name: float(round(value, 3)) for name, value in self.current.items()},
+            "health_state": phase.lower(),
+            "degradation_factor": factor,
+        }
+
+
+def comparable(reading):
+    """Fields of a reading that both implementations produce"""
+    return {
+        "runtime_hours": reading["runtime_hours"],
+        "sensors": {name: float(value) for name, value in reading["sensors"].items()},
+        "health_state": reading["health_state"],
+        "degradation_factor": reading["degradation_factor"],
+    }
+
+
+class SimulatorRegressionTest(unittest.TestCase):
+
+    def test_machine_advance_matches_reference(self):
+        for machine_type in ("FEEDWATER_PUMP", "HVAC_CHILLER", "BOILER_FEED_MOTOR"):
+            with mock.patch.object(stateful_simulator, "_RNG", np.random.default_rng(5)):
+                machine = MachineSimulator("T-1", machine_type, initial_runtime_hours=80)
+                reference = ReferenceMachine(machine_type, 80, np.random.default_rng(5))
+                # 7h steps run through every degradation phase
+                for step in range(150):
+                    self.assertEqual(comparable(machine.advance_time(hours=7)),
+                                     reference.advance_time(7), (machine_type, step))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    machine.perform_maintenance()
+                reference.reset()
+                self.assertEqual(machine.sensor_readings(),
+                                 {name: float(round(value, 3)) for name, value in reference.current.items()})
+
+    def test_fleet_tick_matches_reference(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            fleet = FleetSimulator()
+        # Reference machines draw from one shared stream, machine by machine,
+        # which is the order the fleet tick fills its noise matrix in
+        rng = np.random.default_rng(9)
+        references = {
+            mid: ReferenceMachine(machine.machine_type, machine.runtime_hours, rng)
+            for mid, machine in fleet.machines.items()
+        }
+        with mock.patch.object(stateful_simulator, "_RNG", np.random.default_rng(9)):
+            for step in range(120):
+                readings = fleet.advance_all(hours=6)
+                expected = [references[mid].advance_time(6) for mid in fleet.machines]
+                self.assertEqual([comparable(r) for r in readings], expected, step)
+                if step == 60:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        fleet.machines["M-002"].perform_maintenance()
+                    references["M-002"].reset()
+                    references["M-002"].runtime_hours = 0.0
+
+    def test_tick_without_readings_advances_the_same_state(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            with_readings, without_readings = FleetSimulator(), FleetSimulator()
+        for fleet, build in ((with_readings, True), (without_readings, False)):
+            with mock.patch.object(stateful_simulator, "_RNG", np.random.default_rng(2)):
+                for _ in range(50):
+                    fleet.advance_all(hours=3, readings=build)
+        np.testing.assert_array_equal(with_readings._current_value, without_readings._current_value)
+        np.testing.assert_array_equal(with_readings._drift_accumulator, without_readings._drift_accumulator)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Tests for the stress scenario engine: transforms against the original
+formulas, copy-on-write snapshots, and expiry racing a replacement.
+"""
+import threading
+import time
+import unittest
+
+from stress_scenarios import StressScenarioEngine
+
+
+def reference_stress(stype, severity, progress, drift, sensors):
+    """The original apply_stress transforms"""
+    stressed = sensors.copy()
+    if stype == "LOAD_SPIKE":
+        stressed['vibration_x'] = stressed.get('vibration_x', 0.5) * (1 + 0.5 * severity)
+        stressed['vibration_y'] = stressed.get('vibration_y', 0.5) * (1 + 0.5 * severity)
+        stressed['rpm'] = stressed.get('rpm', 1500) * (1 + 0.3 * severity)
+    elif stype == "LUBRICATION_LOSS":
+        stressed['vibration_x'] = stressed.get('vibration_x', 0.5) + 0.3 * severity
+        stressed['vibration_y'] = stressed.get('vibration_y', 0.5) + 0.3 * severity
+        stressed['temperature'] = stressed.get('temperature', 70) + 10 * severity
+    elif stype == "COOLING_FAILURE":
+        stressed['temperature'] = stressed.get('temperature', 70) + 15 * severity
+    elif stype == "SENSOR_DRIFT":
+        stressed['vibration_x'] = stressed.get('vibration_x', 0.5) + drift * severity
+        stressed['vibration_y'] = stressed.get('vibration_y', 0.5) + drift * severity * 0.8
+    elif stype == "RUNAWAY_FAILURE":
+        accel = 1 + 2 * severity * progress
+        stressed['vibration_x'] = stressed.get('vibration_x', 0.5) * accel
+        stressed['vibration_y'] = stressed.get('vibration_y', 0.5) * accel
+        stressed['temperature'] = stressed.get('temperature', 70) + 20 * severity * progress
+        if stressed.get('pressure', 0) > 0:
+            stressed['pressure'] = stressed.get('pressure', 100) * (1 - 0.3 * severity * progress)
+    stressed['_stress_scenario'] = stype
+    stressed['_stress_severity'] = severity
+    return stressed
+
+
+SENSORS = {"vibration_x": 0.6, "vibration_y": 0.5, "temperature": 72.0, "pressure": 120.0, "rpm": 1480.0}
+
+
+class StressEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = StressScenarioEngine()
+
+    def test_transforms_match_reference(self):
+        for stype in ("LOAD_SPIKE", "LUBRICATION_LOSS", "COOLING_FAILURE", "SENSOR_DRIFT", "RUNAWAY_FAILURE"):
+            for severity in (0.0, 0.35, 1.0):
+                self.engine.start_scenario("M-001", stype, severity=severity, duration_sec=100)
+                scenario = self.engine.get_scenario("M-001")
+                for elapsed in (0.0, 25.0, 99.0):
+                    now = scenario.start_monotonic + elapsed
+                    expected = reference_stress(stype, severity, elapsed / 100,
+                                                self.engine._drift_bias.get("M-001", 0.05), SENSORS)
+                    actual = self.engine.apply_scenario(scenario, SENSORS, now)
+                    self.assertEqual(actual.keys(), expected.keys())
+                    for name in expected:
+                        if isinstance(expected[name], float):
+                            self.assertAlmostEqual(actual[name], expected[name], places=12,
+                                                   msg=f"{stype} {severity} {elapsed} {name}")
+                        else:
+                            self.assertEqual(actual[name], expected[name])
+
+    def test_no_pressure_is_left_alone(self):
+        self.engine.start_scenario("M-001", "RUNAWAY_FAILURE", severity=1.0, duration_sec=100)
+        scenario = self.engine.get_scenario("M-001")
+        stressed = self.engine.apply_scenario(scenario, {"vibration_x": 0.5},
+                                              scenario.start_monotonic + 50)
+        self.assertNotIn("pressure", stressed)
+
+    def test_writers_publish_new_snapshots(self):
+        self.engine.start_scenario("M-001", "LOAD_SPIKE", duration_sec=100)
+        self.engine.start_scenario("M-002", "SENSOR_DRIFT", duration_sec=100)
+        scenarios, drift = self.engine._active_scenarios, self.engine._drift_bias
+
+        self.engine.start_scenario("M-003", "COOLING_FAILURE", duration_sec=100)
+        self.engine.stop_scenario("M-002")
+
+        # Snapshots a reader already holds never change under it
+        self.assertEqual(sorted(scenarios), ["M-001", "M-002"])
+        self.assertEqual(sorted(drift), ["M-002"])
+        self.assertEqual(sorted(self.engine._active_scenarios), ["M-001", "M-003"])
+        self.assertEqual(self.engine._drift_bias, {})
+
+    def test_expired_scenarios_are_removed(self):
+        self.engine.start_scenario("M-001", "LOAD_SPIKE", duration_sec=100)
+        scenario = self.engine.get_scenario("M-001")
+        self.assertIsNone(self.engine.get_scenario("M-001", scenario.start_monotonic + 100))
+        self.assertNotIn("M-001", self.engine._active_scenarios)
+        self.assertEqual(self.engine.apply_stress("M-001", SENSORS), SENSORS)
+
+    def test_expiry_keeps_a_replacement(self):
+        # A reader saw the old scenario expire, but a new one was started
+        # before it got to remove it: the new one must survive
+        self.engine.start_scenario("M-001", "LOAD_SPIKE", duration_sec=1)
+        old = self.engine.get_scenario("M-001")
+        self.engine.start_scenario("M-001", "SENSOR_DRIFT", duration_sec=100)
+        new = self.engine._active_scenarios["M-001"]
+
+        self.engine._expire("M-001", old)
+        self.assertIs(self.engine.get_scenario("M-001"), new)
+        self.assertIn("M-001", self.engine._drift_bias)
+
+    def test_concurrent_readers_and_writers(self):
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            try:
+                while not stop.is_set():
+                    self.engine.get_all_active()
+                    for mid in ("M-001", "M-002", "M-003"):
+                        self.engine.apply_stress(mid, SENSORS)
+            except Exception as e:  # e.g. "dictionary changed size during iteration"
+                errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for thread in readers:
+            thread.start()
+        try:
+            deadline = time.monotonic() + 0.5
+            while time.monotonic() < deadline:
+                for mid in ("M-001", "M-002", "M-003"):
+                    # Zero-length scenarios expire at once, racing the readers' expiry
+                    self.engine.start_scenario(mid, "SENSOR_DRIFT", duration_sec=0)
+                    self.engine.start_scenario(mid, "LOAD_SPIKE", duration_sec=0)
+                    self.engine.stop_scenario(mid)
+            self.engine.start_scenario("M-001", "COOLING_FAILURE", duration_sec=100)
+        finally:
+            stop.set()
+            for thread in readers:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(list(self.engine.get_all_active()), ["M-001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
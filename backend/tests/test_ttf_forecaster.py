@@ -0,0 +1,101 @@
+"""
+Tests for the TTF forecast memo: reuse while no reading arrives, and
+invalidation by every new reading.
+"""
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from ttf_forecaster import TTFForecaster
+
+
+class ForecastMemoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.forecaster = TTFForecaster()
+        self.forecaster.prophet = None  # linear forecasts: fast and deterministic
+        self.fit = mock.patch.object(
+            self.forecaster, "_linear_forecast", wraps=self.forecaster._linear_forecast
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def add(self, count, start=95.0, step=-1.5):
+        for i in range(count):
+            self.forecaster.add_health_reading("M-001", start + step * i)
+
+    def test_insufficient_data_is_not_cached(self):
+        self.add(9)
+        self.assertEqual(self.forecaster.forecast_ttf("M-001")["status"], "insufficient_data")
+        self.add(1, start=80.0)
+        self.assertEqual(self.forecaster.forecast_ttf("M-001")["status"], "success")
+
+    def test_repeat_calls_reuse_the_forecast(self):
+        self.add(20)
+        first = self.forecaster.forecast_ttf("M-001")
+        self.assertIs(self.forecaster.forecast_ttf("M-001"), first)
+        self.assertEqual(self.fit.call_count, 1)
+
+    def test_new_reading_invalidates(self):
+        self.add(20)
+        first = self.forecaster.forecast_ttf("M-001")
+        self.forecaster.add_health_reading("M-001", 10.0)
+        second = self.forecaster.forecast_ttf("M-001")
+        self.assertIsNot(second, first)
+        self.assertEqual(second["forecast"][0]["health_score"], 10.0)
+        self.assertEqual(self.fit.call_count, 2)
+
+    def test_full_history_with_repeated_timestamps_invalidates(self):
+        # Once the history is full its length stops changing, and coarse clocks
+        # can give consecutive readings the same timestamp
+        frozen = datetime(2026, 1, 1, 12, 0, 0)
+        with mock.patch("ttf_forecaster.datetime") as clock:
+            clock.now.return_value = frozen
+            self.add(TTFForecaster.HISTORY_SIZE + 5)
+            first = self.forecaster.forecast_ttf("M-001")
+            self.forecaster.add_health_reading("M-001", 5.0)
+            second = self.forecaster.forecast_ttf("M-001")
+        self.assertEqual(first["forecast"][0]["health_score"], 0.0)  # clipped trend
+        self.assertEqual(second["forecast"][0]["health_score"], 5.0)
+        self.assertEqual(self.fit.call_count, 2)
+
+    def test_horizons_are_cached_separately(self):
+        self.add(20)
+        short = self.forecaster.forecast_ttf("M-001", horizon_hours=12)
+        long = self.forecaster.forecast_ttf("M-001", horizon_hours=48)
+        self.assertEqual(len(short["forecast"]), 12)
+        self.assertEqual(len(long["forecast"]), 48)
+        self.assertIs(self.forecaster.forecast_ttf("M-001", horizon_hours=12), short)
+        self.assertIs(self.forecaster.forecast_ttf("M-001", horizon_hours=48), long)
+        self.assertEqual(self.fit.call_count, 2)
+
+        # A reading drops every horizon's forecast
+        self.forecaster.add_health_reading("M-001", 50.0)
+        self.assertIsNot(self.forecaster.forecast_ttf("M-001", horizon_hours=12), short)
+        self.assertIsNot(self.forecaster.forecast_ttf("M-001", horizon_hours=48), long)
+        self.assertEqual(self.fit.call_count, 4)
+
+    def test_horizon_cache_is_bounded(self):
+        self.add(20)
+        limit = TTFForecaster.FORECAST_CACHE_HORIZONS
+        results = [self.forecaster.forecast_ttf("M-001", horizon_hours=h) for h in range(1, limit + 2)]
+        self.assertEqual(len(self.forecaster._forecast_cache["M-001"][1]), limit)
+
+        # The oldest horizon was evicted, the newest are still served from the memo
+        self.assertIs(self.forecaster.forecast_ttf("M-001", horizon_hours=limit + 1), results[-1])
+        self.assertIs(self.forecaster.forecast_ttf("M-001", horizon_hours=2), results[1])
+        self.assertEqual(self.fit.call_count, limit + 1)
+        self.assertIsNot(self.forecaster.forecast_ttf("M-001", horizon_hours=1), results[0])
+
+    def test_machines_are_cached_separately(self):
+        self.add(20)
+        for _ in range(20):
+            self.forecaster.add_health_reading("M-002", 60.0)
+        first = self.forecaster.forecast_ttf("M-001")
+        other = self.forecaster.forecast_ttf("M-002")
+        self.assertEqual(other["forecast"][0]["health_score"], 60.0)
+        self.assertIs(self.forecaster.forecast_ttf("M-001"), first)
+        self.assertEqual(self.fit.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,16 +4,31 @@ Uses Facebook Prophet to predict when machine health will reach critical thresho
 """
 import pandas as pd
 import numpy as np
+import threading
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Deque, Dict, Sequence, Tuple
 
 
 class TTFForecaster:
     """Forecasts time until critical failure threshold"""
     
+    HISTORY_SIZE = 100  # readings kept per machine
+    # Simulated trajectories behind Prophet's yhat_lower/yhat_upper (Prophet's
+    # default of 1000 dominates predict(); 100 is plenty for a 48 h band)
+    PROPHET_UNCERTAINTY_SAMPLES = 100
+    FORECAST_CACHE_HORIZONS = 8  # forecasts kept per machine, one per horizon
+    
     def __init__(self):
         self.prophet = None
-        self.health_history = {}  # machine_id -> list of (timestamp, health_score)
+        # machine_id -> last HISTORY_SIZE {timestamp, health_score} readings
+        self.health_history: Dict[str, Deque[Dict]] = {}
+        # machine_id -> readings added so far (timestamps can repeat on coarse
+        # clocks and the history length stops changing once full)
+        self._reading_counts: Dict[str, int] = {}
+        # machine_id -> (reading count, {horizon: forecast}); forecasts only
+        # change when a reading arrives
+        self._forecast_cache: Dict[str, Tuple[int, Dict[int, Dict]]] = {}
         self.critical_threshold = 30  # Health score below which is critical
         self._initialize_prophet()
     
@@ -29,18 +44,17 @@ class TTFForecaster:
     
     def add_health_reading(self, machine_id: str, health_score: float):
         """Add health score data point for forecasting"""
-        if machine_id not in self.health_history:
-            self.health_history[machine_id] = []
+        # Bounded deque: appending past HISTORY_SIZE drops the oldest reading
+        history = self.health_history.get(machine_id)
+        if history is None:
+            history = self.health_history[machine_id] = deque(maxlen=self.HISTORY_SIZE)
         
         timestamp = datetime.now()
-        self.health_history[machine_id].append({
+        history.append({
             "timestamp": timestamp,
             "health_score": health_score
         })
-        
-        # Keep only last 100 readings per machine
-        if len(self.health_history[machine_id]) > 100:
-            self.health_history[machine_id].pop(0)
+        self._reading_counts[machine_id] = self._reading_counts.get(machine_id, 0) + 1
     
     def forecast_ttf(self, machine_id: str, horizon_hours: int = 48) -> Dict:
         """
@@ -56,29 +70,43 @@ class TTFForecaster:
         
         history = self.health_history[machine_id]
         
+        key = self._reading_counts[machine_id]
+        cached = self._forecast_cache.get(machine_id)
+        if cached is None or cached[0] != key:
+            cached = self._forecast_cache[machine_id] = (key, {})
+        by_horizon = cached[1]
+        result = by_horizon.get(horizon_hours)
+        if result is not None:
+            return result
+        
         # Use Prophet if available, otherwise linear regression
         if self.prophet is not None:
-            return self._prophet_forecast(history, horizon_hours)
+            result = self._prophet_forecast(history, horizon_hours)
         else:
-            return self._linear_forecast(history, horizon_hours)
+            result = self._linear_forecast(history, horizon_hours)
+        
+        if len(by_horizon) >= self.FORECAST_CACHE_HORIZONS:
+            del by_horizon[next(iter(by_horizon))]  # oldest horizon
+        by_horizon[horizon_hours] = result
+        return result
     
-    def _prophet_forecast(self, history: List[Dict], horizon_hours: int) -> Dict:
+    def _prophet_forecast(self, history: Sequence[Dict], horizon_hours: int) -> Dict:
         """Forecast using Facebook Prophet"""
         try:
-            # Prepare data for Prophet
-            df = pd.DataFrame([
-                {
-                    "ds": record["timestamp"],
-                    "y": record["health_score"]
-                }
-                for record in history
-            ])
+            # Prepare data for Prophet (column by column)
+            df = pd.DataFrame({
+                "ds": pd.to_datetime([record["timestamp"] for record in history]),
+                "y": np.fromiter((record["health_score"] for record in history),
+                                 dtype=np.float64, count=len(history))
+            })
             
             # Create and fit model
             model = self.prophet(
                 daily_seasonality=False,
                 weekly_seasonality=False,
-                yearly_seasonality=False
+                yearly_seasonality=False,
+                mcmc_samples=0,  # MAP fit, no MCMC
+                uncertainty_samples=self.PROPHET_UNCERTAINTY_SAMPLES
             )
             model.fit(df)
             
@@ -86,67 +114,72 @@ class TTFForecaster:
             future = model.make_future_dataframe(periods=horizon_hours, freq='H')
             forecast = model.predict(future)
             
-            # Extract predictions
-            predictions = []
+            # Extract predictions (whole columns at once)
+            pred_health = np.clip(forecast['yhat'].to_numpy(), 0, 100)
             ttf_hours = None
             
-            for _, row in forecast.iterrows():
-                pred_time = row['ds']
-                pred_health = max(0, min(100, row['yhat']))
-                
-                predictions.append({
-                    "timestamp": pred_time.isoformat(),
-                    "health_score": round(pred_health, 2),
-                    "lower_bound": round(max(0, row['yhat_lower']), 2),
-                    "upper_bound": round(min(100, row['yhat_upper']), 2)
-                })
-                
-                # Find when it crosses critical threshold
-                if ttf_hours is None and pred_health < self.critical_threshold:
-                    ttf_hours = (pred_time - datetime.now()).total_seconds() / 3600
+            # Find when it crosses critical threshold
+            below = np.flatnonzero(pred_health < self.critical_threshold)
+            if below.size:
+                pred_time = forecast['ds'].iloc[below[0]]
+                ttf_hours = (pred_time - datetime.now()).total_seconds() / 3600
+            
+            # Return only future predictions
+            future_rows = slice(-horizon_hours, None)
+            timestamps = [ts.isoformat() for ts in forecast['ds'].iloc[future_rows]]
+            health = np.round(pred_health[future_rows], 2).tolist()
+            lower = np.round(np.maximum(forecast['yhat_lower'].to_numpy()[future_rows], 0), 2).tolist()
+            upper = np.round(np.minimum(forecast['yhat_upper'].to_numpy()[future_rows], 100), 2).tolist()
+            predictions = [
+                {
+                    "timestamp": timestamp,
+                    "health_score": score,
+                    "lower_bound": low,
+                    "upper_bound": high
+                }
+                for timestamp, score, low, high in zip(timestamps, health, lower, upper)
+            ]
             
             return {
                 "status": "success",
                 "method": "prophet",
                 "ttf_hours": round(ttf_hours, 1) if ttf_hours else None,
-                "forecast": predictions[-horizon_hours:]  # Return only future predictions
+                "forecast": predictions
             }
         
         except Exception as e:
             print(f"Prophet forecast error: {e}")
             return self._linear_forecast(history, horizon_hours)
     
-    def _linear_forecast(self, history: List[Dict], horizon_hours: int) -> Dict:
+    def _linear_forecast(self, history: Sequence[Dict], horizon_hours: int) -> Dict:
         """Fallback: Linear regression forecast"""
         # Calculate degradation rate
-        health_values = [r["health_score"] for r in history]
-        current_health = health_values[-1]
+        current_health = history[-1]["health_score"]
         
-        # Simple linear trend
-        if len(health_values) >= 2:
-            recent_values = health_values[-10:]  # Last 10 readings
-            degradation_rate = (recent_values[-1] - recent_values[0]) / len(recent_values)
+        # Simple linear trend over the last 10 readings (only the endpoints matter)
+        count = len(history)
+        if count >= 2:
+            recent = min(10, count)
+            degradation_rate = (current_health - history[-recent]["health_score"]) / recent
         else:
             degradation_rate = -0.5  # Default assumption
         
-        # Project forward
-        predictions = []
-        ttf_hours = None
+        # Project forward, all hours at once
+        future_health = np.clip(current_health + degradation_rate * np.arange(horizon_hours), 0, 100)
         
-        for hour in range(horizon_hours):
-            future_health = current_health + (degradation_rate * hour)
-            future_health = max(0, min(100, future_health))
-            
-            future_time = datetime.now() + timedelta(hours=hour)
-            predictions.append({
-                "timestamp": future_time.isoformat(),
-                "health_score": round(future_health, 2),
-                "lower_bound": round(max(0, future_health - 10), 2),
-                "upper_bound": round(min(100, future_health + 10), 2)
-            })
-            
-            if ttf_hours is None and future_health < self.critical_threshold:
-                ttf_hours = hour
+        below = np.flatnonzero(future_health < self.critical_threshold)
+        ttf_hours = int(below[0]) if below.size else None
+        
+        start = datetime.now()
+        predictions = [
+            {
+                "timestamp": (start + timedelta(hours=hour)).isoformat(),
+                "health_score": round(health, 2),
+                "lower_bound": round(max(0, health - 10), 2),
+                "upper_bound": round(min(100, health + 10), 2)
+            }
+            for hour, health in enumerate(future_health.tolist())
+        ]
         
         return {
             "status": "success",
@@ -158,13 +191,18 @@ class TTFForecaster:
 
 # Global forecaster instance
 forecasters = {}
+_forecasters_lock = threading.Lock()
 
 
 def get_forecaster(machine_id: str) -> TTFForecaster:
     """Get or create forecaster for a machine"""
-    if machine_id not in forecasters:
-        forecasters[machine_id] = TTFForecaster()
-    return forecasters[machine_id]
+    forecaster = forecasters.get(machine_id)
+    if forecaster is None:
+        with _forecasters_lock:
+            forecaster = forecasters.get(machine_id)
+            if forecaster is None:
+                forecaster = forecasters[machine_id] = TTFForecaster()
+    return forecaster
 
 
 if __name__ == "__main__":
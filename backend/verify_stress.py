@@ -1,28 +1,23 @@
 
-import urllib.request
 import json
 import time
 import sys
 
-BASE_URL = 'http://localhost:5000/api'
+from api_client import ApiClient
+
+# One connection for every step
+_client = ApiClient()
 
 def post(endpoint, data):
     try:
-        req = urllib.request.Request(
-            f'{BASE_URL}/{endpoint}',
-            data=json.dumps(data).encode('utf-8'),
-            headers={'Content-Type': 'application/json'}
-        )
-        with urllib.request.urlopen(req) as r:
-            return json.load(r)
+        return json.loads(_client.request('POST', endpoint, json.dumps(data)))
     except Exception as e:
         print(f"POST {endpoint} failed: {e}")
         return None
 
 def get(endpoint):
     try:
-        with urllib.request.urlopen(f'{BASE_URL}/{endpoint}') as r:
-            return json.load(r)
+        return json.loads(_client.request('GET', endpoint))
     except Exception as e:
         print(f"GET {endpoint} failed: {e}")
         return None